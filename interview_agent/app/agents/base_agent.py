@@ -1,12 +1,57 @@
+import logging
+import uuid
+from typing import Optional
 from app.utils.llm_client import LLMClient
-from app.schemas.interview import InterviewSession
+from app.schemas.interview import InterviewSession, Question
+from app.utils.question_bank import get_question_bank
+
+logger = logging.getLogger(__name__)
+
+
+def warn_if_ungradable(question: Question):
+    """Logs an exact-match question that has no answer key; it is scored 0 rather than graded against a guess."""
+    if not question.expected_answer:
+        logger.warning("Question %s has no answer key and can't be graded", question.id)
 
 class BaseAgent:
+    """
+    Agents are stateless: one instance is shared by every session, so anything
+    needed to grade a question must travel on the Question itself.
+    """
     def __init__(self, llm_client: LLMClient):
         self.llm = llm_client
+        self.question_bank = get_question_bank()
 
-    async def generate_question(self, session: InterviewSession) -> str:
+    async def generate_question(self, session: InterviewSession) -> Question:
         raise NotImplementedError
 
-    async def evaluate_answer(self, question: str, answer: str) -> dict:
+    async def stream_question(self, session: InterviewSession):
+        """
+        Yields text chunks of the next question, then the finished Question.
+
+        Offline agents produce the whole text at once. An LLM-backed agent
+        should override this and forward chunks from LLMClient.stream_response.
+        """
+        question = await self.generate_question(session)
+        yield question.text
+        yield question
+
+    async def evaluate_answer(self, question: Question, answer: str) -> dict:
         raise NotImplementedError
+
+    def _build_question(self, session: InterviewSession, text: str, expected_answer: Optional[str] = None, difficulty: int = 1,
+                        position: Optional[int] = None) -> Question:
+        return Question(
+            id=str(uuid.uuid4()),
+            text=text,
+            round=session.current_round,
+            difficulty=difficulty,
+            expected_answer=expected_answer,
+            position=position
+        )
+
+    def _draw_from_bank(self, session: InterviewSession) -> Question:
+        """Next unseen bank question for the session's current round."""
+        position = session.question_cursor.get(session.current_round, 0)
+        entry = self.question_bank.draw(session.current_round, session.question_seed, position)
+        return self._build_question(session, entry.text, expected_answer=entry.answer, difficulty=entry.difficulty, position=position)
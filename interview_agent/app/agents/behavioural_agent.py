@@ -1,4 +1,5 @@
 from app.agents.base_agent import BaseAgent
+from app.schemas.interview import Question
 from app.utils.llm_client import LLMClient
 from app.utils.offline_engine import OfflineEngine
 
@@ -6,10 +7,19 @@ class BehaviouralAgent(BaseAgent):
     def __init__(self, llm_client: LLMClient):
         super().__init__(llm_client)
 
-    async def generate_question(self, session) -> str:
-        # Use Offline Engine for instant start (no LLM latency)
-        return OfflineEngine.generate_behavioural_question()
+    def preload(self):
+        """Builds the semantic grader (NumPy and the exemplar vectors) ahead of the first answer."""
+        from app.utils.semantic_grader import get_semantic_grader, grader_mode
+        if grader_mode() == "semantic":
+            get_semantic_grader()
 
-    async def evaluate_answer(self, question: str, answer: str) -> dict:
-        # Use deterministic keyword analysis
+    async def generate_question(self, session) -> Question:
+        # Precomputed bank for instant start (no LLM latency)
+        return self._draw_from_bank(session)
+
+    async def evaluate_answer(self, question: Question, answer: str) -> dict:
+        # Deterministic and local: exemplar similarity, or keyword analysis when configured
+        from app.utils.semantic_grader import get_semantic_grader, grader_mode
+        if grader_mode() == "semantic":
+            return get_semantic_grader().grade(question.text, answer)
         return OfflineEngine.evaluate_behavioural(answer)
@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.codec import SessionCodec
+from app.schemas.interview import InterviewSession
+
+
+class SessionArchive:
+    """
+    Cold tier for completed interviews: a single SQLite file holding one row per
+    session, with the full session encoded by SessionCodec.
+
+    The store writes a session here whenever it is saved as completed, so it
+    remains readable by ``MemoryStore.get_session`` (and the report exporter)
+    after it has left RAM or expired from Redis. Calls block on disk I/O; the
+    store runs them in a worker thread.
+
+    Tunables (environment):
+        SESSION_ARCHIVE_PATH  SQLite file for completed sessions (default: unset, archive disabled)
+    """
+
+    def __init__(self, path: str, codec: Optional[SessionCodec] = None):
+        self.path = path
+        self.codec = codec or SessionCodec()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, completed_at REAL, payload BLOB NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_completed_at ON sessions (completed_at)")
+
+    @classmethod
+    def from_env(cls) -> Optional["SessionArchive"]:
+        path = os.getenv("SESSION_ARCHIVE_PATH")
+        return cls(path) if path else None
+
+    def put_many(self, sessions: Iterable[InterviewSession]):
+        rows = [(s.session_id, s.completed_at, self.codec.dump_session(s)) for s in sessions]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", rows)
+
+    def get_many(self, session_ids: List[str]) -> Dict[str, InterviewSession]:
+        if not session_ids:
+            return {}
+        placeholders = ",".join("?" * len(session_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT session_id, payload FROM sessions WHERE session_id IN ({placeholders})", session_ids).fetchall()
+        return {session_id: self.codec.load_session(payload) for session_id, payload in rows}
+
+    def completed_since(self, since: float) -> List[Tuple[str, float]]:
+        """(session id, completed_at) of archived sessions completed at or after `since`, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT session_id, completed_at FROM sessions WHERE completed_at >= ? ORDER BY completed_at",
+                (since,)).fetchall()
+
+    def reencode(self, batch_size: int = 500) -> int:
+        """Rewrites every row with the current codec; returns the number of rows."""
+        done = 0
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT session_id, payload FROM sessions WHERE session_id > ? ORDER BY session_id LIMIT ?",
+                    (last_id, batch_size)).fetchall()
+            if not rows:
+                return done
+            self.put_many(self.codec.load_session(payload) for _, payload in rows)
+            done += len(rows)
+            last_id = rows[-1][0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
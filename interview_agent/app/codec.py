@@ -0,0 +1,196 @@
+"""
+Compact binary encoding of stored transcript entries and archived sessions.
+
+Every encoded value starts with a two-byte header: the layout version, then
+flags giving the body format (MessagePack, or JSON when no MessagePack library
+is installed) and whether the body is zlib-compressed. Bodies are positional
+arrays rather than objects. Rounds are stored as small integers, and UUID
+question ids as 16 raw bytes in MessagePack. Questions drawn from the question
+bank carry their bank position instead of an answer key. Bodies above a size
+threshold are compressed when that makes them smaller.
+
+Values written before the codec existed have no header: plain JSON objects in
+Redis (first byte ``{``) and zlib-compressed JSON in the archive. They are
+still decoded, so old and new entries can share a list. Sessions move to the
+new encoding as they are rewritten; see ``python -m app.migrate_codec``.
+"""
+import json
+import logging
+import os
+import zlib
+from typing import Optional, Tuple
+from app.schemas.interview import Answer, Evaluation, InterviewRound, InterviewSession, Question
+from app.utils.question_bank import restore_expected_answers
+
+try:
+    import msgpack
+
+    def _packb(value) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def _unpackb(body: bytes):
+        return msgpack.unpackb(body, raw=False)
+except ImportError:
+    try:
+        import ormsgpack
+
+        _packb = ormsgpack.packb
+        _unpackb = ormsgpack.unpackb
+    except ImportError:
+        _packb = _unpackb = None
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_VERSION = 1
+FORMAT_MSGPACK = 0x01
+FORMAT_JSON = 0x02
+COMPRESSED = 0x80
+
+# Append-only: codes are persisted
+ROUND_CODES = {
+    InterviewRound.BEHAVIOURAL: 0,
+    InterviewRound.LOGICAL: 1,
+    InterviewRound.APTITUDE: 2,
+    InterviewRound.FINISHED: 3,
+}
+ROUNDS_BY_CODE = {code: round_ for round_, code in ROUND_CODES.items()}
+
+
+class SessionCodec:
+    """
+    Encodes and decodes transcript entries and whole sessions in the format
+    described in the module docstring.
+
+    Tunables (environment):
+        SESSION_CODEC              "msgpack" (default; falls back to "json", with a warning, if no MessagePack
+                                   library is installed) or "json"; both use the compact layout
+        SESSION_CODEC_COMPRESS_MIN body size in bytes from which zlib is tried (default 512, 0 disables)
+    """
+
+    def __init__(self, body_format: Optional[str] = None, compress_min: Optional[int] = None):
+        body_format = body_format or os.getenv("SESSION_CODEC", "msgpack")
+        if body_format not in ("msgpack", "json"):
+            raise ValueError(f"Unknown SESSION_CODEC: {body_format!r}")
+        self.binary = body_format == "msgpack" and _packb is not None
+        if body_format == "msgpack" and not self.binary:
+            # Workers that do have msgpack write entries this one can't read; the fleet should agree on a format
+            logger.warning("SESSION_CODEC is msgpack but neither msgpack nor ormsgpack is installed; writing JSON bodies")
+        self.compress_min = compress_min if compress_min is not None else int(os.getenv("SESSION_CODEC_COMPRESS_MIN", "512"))
+
+    def dump_question(self, question: Question) -> bytes:
+        return self._encode(self._question_fields(question))
+
+    def load_question(self, raw: bytes) -> Question:
+        if raw[:1] == b"{":
+            return Question.model_validate_json(raw)
+        return _question_from_fields(self._decode(raw))
+
+    def dump_answer(self, answer: Answer) -> bytes:
+        return self._encode(self._answer_fields(answer))
+
+    def load_answer(self, raw: bytes) -> Answer:
+        if raw[:1] == b"{":
+            return Answer.model_validate_json(raw)
+        return _answer_from_fields(self._decode(raw))
+
+    def dump_score(self, question_id: str, evaluation: Evaluation) -> bytes:
+        return self._encode(self._score_fields(question_id, evaluation))
+
+    def load_score(self, raw: bytes) -> Tuple[str, Evaluation]:
+        if raw[:1] == b"{":
+            entry = json.loads(raw)
+            return entry.pop("question_id"), Evaluation.model_validate(entry)
+        return _score_from_fields(self._decode(raw))
+
+    def dump_session(self, session: InterviewSession) -> bytes:
+        """The whole session as one value, for the archive."""
+        return self._encode([
+            session.model_dump(mode="json", exclude={"questions_asked", "answers", "scores"}),
+            [self._question_fields(q) for q in session.questions_asked],
+            [self._answer_fields(a) for a in session.answers],
+            [self._score_fields(question_id, e) for question_id, e in session.scores.items()],
+        ])
+
+    def load_session(self, raw: bytes) -> InterviewSession:
+        if raw[:1] == b"\x78":
+            # zlib-compressed JSON written by the archive before this codec
+            return InterviewSession.model_validate_json(zlib.decompress(raw))
+        meta, questions, answers, scores = self._decode(raw)
+        session = InterviewSession.model_validate(meta)
+        session.questions_asked = [_question_from_fields(q) for q in questions]
+        session.answers = [_answer_from_fields(a) for a in answers]
+        session.scores = dict(_score_from_fields(s) for s in scores)
+        restore_expected_answers(session)
+        return session
+
+    def _question_fields(self, question: Question) -> list:
+        fields = [self._pack_id(question.id), question.text, ROUND_CODES[question.round], question.difficulty, question.expected_answer]
+        if question.position is not None:
+            # Bank questions: the answer key is regenerated from the position on load
+            fields[4] = None
+            fields.append(question.position)
+        return fields
+
+    def _answer_fields(self, answer: Answer) -> list:
+        return [self._pack_id(answer.question_id), answer.text, answer.timestamp]
+
+    def _score_fields(self, question_id: str, evaluation: Evaluation) -> list:
+        return [self._pack_id(question_id), evaluation.score, evaluation.feedback, evaluation.criteria_breakdown]
+
+    def _pack_id(self, value: str):
+        # Only canonical (lowercase, hyphenated) UUIDs, so unpacking gives back the same string
+        if self.binary and len(value) == 36 and value == value.lower() and all(value[i] == "-" for i in (8, 13, 18, 23)):
+            try:
+                return bytes.fromhex(value.replace("-", ""))
+            except ValueError:
+                pass
+        return value
+
+    def _encode(self, value) -> bytes:
+        if self.binary:
+            body, body_format = _packb(value), FORMAT_MSGPACK
+        else:
+            body, body_format = json.dumps(value, separators=(",", ":")).encode("utf-8"), FORMAT_JSON
+        flags = body_format
+        if self.compress_min and len(body) >= self.compress_min:
+            compressed = zlib.compress(body)
+            if len(compressed) < len(body):
+                body, flags = compressed, flags | COMPRESSED
+        return bytes((LAYOUT_VERSION, flags)) + body
+
+    @staticmethod
+    def _decode(raw: bytes):
+        version, flags = raw[0], raw[1]
+        if version != LAYOUT_VERSION:
+            raise ValueError(f"Unsupported session encoding version {version}")
+        body = raw[2:]
+        if flags & COMPRESSED:
+            body = zlib.decompress(body)
+        if flags & ~COMPRESSED == FORMAT_JSON:
+            return json.loads(body)
+        if _unpackb is None:
+            raise RuntimeError("Stored session data is MessagePack-encoded; install msgpack to read it")
+        return _unpackb(body)
+
+
+def _unpack_id(value) -> str:
+    if isinstance(value, bytes):
+        h = value.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+    return value
+
+
+def _question_from_fields(fields) -> Question:
+    question_id, text, round_code, difficulty, expected_answer, *position = fields
+    return Question(id=_unpack_id(question_id), text=text, round=ROUNDS_BY_CODE[round_code],
+                    difficulty=difficulty, expected_answer=expected_answer, position=position[0] if position else None)
+
+
+def _answer_from_fields(fields) -> Answer:
+    question_id, text, timestamp = fields
+    return Answer(question_id=_unpack_id(question_id), text=text, timestamp=timestamp)
+
+
+def _score_from_fields(fields) -> Tuple[str, Evaluation]:
+    question_id, score, feedback, breakdown = fields
+    return _unpack_id(question_id), Evaluation(score=score, feedback=feedback, criteria_breakdown=breakdown)
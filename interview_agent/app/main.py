@@ -1,20 +1,40 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
+import asyncio
+import io
+import json
+import logging
 from pydantic import BaseModel
+from typing import List, Optional
+from app.memory import SessionConflictError
 from app.orchestrator import Orchestrator
+from app.report.service import ReportService
+from app.schemas.interview import InterviewRound
+from app.utils.metrics import ACTIVE_SESSIONS, REGISTRY
+from app.utils.scoring import calculate_final_score, scorecard_from_totals
 
-app = FastAPI(title="CoPilot.AI Agent")
+logger = logging.getLogger(__name__)
 
-# CORS Configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter()
 
-orchestrator = Orchestrator()
+REPORT_CHUNK_SIZE = 64 * 1024
+
+def _services(app: FastAPI):
+    """The app's orchestrator and report service, built on first use."""
+    state = app.state
+    if not hasattr(state, "orchestrator"):
+        state.orchestrator = Orchestrator()
+        state.report_service = ReportService()
+    return state
+
+def get_orchestrator(request: Request) -> Orchestrator:
+    return _services(request.app).orchestrator
+
+def get_report_service(request: Request) -> ReportService:
+    return _services(request.app).report_service
 
 class StartInterviewRequest(BaseModel):
     candidate_name: str
@@ -23,32 +43,183 @@ class AnswerRequest(BaseModel):
     session_id: str
     answer: str
 
-@app.post("/start-interview")
-async def start_interview(request: StartInterviewRequest):
+class BulkExportRequest(BaseModel):
+    session_ids: Optional[List[str]] = None
+    completed_since: Optional[float] = None  # Unix timestamp
+
+@router.post("/start-interview")
+async def start_interview(request: StartInterviewRequest, orchestrator: Orchestrator = Depends(get_orchestrator)):
     session = await orchestrator.start_new_session(request.candidate_name)
     # Get the first question immediately
     response = await orchestrator.get_next_action(session.session_id)
     return {"session_id": session.session_id, "initial_action": response}
 
-@app.post("/answer")
-async def submit_answer(request: AnswerRequest):
-    response = await orchestrator.get_next_action(request.session_id, request.answer)
+@router.post("/answer")
+async def submit_answer(request: AnswerRequest, orchestrator: Orchestrator = Depends(get_orchestrator)):
+    try:
+        response = await orchestrator.get_next_action(request.session_id, request.answer)
+    except SessionConflictError:
+        raise HTTPException(status_code=409, detail="Session was updated concurrently; fetch it and retry")
     return response
 
-@app.get("/")
+@router.post("/answer/stream")
+async def stream_answer(request: AnswerRequest, orchestrator: Orchestrator = Depends(get_orchestrator)):
+    """
+    Server-Sent Events version of /answer: a `feedback` event as soon as the
+    answer is graded, `token` events while the next question is produced, and a
+    final `action` event carrying the same body /answer returns, or an `error`
+    event when /answer would have answered 409 or failed.
+    """
+    async def events():
+        try:
+            async for event, payload in orchestrator.stream_next_action(request.session_id, request.answer):
+                yield f"event: {event}\ndata: {json.dumps(jsonable_encoder(payload))}\n\n"
+        except SessionConflictError:
+            yield f"event: error\ndata: {json.dumps({'error': 'Session was updated concurrently; fetch it and retry'})}\n\n"
+        except Exception:
+            # Headers are already sent, so the failure has to end the stream as an event
+            logger.exception("Streaming turn for session %s failed", request.session_id)
+            yield f"event: error\ndata: {json.dumps({'error': 'The turn could not be completed; retry the answer'})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/")
 async def root():
     return {"message": "Interview Agent API is running"}
 
-@app.get("/export-report/{session_id}")
-async def export_report(session_id: str):
-    session = orchestrator.memory.get_session(session_id)
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(orchestrator: Orchestrator = Depends(get_orchestrator)):
+    ACTIVE_SESSIONS.set(await orchestrator.memory.count_active_sessions())
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/sessions")
+async def list_sessions(
+    order_by: str = "created",
+    candidate: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+):
+    """
+    Session summaries from a secondary index, newest (or highest scoring)
+    first. Pass `next_cursor` back as `cursor` for the next page.
+    """
+    try:
+        sessions, next_cursor = await orchestrator.memory.list_sessions(order_by, candidate, limit, cursor, descending)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"sessions": sessions, "next_cursor": next_cursor}
+
+@router.get("/sessions/{session_id}/scorecard")
+async def get_scorecard(session_id: str, orchestrator: Orchestrator = Depends(get_orchestrator)):
+    """Current scorecard from the session's running totals, without loading the transcript."""
+    totals = await orchestrator.memory.get_score_totals(session_id)
+    if totals is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    score_totals, score_counts = totals
+    if score_counts:
+        scorecard = scorecard_from_totals(score_totals, score_counts)
+    else:
+        # Nothing answered yet, or stored before running totals existed
+        session = await orchestrator.memory.get_session(session_id)
+        scorecard = calculate_final_score(session)
+        score_counts = session.score_counts
+    return {"session_id": session_id, "answers_scored": sum(score_counts.values()), "scorecard": scorecard}
+
+@router.get("/export-report/{session_id}")
+async def export_report(session_id: str, request: Request, orchestrator: Orchestrator = Depends(get_orchestrator),
+                        report_service: ReportService = Depends(get_report_service)):
+    session = await orchestrator.memory.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    from app.report.exporter import ReportGenerator
-    from fastapi.responses import FileResponse
-    
-    generator = ReportGenerator()
-    pdf_path = generator.generate_pdf(session)
-    
-    return FileResponse(pdf_path, media_type='application/pdf', filename=f"report_{session_id}.pdf")
+
+    etag = f'"{ReportService.etag_for(session)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    _, pdf = await report_service.get_report(session)
+    headers["Content-Disposition"] = f'attachment; filename="report_{session_id}.pdf"'
+    headers["Content-Length"] = str(len(pdf))
+    buffer = io.BytesIO(pdf)
+    return StreamingResponse(iter(lambda: buffer.read(REPORT_CHUNK_SIZE), b""), media_type="application/pdf", headers=headers)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match list: whole tags, ignoring W/, with * matching any."""
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+@router.post("/export-reports")
+async def export_reports(request: BulkExportRequest, orchestrator: Orchestrator = Depends(get_orchestrator),
+                         report_service: ReportService = Depends(get_report_service)):
+    if request.session_ids is None and request.completed_since is None:
+        raise HTTPException(status_code=400, detail="Provide session_ids or completed_since")
+
+    session_ids = list(request.session_ids or [])
+    if request.completed_since is not None:
+        session_ids.extend(await orchestrator.memory.list_completed_since(request.completed_since))
+    session_ids = list(dict.fromkeys(session_ids))
+
+    sessions = [s for s in await orchestrator.memory.get_sessions(session_ids) if s]
+    if not sessions:
+        raise HTTPException(status_code=404, detail="No matching sessions")
+
+    return StreamingResponse(
+        report_service.stream_archive(sessions),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="reports.zip"'},
+    )
+
+async def _preload_llm(orchestrator: Orchestrator):
+    try:
+        await asyncio.to_thread(orchestrator.llm_client.preload)
+    except Exception as e:
+        # The first LLM call retries and surfaces the error
+        print(f"Failed to load the LLM: {e}")
+    try:
+        await asyncio.to_thread(orchestrator.agents[InterviewRound.BEHAVIOURAL].preload)
+    except Exception as e:
+        # The first behavioural answer builds it again and surfaces the error
+        print(f"Failed to build the behavioural grader: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    services = _services(app)
+    # With GOOGLE_API_KEY set, the first LLM call would otherwise import
+    # LangChain on the event loop; do it (and build the behavioural grader)
+    # in the background once serving
+    preload = asyncio.ensure_future(_preload_llm(services.orchestrator))
+    yield
+    if not preload.done():
+        preload.cancel()
+    await services.orchestrator.llm_client.close()
+    services.report_service.shutdown()
+
+def create_app() -> FastAPI:
+    """
+    Builds the API. Nothing expensive happens here: the orchestrator and
+    report service are created at startup (or on the first request when the
+    app is driven without lifespan events), and the LLM stack on first use.
+    """
+    app = FastAPI(title="CoPilot.AI Agent", lifespan=lifespan)
+
+    # CORS Configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.include_router(router)
+    return app
+
+app = create_app()
+
+def __getattr__(name: str):
+    # main.orchestrator / main.report_service: the services of the module-level app
+    if name in ("orchestrator", "report_service"):
+        return getattr(_services(app), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,41 +1,595 @@
-from typing import Dict, Optional
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import base64
+import time
+import weakref
 import uuid
 import os
 import json
-import redis
-from app.schemas.interview import InterviewSession
+import logging
+from app.archive import SessionArchive
+from app.codec import SessionCodec
+from app.schemas.interview import InterviewRound, InterviewSession
+from app.utils.question_bank import restore_expected_answers
+from app.utils.scoring import calculate_final_score, scorecard_from_totals
+
+if TYPE_CHECKING:
+    # Imported on demand: only deployments with REDIS_URL pay for redis.asyncio
+    import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# Transcript fields kept as append-only Redis lists next to the session hash.
+LIST_FIELDS = ("questions_asked", "answers", "scores")
+# Secondary indexes: sorted sets of session ids. "created" holds every session
+# scored by created_at; "completed" and "score" hold finished sessions scored
+# by completed_at and overall score. Each also exists per candidate.
+INDEXES = ("created", "completed", "score")
+# In-progress session ids scored by their last write (wall clock), for counting live interviews.
+ACTIVE_KEY = "sessions:active"
+# Header fields a listing returns, read without the transcript.
+SUMMARY_FIELDS = ("session_id", "candidate_name", "current_round", "is_completed", "created_at", "completed_at",
+                  "score_totals", "score_counts")
+
+
+class SessionConflictError(Exception):
+    """A session changed in the store after it was read, so this write was not applied."""
+
+
+def _env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
 
 class MemoryStore:
-    def __init__(self):
-        self._sessions: Dict[str, InterviewSession] = {}
+    """
+    Session store backed by Redis (``redis.asyncio``) when ``REDIS_URL`` is set,
+    otherwise by an in-process dict.
+
+    In Redis a session is a hash (``session:<id>``) of scalar fields plus
+    append-only lists (``session:<id>:questions_asked`` / ``answers`` /
+    ``scores``), so each flush writes only the entries added since the last one.
+
+    Sessions expire after a period without writes (Redis) or without any access
+    (in-process). The in-process tier is also an LRU capped at a fixed number of
+    sessions. With an archive configured, completed sessions are copied to it
+    when saved and read back from it once they've left the hot tier. The
+    in-process backend lists only sessions still in the hot tier. Without an
+    archive, completed sessions have nowhere else to live, so by default they
+    never expire and are kept outside the LRU cap, under a cap of their own
+    that drops the earliest completed first (logged as a warning at startup).
+
+    Writes are compare-and-set on ``version``: a session is only saved if the
+    stored copy still has the version it was read at, otherwise
+    SessionConflictError is raised. In Redis this is WATCH/MULTI, so it holds
+    across workers and replicas. Within a process, callers serialize the
+    read-modify-write of one session with ``lock(session_id)``.
+
+    Tunables (environment):
+        REDIS_MAX_CONNECTIONS          size of the bounded connection pool (default 50)
+        REDIS_POOL_TIMEOUT             seconds to wait for a free connection (default 5)
+        SESSION_TTL_SECONDS            idle expiry for in-progress sessions (default 86400, 0 disables)
+        COMPLETED_SESSION_TTL_SECONDS  idle expiry for finished sessions (default: SESSION_TTL_SECONDS with an
+                                       archive, otherwise none)
+        SESSION_CACHE_MAX_ENTRIES      cap on sessions held in process memory (default 10000)
+        COMPLETED_SESSION_MAX_ENTRIES  cap on completed sessions kept without an archive (default 10000)
+        SESSION_ARCHIVE_PATH           see SessionArchive
+        SESSION_CODEC                  see SessionCodec
+    """
+
+    def __init__(self, redis_client: Optional["redis.Redis"] = None, archive: Optional[SessionArchive] = None):
+        # session_id -> (last access on the monotonic clock, session), least recently used first
+        self._sessions: "OrderedDict[str, Tuple[float, InterviewSession]]" = OrderedDict()
+        # Completed sessions held outside the LRU (see _keeps_completed), earliest completed first
+        self._completed: "OrderedDict[str, InterviewSession]" = OrderedDict()
+        # Ids of every session in either, sorted, so scans page without re-sorting
+        self._session_ids: List[str] = []
+        self._indexes: Dict[str, _SortedIndex] = {}
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
         self.redis_url = os.getenv("REDIS_URL")
-        self.redis_client = None
-        if self.redis_url:
+        self.codec = SessionCodec()
+        self.archive = archive if archive is not None else SessionArchive.from_env()
+        self.session_ttl = _env_int("SESSION_TTL_SECONDS", 86400) or None
+        # Without an archive an expired completed session (and its report) would be gone for good
+        self.completed_session_ttl = _env_int("COMPLETED_SESSION_TTL_SECONDS", self.session_ttl if self.archive else None) or None
+        self.max_hot_sessions = _env_int("SESSION_CACHE_MAX_ENTRIES", 10000)
+        self.max_completed_sessions = _env_int("COMPLETED_SESSION_MAX_ENTRIES", 10000)
+        self.redis_client = redis_client
+        if self.redis_client is None and self.redis_url:
             try:
-                self.redis_client = redis.from_url(self.redis_url)
+                import redis.asyncio as redis
+                pool = redis.BlockingConnectionPool.from_url(
+                    self.redis_url,
+                    max_connections=_env_int("REDIS_MAX_CONNECTIONS", 50),
+                    timeout=_env_int("REDIS_POOL_TIMEOUT", 5),
+                )
+                self.redis_client = redis.Redis(connection_pool=pool)
                 print(f"Connected to Redis at {self.redis_url}")
             except Exception as e:
                 print(f"Failed to connect to Redis: {e}. Falling back to in-memory.")
+        if self.redis_client is None and self.archive is None and self.completed_session_ttl is None:
+            logger.warning("No SESSION_ARCHIVE_PATH: completed sessions are kept in process memory only, and the "
+                           "earliest are dropped beyond %d (COMPLETED_SESSION_MAX_ENTRIES)", self.max_completed_sessions)
 
-    def create_session(self, candidate_name: str) -> InterviewSession:
+    async def create_session(self, candidate_name: str, question_seed: Optional[int] = None) -> InterviewSession:
         session_id = str(uuid.uuid4())
         session = InterviewSession(session_id=session_id, candidate_name=candidate_name)
-        self._save_session(session)
+        if question_seed is not None:
+            session.question_seed = question_seed
+        await self._save_sessions([session])
         return session
 
-    def get_session(self, session_id: str) -> Optional[InterviewSession]:
+    def lock(self, session_id: str) -> asyncio.Lock:
+        """The in-process lock for one session; held from reading a session to writing it back."""
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+    async def get_session(self, session_id: str) -> Optional[InterviewSession]:
+        sessions = await self.get_sessions([session_id])
+        return sessions[0]
+
+    async def get_sessions(self, session_ids: List[str]) -> List[Optional[InterviewSession]]:
+        """Fetches many sessions in a single round trip. Missing ids map to None."""
+        if not session_ids:
+            return []
         if self.redis_client:
-            data = self.redis_client.get(session_id)
-            if data:
-                return InterviewSession.model_validate_json(data)
-            return None
-        return self._sessions.get(session_id)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.hgetall(_meta_key(session_id))
+                    for field in LIST_FIELDS:
+                        pipe.lrange(_list_key(session_id, field), 0, -1)
+                replies = await pipe.execute()
+            stride = 1 + len(LIST_FIELDS)
+            sessions = [_decode_session(replies[i:i + stride], self.codec) for i in range(0, len(replies), stride)]
+        else:
+            sessions = [self._hot_get(session_id) for session_id in session_ids]
+        return await self._fill_from_archive(session_ids, sessions)
 
-    def update_session(self, session: InterviewSession):
-        self._save_session(session)
+    async def _fill_from_archive(self, session_ids: List[str], sessions: List[Optional[InterviewSession]]) -> List[Optional[InterviewSession]]:
+        missing = [session_id for session_id, session in zip(session_ids, sessions) if session is None]
+        if not missing or self.archive is None:
+            return sessions
+        archived = await asyncio.to_thread(self.archive.get_many, missing)
+        return [session if session is not None else archived.get(session_id) for session_id, session in zip(session_ids, sessions)]
 
-    def _save_session(self, session: InterviewSession):
+    async def get_score_totals(self, session_id: str) -> Optional[Tuple[Dict[InterviewRound, float], Dict[InterviewRound, int]]]:
+        """
+        The session's running (score totals, score counts) per round, or None
+        if it doesn't exist. In Redis this reads two hash fields, not the
+        transcript.
+        """
         if self.redis_client:
-            self.redis_client.set(session.session_id, session.model_dump_json())
+            present, totals, counts = await self.redis_client.hmget(
+                _meta_key(session_id), ["session_id", "score_totals", "score_counts"])
+            if present is not None:
+                totals = json.loads(totals) if totals else {}
+                counts = json.loads(counts) if counts else {}
+                return ({InterviewRound(k): float(v) for k, v in totals.items()},
+                        {InterviewRound(k): int(v) for k, v in counts.items()})
+            session = None
         else:
-            self._sessions[session.session_id] = session
+            session = self._hot_get(session_id)
+        if session is None:
+            session = (await self._fill_from_archive([session_id], [None]))[0]
+            if session is None:
+                return None
+        return dict(session.score_totals), dict(session.score_counts)
+
+    async def scan_session_ids(self, cursor: int = 0, count: int = 500) -> Tuple[int, List[str]]:
+        """
+        One page of a full walk over stored session ids. Start with cursor 0
+        and pass back the returned cursor until it is 0 again. Uses SCAN in
+        Redis, so a page holds roughly `count` keys and the cursor can be saved
+        to resume a walk later.
+
+        In process, pages follow session id order and the cursor encodes the
+        last id returned, so reads and writes between pages (which reorder
+        the LRU) don't make the walk skip or repeat sessions.
+        """
+        if self.redis_client:
+            cursor, keys = await self.redis_client.scan(cursor, match="session:*", count=count)
+            # Only the hash keys; the transcript lists share the prefix
+            return int(cursor), [key.decode()[len("session:"):] for key in keys if key.count(b":") == 1]
+        start = bisect_right(self._session_ids, _id_from_cursor(cursor)) if cursor else 0
+        session_ids = self._session_ids[start:start + count]
+        more = start + count < len(self._session_ids)
+        return (_id_to_cursor(session_ids[-1]) if more else 0), session_ids
+
+    async def count_active_sessions(self) -> int:
+        """
+        Interviews in progress that haven't expired. Redis counts across all
+        workers sharing it; in process, only this worker's sessions.
+        """
+        if self.redis_client:
+            if self.session_ttl:
+                # Entries idle longer than the TTL belong to expired sessions
+                await self.redis_client.zremrangebyscore(ACTIVE_KEY, "-inf", time.time() - self.session_ttl)
+            return await self.redis_client.zcard(ACTIVE_KEY)
+        now = time.monotonic()
+        self._evict_hot(now)
+        ttl = self.session_ttl
+        return sum(1 for touched, session in self._sessions.values()
+                   if not session.is_completed and not (ttl and now - touched > ttl))
+
+    async def list_sessions(self, order_by: str = "created", candidate: Optional[str] = None, limit: int = 50,
+                            cursor: Optional[str] = None, descending: bool = True) -> Tuple[List[dict], Optional[str]]:
+        """
+        One page of session summaries from a secondary index, plus the cursor
+        for the next page (None on the last page).
+
+        `order_by` is "created" (all sessions), "completed" or "score"
+        (finished sessions only). `candidate` narrows the listing to one
+        candidate name, matched case-insensitively. The cursor is the last
+        (score, id) returned, so the cost of a page doesn't depend on how deep
+        it is, and sessions added meanwhile don't shift later pages.
+        """
+        if order_by not in INDEXES:
+            raise ValueError(f"order_by must be one of {', '.join(INDEXES)}")
+        key = _index_key(order_by, candidate)
+        after = _decode_cursor(cursor) if cursor else None
+
+        if self.redis_client:
+            entries = await self._redis_index_page(key, after, limit, descending)
+            summaries = await self._redis_summaries(key, [member for member, _ in entries])
+        else:
+            index = self._indexes.get(key)
+            entries = index.page(after, limit, descending) if index else []
+            sessions = [self._hot_get(member) for member, _ in entries]
+            summaries = [_summary_of(session) if session else None for session in sessions]
+
+        next_cursor = _encode_cursor(entries[-1]) if len(entries) == limit else None
+        return [summary for summary in summaries if summary], next_cursor
+
+    async def _redis_index_page(self, key: str, after, limit: int, descending: bool) -> List[Tuple[str, float]]:
+        if after is None:
+            entries = await self.redis_client.zrange(key, 0, limit - 1, desc=descending, withscores=True)
+        else:
+            score, member = after
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                (pipe.zrevrank if descending else pipe.zrank)(key, member)
+                pipe.zscore(key, member)
+                rank, current = await pipe.execute()
+            if rank is not None and current == score:
+                entries = await self.redis_client.zrange(key, rank + 1, rank + limit, desc=descending, withscores=True)
+            else:
+                # The cursor's session left the index or moved; resume strictly past its old score
+                bounds = (f"({score}", "-inf") if descending else (f"({score}", "+inf")
+                entries = await self.redis_client.zrange(key, *bounds, desc=descending, byscore=True,
+                                                         offset=0, num=limit, withscores=True)
+        return [(member.decode(), score) for member, score in entries]
+
+    async def _redis_summaries(self, key: str, session_ids: List[str]) -> List[Optional[dict]]:
+        if not session_ids:
+            return []
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hmget(_meta_key(session_id), list(SUMMARY_FIELDS))
+            replies = await pipe.execute()
+        summaries = [
+            _summary_from_fields({f: json.loads(v) for f, v in zip(SUMMARY_FIELDS, values) if v is not None})
+            if values[0] is not None else None
+            for values in replies
+        ]
+        missing = [session_id for session_id, summary in zip(session_ids, summaries) if summary is None]
+        archived = await asyncio.to_thread(self.archive.get_many, missing) if missing and self.archive else {}
+        summaries = [
+            summary if summary is not None else (_summary_of(archived[session_id]) if session_id in archived else None)
+            for session_id, summary in zip(session_ids, summaries)
+        ]
+        expired = [session_id for session_id in missing if session_id not in archived]
+        if expired:
+            # Index entries of sessions whose keys expired are dropped as they're found
+            await self.redis_client.zrem(key, *expired)
+        return summaries
+
+    async def list_completed_since(self, since: float) -> List[str]:
+        """Ids of sessions completed at or after `since`, oldest first."""
+        key = _index_key("completed")
+        if self.redis_client:
+            return [member.decode() for member in await self.redis_client.zrangebyscore(key, since, "+inf")]
+        index = self._indexes.get(key)
+        completed = {}
+        if self.archive:
+            completed.update(await asyncio.to_thread(self.archive.completed_since, since))
+        if index:
+            completed.update(index.since(since))
+        return sorted(completed, key=lambda session_id: completed[session_id])
+
+    async def update_session(self, session: InterviewSession):
+        await self._save_sessions([session])
+
+    async def update_sessions(self, sessions: List[InterviewSession]):
+        await self._save_sessions(sessions)
+
+    async def rewrite_sessions(self, sessions: List[InterviewSession], fields: Iterable[str] = ("scores",)):
+        """
+        Saves sessions whose existing entries in the given transcript `fields`
+        were changed in place, e.g. re-graded scores. Those lists are written
+        out in full instead of appended to.
+        """
+        fields = tuple(fields)
+        for session in sessions:
+            for field in fields:
+                session._persisted[field] = 0
+        await self._save_sessions(sessions, rewrite=fields)
+
+    async def close(self):
+        if self.redis_client:
+            await self.redis_client.aclose()
+        if self.archive:
+            self.archive.close()
+
+    def _ttl_for(self, session: InterviewSession) -> Optional[int]:
+        return self.completed_session_ttl if session.is_completed else self.session_ttl
+
+    def _keeps_completed(self, session: InterviewSession) -> bool:
+        """Whether the in-process backend must hold this session until it is deleted: nothing else would keep it."""
+        return session.is_completed and self.archive is None and self.completed_session_ttl is None
+
+    async def _save_sessions(self, sessions: List[InterviewSession], rewrite: Tuple[str, ...] = ()):
+        if self.redis_client:
+            await self._save_redis(sessions, rewrite)
+        else:
+            for session in sessions:
+                stored = self._hot_get(session.session_id)
+                # The same object is always current; only a stale copy can conflict
+                if stored is not None and stored is not session and stored.version != session.version:
+                    raise SessionConflictError(session.session_id)
+            now = time.monotonic()
+            for session in sessions:
+                session.version += 1
+                if session.session_id not in self._sessions and session.session_id not in self._completed:
+                    insort(self._session_ids, session.session_id)
+                if self._keeps_completed(session):
+                    self._sessions.pop(session.session_id, None)
+                    self._completed[session.session_id] = session
+                    while len(self._completed) > self.max_completed_sessions:
+                        self._forget(self._completed.popitem(last=False)[1])
+                else:
+                    self._sessions[session.session_id] = (now, session)
+                    self._sessions.move_to_end(session.session_id)
+                for key, score in _index_entries(session):
+                    self._indexes.setdefault(key, _SortedIndex()).add(session.session_id, score)
+            self._evict_hot(now)
+
+        completed = [session for session in sessions if session.is_completed]
+        if completed and self.archive:
+            await asyncio.to_thread(self.archive.put_many, completed)
+
+    async def _save_redis(self, sessions: List[InterviewSession], rewrite: Tuple[str, ...]):
+        from redis.exceptions import WatchError
+
+        keys = [_meta_key(session.session_id) for session in sessions]
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            # Any write to a watched header between here and EXEC aborts the transaction
+            await pipe.watch(*keys)
+            # After WATCH the pipeline runs commands immediately, on the watching connection
+            for session, key in zip(sessions, keys):
+                stored = await pipe.hget(key, "version")
+                # A missing header is a new or expired session
+                if stored is not None and json.loads(stored) != session.version:
+                    raise SessionConflictError(session.session_id)
+
+            pipe.multi()
+            for session in sessions:
+                session.version += 1
+                for field in rewrite:
+                    pipe.delete(_list_key(session.session_id, field))
+                self._queue_delta(pipe, session)
+            try:
+                await pipe.execute()
+            except WatchError:
+                for session in sessions:
+                    session.version -= 1
+                raise SessionConflictError(", ".join(session.session_id for session in sessions)) from None
+        for session in sessions:
+            _mark_persisted(session)
+
+    def _hot_get(self, session_id: str) -> Optional[InterviewSession]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return self._completed.get(session_id)
+        now = time.monotonic()
+        touched, session = entry
+        ttl = self._ttl_for(session)
+        if ttl and now - touched > ttl:
+            self._drop_hot(session_id)
+            return None
+        self._sessions[session_id] = (now, session)
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _evict_hot(self, now: float):
+        """Drops sessions past the LRU cap, then idle ones from the least recently used end."""
+        while self._sessions:
+            session_id, (touched, session) = next(iter(self._sessions.items()))
+            ttl = self._ttl_for(session)
+            if len(self._sessions) > self.max_hot_sessions or (ttl and now - touched > ttl):
+                self._drop_hot(session_id)
+            else:
+                break
+
+    def _drop_hot(self, session_id: str):
+        _, session = self._sessions.pop(session_id)
+        self._forget(session)
+
+    def _forget(self, session: InterviewSession):
+        """Removes a session that left process memory from the id list and the indexes."""
+        position = bisect_left(self._session_ids, session.session_id)
+        del self._session_ids[position]
+        for key, _ in _index_entries(session):
+            index = self._indexes.get(key)
+            if index:
+                index.remove(session.session_id)
+                if not index:
+                    del self._indexes[key]
+
+    def _queue_delta(self, pipe, session: InterviewSession):
+        """Queues the header plus any list entries appended since the last flush."""
+        session_id = session.session_id
+        # Computed first: scoring a session stored before running totals existed fills them in
+        index_entries = _index_entries(session)
+        meta = session.model_dump(mode="json", exclude=set(LIST_FIELDS))
+        pipe.hset(_meta_key(session_id), mapping={k: json.dumps(v) for k, v in meta.items()})
+
+        persisted = session._persisted
+        codec = self.codec
+        new_entries = {
+            "questions_asked": [codec.dump_question(q) for q in session.questions_asked[persisted.get("questions_asked", 0):]],
+            "answers": [codec.dump_answer(a) for a in session.answers[persisted.get("answers", 0):]],
+            "scores": [
+                codec.dump_score(question_id, evaluation)
+                for question_id, evaluation in list(session.scores.items())[persisted.get("scores", 0):]
+            ],
+        }
+        for field, entries in new_entries.items():
+            if entries:
+                pipe.rpush(_list_key(session_id, field), *entries)
+        # Re-adding an unchanged entry is a no-op, so indexes heal if they were lost
+        for key, score in index_entries:
+            pipe.zadd(key, {session_id: score})
+        if session.is_completed:
+            pipe.zrem(ACTIVE_KEY, session_id)
+        else:
+            pipe.zadd(ACTIVE_KEY, {session_id: time.time()})
+
+        ttl = self._ttl_for(session)
+        if ttl:
+            for key in _all_keys(session_id):
+                pipe.expire(key, ttl)
+        elif session.is_completed:
+            # Clears the expiry set while the interview was in progress
+            for key in _all_keys(session_id):
+                pipe.persist(key)
+
+
+class _SortedIndex:
+    """In-process counterpart of a Redis sorted set: (score, member) pairs kept in order."""
+
+    def __init__(self):
+        self._entries: List[Tuple[float, str]] = []
+        self._scores: Dict[str, float] = {}
+
+    def add(self, member: str, score: float):
+        previous = self._scores.get(member)
+        if previous == score:
+            return
+        if previous is not None:
+            del self._entries[bisect_left(self._entries, (previous, member))]
+        insort(self._entries, (score, member))
+        self._scores[member] = score
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def since(self, score: float) -> List[Tuple[str, float]]:
+        return [(member, score) for score, member in self._entries[bisect_left(self._entries, (score, "")):]]
+
+    def remove(self, member: str):
+        score = self._scores.pop(member, None)
+        if score is not None:
+            del self._entries[bisect_left(self._entries, (score, member))]
+
+    def page(self, after: Optional[Tuple[float, str]], limit: int, descending: bool) -> List[Tuple[str, float]]:
+        if descending:
+            end = bisect_left(self._entries, after) if after else len(self._entries)
+            entries = self._entries[max(0, end - limit):end][::-1]
+        else:
+            start = bisect_right(self._entries, after) if after else 0
+            entries = self._entries[start:start + limit]
+        return [(member, score) for score, member in entries]
+
+
+def _index_key(index: str, candidate: Optional[str] = None) -> str:
+    if candidate is None:
+        return f"sessions:{index}"
+    return f"sessions:candidate:{_normalize_name(candidate)}:{index}"
+
+
+def _normalize_name(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def _index_entries(session: InterviewSession) -> List[Tuple[str, float]]:
+    """(index key, score) pairs the session belongs to."""
+    scores = {"created": session.created_at}
+    if session.completed_at is not None:
+        scores["completed"] = session.completed_at
+        scores["score"] = calculate_final_score(session)["overall"]
+    entries = [(_index_key(index), score) for index, score in scores.items()]
+    if session.candidate_name:
+        entries += [(_index_key(index, session.candidate_name), score) for index, score in scores.items()]
+    return entries
+
+
+def _summary_from_fields(fields: dict) -> dict:
+    totals = {InterviewRound(k): v for k, v in fields.pop("score_totals", {}).items()}
+    counts = {InterviewRound(k): v for k, v in fields.pop("score_counts", {}).items()}
+    fields["overall_score"] = scorecard_from_totals(totals, counts)["overall"]
+    return fields
+
+
+def _summary_of(session: InterviewSession) -> dict:
+    return _summary_from_fields(session.model_dump(mode="json", include=set(SUMMARY_FIELDS)))
+
+
+def _encode_cursor(entry: Tuple[str, float]) -> str:
+    member, score = entry
+    return base64.urlsafe_b64encode(json.dumps([score, member]).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        score, member = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), str(member)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _id_to_cursor(session_id: str) -> int:
+    # A positive int, like a SCAN cursor, so callers can checkpoint either kind
+    return int.from_bytes(b"\x01" + session_id.encode(), "big")
+
+
+def _id_from_cursor(cursor: int) -> str:
+    return cursor.to_bytes((cursor.bit_length() + 7) // 8, "big")[1:].decode()
+
+
+def _meta_key(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+def _list_key(session_id: str, field: str) -> str:
+    return f"session:{session_id}:{field}"
+
+
+def _all_keys(session_id: str) -> List[str]:
+    return [_meta_key(session_id)] + [_list_key(session_id, field) for field in LIST_FIELDS]
+
+
+def _mark_persisted(session: InterviewSession):
+    session._persisted = {
+        "questions_asked": len(session.questions_asked),
+        "answers": len(session.answers),
+        "scores": len(session.scores),
+    }
+
+
+def _decode_session(replies, codec: SessionCodec) -> Optional[InterviewSession]:
+    meta, questions, answers, scores = replies
+    if not meta:
+        return None
+    session = InterviewSession.model_validate({k.decode(): json.loads(v) for k, v in meta.items()})
+    session.questions_asked = [codec.load_question(q) for q in questions]
+    session.answers = [codec.load_answer(a) for a in answers]
+    # Later entries win, so a re-evaluation can be appended rather than rewritten.
+    session.scores = dict(codec.load_score(raw) for raw in scores)
+    restore_expected_answers(session)
+    _mark_persisted(session)
+    return session
@@ -0,0 +1,54 @@
+"""
+Re-encodes stored sessions with the current SessionCodec.
+
+Reads already accept both the legacy JSON entries and the compact encoding,
+so this is optional: it reclaims Redis memory sooner than waiting for
+sessions to be rewritten or expire. Completed sessions in Redis have their
+transcript lists rewritten. Sessions still in progress are left alone, since
+a live turn may be appending to them. Archive rows are re-encoded in place.
+
+    python -m app.migrate_codec
+"""
+import argparse
+import asyncio
+import sys
+
+from app.memory import LIST_FIELDS, MemoryStore
+
+
+async def migrate(store: MemoryStore, page_size: int = 500) -> dict:
+    totals = {"scanned": 0, "rewritten": 0, "archived": 0}
+    if store.redis_client:
+        cursor = 0
+        while True:
+            cursor, session_ids = await store.scan_session_ids(cursor, page_size)
+            sessions = [s for s in await store.get_sessions(session_ids) if s is not None and s.is_completed]
+            if sessions:
+                await store.rewrite_sessions(sessions, fields=LIST_FIELDS)
+            totals["scanned"] += len(session_ids)
+            totals["rewritten"] += len(sessions)
+            print(f"scanned {totals['scanned']} sessions, rewrote {totals['rewritten']}", file=sys.stderr)
+            if cursor == 0:
+                break
+    if store.archive:
+        totals["archived"] = await asyncio.to_thread(store.archive.reencode)
+    return totals
+
+
+async def _run(args) -> dict:
+    store = MemoryStore()
+    try:
+        return await migrate(store, args.page_size)
+    finally:
+        await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=500, help="SCAN COUNT hint per page")
+    args = parser.parse_args()
+    print(asyncio.run(_run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,35 @@
+import asyncio
 import logging
+import os
+import time
 import uuid
-from app.schemas.interview import InterviewSession, InterviewRound, Question, Answer
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.schemas.interview import InterviewSession, InterviewRound, Question, Answer, Evaluation
 from app.memory import MemoryStore
 from app.utils.llm_client import LLMClient
 from app.agents.behavioural_agent import BehaviouralAgent
 from app.agents.logical_agent import LogicalAgent
 from app.agents.aptitude_agent import AptitudeAgent
+from app.utils.scoring import evaluation_from_raw, record_evaluation
+from app.utils.metrics import AGENT_SECONDS, PREFETCH_REQUESTS, STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
+QUESTIONS_PER_ROUND = 3
+NEXT_ROUND = {
+    InterviewRound.BEHAVIOURAL: InterviewRound.LOGICAL,
+    InterviewRound.LOGICAL: InterviewRound.APTITUDE,
+    InterviewRound.APTITUDE: InterviewRound.FINISHED,
+}
+
 class Orchestrator:
     def __init__(self):
+        # Speculatively generated next questions: session_id -> ((round, cursor), task).
+        # Bounded so abandoned sessions can't grow it; QUESTION_PREFETCH=0 disables it.
+        self.prefetch_enabled = os.getenv("QUESTION_PREFETCH", "1") != "0"
+        self.prefetch_capacity = int(os.getenv("QUESTION_PREFETCH_CAPACITY", "10000"))
+        self._prefetched: "OrderedDict[str, tuple]" = OrderedDict()
         self.memory = MemoryStore()
         self.llm_client = LLMClient()
         self.agents = {
@@ -19,66 +38,192 @@ class Orchestrator:
             InterviewRound.APTITUDE: AptitudeAgent(self.llm_client)
         }
 
-    async def start_new_session(self, candidate_name: str) -> InterviewSession:
-        return self.memory.create_session(candidate_name)
+    async def start_new_session(self, candidate_name: str, question_seed: int = None) -> InterviewSession:
+        """Starts a session; a fixed `question_seed` makes its questions reproducible."""
+        with STAGE_SECONDS.time(stage="store_write"):
+            session = await self.memory.create_session(candidate_name, question_seed)
+        return session
 
     async def get_next_action(self, session_id: str, last_answer: str = None):
-        session = self.memory.get_session(session_id)
+        response = None
+        async for event, payload in self.stream_next_action(session_id, last_answer):
+            if event == "action":
+                response = payload
+        return response
+
+    async def stream_next_action(self, session_id: str, last_answer: str = None):
+        """
+        Runs one turn as a sequence of (event, payload) pairs:
+
+        - ("feedback", Evaluation | None) as soon as the answer is graded
+        - ("token", str) for each chunk of the next question as the agent produces it
+        - ("action", dict) last, with the same response get_next_action returns
+
+        Turns on one session are serialized in this process by the store's
+        per-session lock. A turn that loses a race with another worker raises
+        SessionConflictError instead of overwriting it.
+        """
+        async with self.memory.lock(session_id):
+            async for event, payload in self._run_turn(session_id, last_answer):
+                yield event, payload
+
+    async def _run_turn(self, session_id: str, last_answer: str = None):
+        with STAGE_SECONDS.time(stage="store_read"):
+            session = await self.memory.get_session(session_id)
         if not session:
-            return {"error": "Session not found"}
+            yield "action", {"error": "Session not found"}
+            return
 
+        # Decide the round change up front from the question count, so grading
+        # and generating the next question can overlap when the round stays.
+        current_round_questions = [q for q in session.questions_asked if q.round == session.current_round]
+        changes_round = session.is_completed or len(current_round_questions) >= QUESTIONS_PER_ROUND
+
+        # Nothing is applied to the session until the turn has its next question:
+        # in process the stored session is this same object, so a turn failing
+        # halfway must leave it as it was for the retry.
+        graded = None
         last_evaluation = None
-        if last_answer:
-            last_evaluation = await self.process_answer(session, last_answer)
+        target = session
+        if changes_round:
+            if last_answer:
+                graded = await self.grade_answer(session, last_answer)
+                last_evaluation = graded[2] if graded else None
+                yield "feedback", last_evaluation
 
-        if session.is_completed:
-            return {"status": "completed", "message": "Interview finished. Thank you!", "session": session, "feedback": last_evaluation}
+            # Check if we need to switch rounds (Simple logic: 3 questions per round)
+            # In a real app, this would be more dynamic
+            if session.is_completed or NEXT_ROUND.get(session.current_round) == InterviewRound.FINISHED:
+                _record_answer(session, graded)
+                if not session.is_completed:
+                    self._transition_round(session)
+                with STAGE_SECONDS.time(stage="store_write"):
+                    await self.memory.update_session(session)
+                yield "action", {"status": "completed", "message": "Interview finished. Thank you!", "session": session, "feedback": last_evaluation}
+                return
+            target = _advanced_to(session, NEXT_ROUND.get(session.current_round, session.current_round))
 
-        # Check if we need to switch rounds (Simple logic: 3 questions per round)
-        # In a real app, this would be more dynamic
-        current_round_questions = [q for q in session.questions_asked if q.round == session.current_round]
-        if len(current_round_questions) >= 3:
-            self._transition_round(session)
-            if session.is_completed:
-                return {"status": "completed", "message": "Interview finished. Thank you!", "session": session, "feedback": last_evaluation}
+        # The question bank walks a per-session permutation, so no duplicate check is needed.
+        # The next question is produced in the background while the answer is graded;
+        # its chunks are buffered and replayed after the feedback event.
+        chunks: asyncio.Queue = asyncio.Queue()
+        generation = asyncio.ensure_future(self._produce_question(target, chunks))
+        grading = None
+        if last_answer and not changes_round:
+            grading = asyncio.ensure_future(self.grade_answer(session, last_answer))
+        try:
+            if grading:
+                graded = await grading
+                last_evaluation = graded[2] if graded else None
+                yield "feedback", last_evaluation
 
-        # Generate next question with duplicate check
-        max_retries = 3
-        question = None
-        
-        existing_questions = {q.text.strip().lower() for q in session.questions_asked}
-        
-        for _ in range(max_retries):
-            q_candidate = await self.generate_question(session)
-            if q_candidate.text.strip().lower() not in existing_questions:
-                question = q_candidate
-                break
-        
-        if not question:
-            # If all retries fail (unlikely), use the last generated one
-            question = q_candidate
+            question = None
+            while question is None:
+                chunk = await chunks.get()
+                if chunk is None:
+                    await generation  # re-raises the generation failure
+                elif isinstance(chunk, Question):
+                    question = chunk
+                else:
+                    yield "token", chunk
+        finally:
+            # A failure on either side (or the client going away) must not leave the other running
+            for task in (generation, grading):
+                if task and not task.done():
+                    task.cancel()
 
-        # Store question in session
+        _record_answer(session, graded)
+        if changes_round:
+            self._transition_round(session)
+        # Store question in session; this is the turn's single flush
         session.questions_asked.append(question)
-        self.memory.update_session(session)
-        
-        return {"status": "in_progress", "question": question, "round": session.current_round, "feedback": last_evaluation}
+        session.question_cursor[session.current_round] = session.question_cursor.get(session.current_round, 0) + 1
+        with STAGE_SECONDS.time(stage="store_write"):
+            await self.memory.update_session(session)
+        self._schedule_prefetch(session)
+
+        yield "action", {"status": "in_progress", "question": question, "round": session.current_round, "feedback": last_evaluation}
+
+    async def _produce_question(self, session: InterviewSession, chunks: asyncio.Queue):
+        """Feeds the next question's text chunks, then the Question, into `chunks`."""
+        try:
+            with STAGE_SECONDS.time(stage="generate_question"):
+                question = await self._take_prefetched(session)
+                if question:
+                    chunks.put_nowait(question.text)
+                    chunks.put_nowait(question)
+                    return
+                async for chunk in self.stream_question(session):
+                    chunks.put_nowait(chunk)
+        except BaseException:
+            # Wake the consumer; it re-raises by awaiting this task
+            chunks.put_nowait(None)
+            raise
 
     def _transition_round(self, session: InterviewSession):
-        if session.current_round == InterviewRound.BEHAVIOURAL:
-            session.current_round = InterviewRound.LOGICAL
-        elif session.current_round == InterviewRound.LOGICAL:
-            session.current_round = InterviewRound.APTITUDE
-        elif session.current_round == InterviewRound.APTITUDE:
-            session.current_round = InterviewRound.FINISHED
+        session.current_round = NEXT_ROUND.get(session.current_round, session.current_round)
+        if session.current_round == InterviewRound.FINISHED:
             session.is_completed = True
-        
-        self.memory.update_session(session)
+            session.completed_at = time.time()
+
+    def _schedule_prefetch(self, session: InterviewSession):
+        """
+        Starts generating the session's next question while the candidate is
+        still answering. The result is keyed by the round and cursor it was
+        drawn for, so it is discarded if the session moves on differently.
+        """
+        if not self.prefetch_enabled:
+            return
+        asked = sum(1 for q in session.questions_asked if q.round == session.current_round)
+        upcoming = session.current_round if asked < QUESTIONS_PER_ROUND else NEXT_ROUND.get(session.current_round)
+        if upcoming in (None, InterviewRound.FINISHED):
+            return
+
+        snapshot = _advanced_to(session, upcoming)
+        key = (upcoming, snapshot.question_cursor.get(upcoming, 0))
+        task = asyncio.ensure_future(self.generate_question(snapshot))
+        task.add_done_callback(_log_prefetch_failure)
+
+        self._discard_prefetch(session.session_id)
+        self._prefetched[session.session_id] = (key, task)
+        while len(self._prefetched) > self.prefetch_capacity:
+            _, (_, evicted) = self._prefetched.popitem(last=False)
+            evicted.cancel()
+
+    async def _take_prefetched(self, session: InterviewSession):
+        entry = self._prefetched.pop(session.session_id, None)
+        if entry is None:
+            PREFETCH_REQUESTS.inc(result="miss")
+            return None
+        key, task = entry
+        if key != (session.current_round, session.question_cursor.get(session.current_round, 0)):
+            PREFETCH_REQUESTS.inc(result="stale")
+            task.cancel()
+            return None
+        try:
+            question = await task
+        except Exception:
+            # Already logged; generate the question on the critical path instead
+            PREFETCH_REQUESTS.inc(result="failed")
+            return None
+        PREFETCH_REQUESTS.inc(result="hit")
+        return question
+
+    def _discard_prefetch(self, session_id: str):
+        entry = self._prefetched.pop(session_id, None)
+        if entry:
+            entry[1].cancel()
 
     async def process_answer(self, session: InterviewSession, answer_text: str):
+        graded = await self.grade_answer(session, answer_text)
+        _record_answer(session, graded)
+        return graded[2] if graded else None
+
+    async def grade_answer(self, session: InterviewSession, answer_text: str) -> Optional[Tuple[Answer, Question, Optional[Evaluation]]]:
+        """Grades an answer to the last question without changing the session; process_answer also records it."""
         # Find the last question asked
         if not session.questions_asked:
-            return # Should not happen
+            return None # Should not happen
 
         last_question = session.questions_asked[-1]
         
@@ -88,48 +233,53 @@ class Orchestrator:
             text=answer_text,
             timestamp=0.0 # TODO: meaningful timestamp
         )
-        session.answers.append(answer)
 
         # Evaluate answer
         agent = self.agents.get(session.current_round)
         evaluation = None
         if agent:
-            raw_eval = await agent.evaluate_answer(last_question.text, answer_text)
-            
-            # Calculate score and map to Evaluation schema
-            score = 0.0
-            feedback = raw_eval.get("feedback", "No feedback provided.")
-            breakdown = {k: v for k, v in raw_eval.items() if k != "feedback" and isinstance(v, (int, float))}
+            with STAGE_SECONDS.time(stage="process_answer"), AGENT_SECONDS.time(round=session.current_round.value, operation="evaluate_answer"):
+                raw_eval = await agent.evaluate_answer(last_question, answer_text)
             
-            if breakdown:
-                score = sum(breakdown.values()) / len(breakdown)
-            
-            from app.schemas.interview import Evaluation
-            evaluation = Evaluation(
-                score=score,
-                feedback=feedback,
-                criteria_breakdown=breakdown
-            )
-            
-            session.scores[last_question.id] = evaluation
+            evaluation = evaluation_from_raw(raw_eval)
         
-        self.memory.update_session(session)
-        return evaluation
+        return answer, last_question, evaluation
 
     async def generate_question(self, session: InterviewSession) -> Question:
         agent = self.agents.get(session.current_round)
         if not agent:
              return Question(id=str(uuid.uuid4()), text="Error: No agent for this round.", round=session.current_round)
         
-        question_text = await agent.generate_question(session)
-        
-        # If it's a mock response (dict), extract text, otherwise use string
-        if isinstance(question_text, dict): 
-            # This shouldn't happen with current base_agent but good for safety
-            question_text = str(question_text)
-
-        return Question(
-            id=str(uuid.uuid4()),
-            text=question_text,
-            round=session.current_round
-        )
+        with AGENT_SECONDS.time(round=session.current_round.value, operation="generate_question"):
+            return await agent.generate_question(session)
+
+    async def stream_question(self, session: InterviewSession):
+        """Yields text chunks of the next question, then the finished Question."""
+        agent = self.agents.get(session.current_round)
+        if not agent:
+            yield await self.generate_question(session)
+            return
+
+        with AGENT_SECONDS.time(round=session.current_round.value, operation="generate_question"):
+            async for chunk in agent.stream_question(session):
+                yield chunk
+
+
+def _record_answer(session: InterviewSession, graded: Optional[Tuple[Answer, Question, Optional[Evaluation]]]):
+    if graded is None:
+        return
+    answer, question, evaluation = graded
+    session.answers.append(answer)
+    if evaluation is not None:
+        record_evaluation(session, question, evaluation)
+
+
+def _advanced_to(session: InterviewSession, round_: InterviewRound) -> InterviewSession:
+    # Shallow copy: agents only read the transcript, and the fields the
+    # snapshot changes are replaced rather than mutated
+    return session.model_copy(update={"current_round": round_, "question_cursor": dict(session.question_cursor)})
+
+
+def _log_prefetch_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.warning("Question prefetch failed: %s", task.exception())
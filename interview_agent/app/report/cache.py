@@ -0,0 +1,69 @@
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+
+
+class DiskReportCache:
+    """
+    Bounded on-disk cache of rendered reports, one file per content key.
+
+    Entries are evicted least-recently-used first once the directory grows past
+    `max_bytes`. Recency survives restarts via file mtimes, which are bumped on
+    every hit. Writes go through a temp file and os.replace, so concurrent
+    workers never see a partial PDF.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        files = []
+        for name in os.listdir(directory):
+            if name.endswith(".pdf"):
+                stat = os.stat(os.path.join(directory, name))
+                files.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total += size
+        self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if key not in self._entries:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker sharing the directory
+            self._total -= self._entries.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        self._total += len(data) - self._entries.pop(key, 0)
+        self._entries[key] = len(data)
+        self._evict()
+
+    def _evict(self):
+        while self._total > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
@@ -1,8 +1,23 @@
+import os
+from typing import Optional
 from fpdf import FPDF
 from app.schemas.interview import InterviewSession
 
+# Anchored to this package rather than the working directory
+DEFAULT_OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class ReportGenerator:
-    def generate_pdf(self, session: InterviewSession) -> str:
+    def generate_pdf(self, session: InterviewSession, output_dir: Optional[str] = None) -> str:
+        """Writes the report to disk and returns its path. The API serves render() output instead."""
+        filename = f"report_{session.session_id}.pdf"
+
+        output_path = os.path.join(output_dir or DEFAULT_OUTPUT_DIR, filename)
+        with open(output_path, "wb") as f:
+            f.write(self.render(session))
+        return output_path
+
+    def render(self, session: InterviewSession) -> bytes:
+        """Lays out the report and returns the PDF document as bytes."""
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", size=12)
@@ -17,8 +32,9 @@ class ReportGenerator:
         pdf.ln(5)
 
         # Scorecard
-        from app.utils.scoring import calculate_final_score
+        from app.utils.scoring import calculate_final_score, get_score_weights
         scorecard = calculate_final_score(session)
+        weights = get_score_weights()
         
         pdf.ln(10)
         pdf.set_font("Arial", 'B', 14)
@@ -28,10 +44,10 @@ class ReportGenerator:
         pdf.cell(100, 10, txt=sanitize(f"Overall Score: {scorecard['overall']:.2f} / 5.0"), ln=1)
         pdf.ln(5)
         
-        pdf.cell(100, 10, txt=sanitize(f"Behavioural (40%): {scorecard['behavioural']:.2f}"), ln=1)
-        pdf.cell(100, 10, txt=sanitize(f"Logical (30%): {scorecard['logical']:.2f}"), ln=1)
-        pdf.cell(100, 10, txt=sanitize(f"Aptitude (20%): {scorecard['aptitude']:.2f}"), ln=1)
-        pdf.cell(100, 10, txt=sanitize(f"Communication (10%): {scorecard['communication']:.2f}"), ln=1)
+        pdf.cell(100, 10, txt=sanitize(f"Behavioural ({weights['behavioural']:.0%}): {scorecard['behavioural']:.2f}"), ln=1)
+        pdf.cell(100, 10, txt=sanitize(f"Logical ({weights['logical']:.0%}): {scorecard['logical']:.2f}"), ln=1)
+        pdf.cell(100, 10, txt=sanitize(f"Aptitude ({weights['aptitude']:.0%}): {scorecard['aptitude']:.2f}"), ln=1)
+        pdf.cell(100, 10, txt=sanitize(f"Communication ({weights['communication']:.0%}): {scorecard['communication']:.2f}"), ln=1)
         
         pdf.ln(10)
         pdf.set_font("Arial", 'B', 14)
@@ -58,8 +74,5 @@ class ReportGenerator:
             
             pdf.ln(5)
 
-        filename = f"report_{session.session_id}.pdf"
-
-        output_path = f"app/report/{filename}"
-        pdf.output(output_path)
-        return output_path
+        # FPDF 1.x returns the document as a latin-1 str
+        return pdf.output(dest="S").encode("latin-1")
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import os
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from app.report.cache import DiskReportCache
+from app.schemas.interview import InterviewSession
+from app.utils.metrics import CACHE_REQUESTS, REPORT_RENDER_SECONDS
+from app.utils.scoring import get_score_weights
+
+
+def _render_report(session: InterviewSession) -> bytes:
+    # Runs in a worker process; imported there so the parent never pays for FPDF.
+    from app.report.exporter import ReportGenerator
+    return ReportGenerator().render(session)
+
+
+class _ZipSink:
+    """Write-only file object handing zipfile output back in chunks; zipfile
+    falls back to data descriptors because it cannot seek."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ReportService:
+    """
+    Renders PDF reports in a process pool so FPDF layout never runs on the
+    event loop.
+
+    A report is addressed by a hash of (session_id, version). Reports of
+    completed sessions are kept in a bounded LRU, so repeat downloads return
+    cached bytes, and concurrent requests for the same report share one render.
+    Rendering happens entirely in memory. Setting REPORT_CACHE_DIR adds a
+    size-capped on-disk tier behind the in-memory one.
+
+    Tunables (environment):
+        REPORT_WORKERS          worker processes (default: CPU count)
+        REPORT_CACHE_SIZE       cached reports kept in memory (default 128)
+        REPORT_CACHE_DIR        directory for the on-disk tier (default: disabled)
+        REPORT_CACHE_MAX_BYTES  size cap of the on-disk tier (default 256 MiB)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_size: Optional[int] = None, disk_cache: Optional[DiskReportCache] = None):
+        self.max_workers = max_workers or int(os.getenv("REPORT_WORKERS", "0")) or None
+        self.cache_size = cache_size if cache_size is not None else int(os.getenv("REPORT_CACHE_SIZE", "128"))
+        self.disk_cache = disk_cache
+        cache_dir = os.getenv("REPORT_CACHE_DIR")
+        if self.disk_cache is None and cache_dir:
+            self.disk_cache = DiskReportCache(cache_dir, int(os.getenv("REPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def etag_for(session: InterviewSession) -> str:
+        # The weights are deployment config, so a change must not serve reports scored with the old ones
+        weights = ",".join(f"{name}={weight}" for name, weight in sorted(get_score_weights().items()))
+        return hashlib.sha256(f"{session.session_id}:{session.version}:{weights}".encode()).hexdigest()
+
+    async def get_report(self, session: InterviewSession) -> Tuple[str, bytes]:
+        """Returns (etag, pdf bytes) for the session's current version."""
+        etag = self.etag_for(session)
+        cached = self._cache.get(etag)
+        if cached is not None:
+            self._cache.move_to_end(etag)
+            CACHE_REQUESTS.inc(cache="report", result="hit")
+            return etag, cached
+
+        inflight = self._inflight.get(etag)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._load_or_render(session, etag))
+            self._inflight[etag] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(etag, None))
+        pdf = await asyncio.shield(inflight)
+
+        if session.is_completed and self.cache_size > 0:
+            self._cache[etag] = pdf
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return etag, pdf
+
+    async def stream_archive(self, sessions: List[InterviewSession]) -> AsyncIterator[bytes]:
+        """
+        Yields a ZIP archive of the sessions' reports. Reports render in
+        parallel across the pool, and each member is emitted as soon as its
+        render finishes, so the archive is in completion order, not input order.
+        """
+        async def named_report(session: InterviewSession) -> Tuple[str, bytes]:
+            _, pdf = await self.get_report(session)
+            return f"report_{session.session_id}.pdf", pdf
+
+        tasks = [asyncio.ensure_future(named_report(session)) for session in sessions]
+        sink = _ZipSink()
+        try:
+            with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+                for next_report in asyncio.as_completed(tasks):
+                    name, pdf = await next_report
+                    archive.writestr(name, pdf)
+                    yield sink.drain()
+            yield sink.drain()
+        finally:
+            # Client went away or a render failed: stop the remaining work
+            for task in tasks:
+                task.cancel()
+
+    async def _load_or_render(self, session: InterviewSession, etag: str) -> bytes:
+        if self.disk_cache and session.is_completed:
+            pdf = await asyncio.to_thread(self.disk_cache.get, etag)
+            if pdf is not None:
+                CACHE_REQUESTS.inc(cache="report", result="disk_hit")
+                return pdf
+
+        CACHE_REQUESTS.inc(cache="report", result="miss")
+        loop = asyncio.get_running_loop()
+        with REPORT_RENDER_SECONDS.time():
+            pdf = await loop.run_in_executor(self._pool(), _render_report, session)
+
+        if self.disk_cache and session.is_completed:
+            await asyncio.to_thread(self.disk_cache.put, etag, pdf)
+        return pdf
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
@@ -0,0 +1,218 @@
+"""
+Re-grades stored interviews with the current offline rubric.
+
+Walks every session in the configured store (``REDIS_URL``) page by page with
+SCAN. For each completed session it re-evaluates every answer, replaces its
+Evaluations and rebuilds its running score totals. Pages are graded in worker
+processes; at most ``workers * 2`` pages are held in memory at once. Sessions
+still in progress are skipped, since a live turn may be writing to them.
+
+A page is written back in one transaction. If a session in it was written
+since it was read, the page's sessions are written one at a time instead,
+and a conflicting session is read again and re-graded; one that still
+conflicts is logged and skipped (counted in ``skipped``).
+
+After each page is written back, the SCAN cursor and running totals are
+saved to the checkpoint file. Re-running the command with the same
+checkpoint resumes from there. The checkpoint is removed when the walk
+finishes.
+
+    python -m app.rescore --checkpoint rescore.json --workers 4
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+from app.memory import MemoryStore, SessionConflictError
+from app.schemas.interview import InterviewRound, InterviewSession
+from app.utils.batch_grader import BEHAVIOURAL_COLUMNS, EXACT_COLUMNS, grade_batch
+from app.utils.scoring import evaluation_from_raw, rebuild_score_totals
+
+logger = logging.getLogger(__name__)
+
+
+def _grade_page(rows: List[tuple]) -> List[dict]:
+    """Worker entry point: grades (question, answer, expected) rows into raw evaluation dicts."""
+    graded = grade_batch(rows)
+    columns = ["score", "feedback"] + EXACT_COLUMNS + BEHAVIOURAL_COLUMNS
+    raw_evals = []
+    for record in graded[columns].to_dict("records"):
+        raw_evals.append({key: value for key, value in record.items() if not (isinstance(value, float) and value != value)})
+    return raw_evals
+
+
+def _answer_rows(sessions: List[InterviewSession]) -> List[tuple]:
+    """(session index, question id, row) for every answer, graded by its question's round."""
+    rows = []
+    for index, session in enumerate(sessions):
+        questions = {question.id: question for question in session.questions_asked}
+        for answer in session.answers:
+            question = questions.get(answer.question_id)
+            if question is None:
+                continue
+            if question.round == InterviewRound.BEHAVIOURAL:
+                expected = None
+            elif question.expected_answer:
+                expected = question.expected_answer
+            else:
+                # Its key can't be regenerated; keep the evaluation made when it was known
+                logger.warning("Question %s of session %s has no answer key; keeping its evaluation",
+                               question.id, session.session_id)
+                continue
+            rows.append((index, question.id, (question.text, answer.text, expected)))
+    return rows
+
+
+def apply_evaluations(sessions: List[InterviewSession], rows: List[tuple], raw_evals: List[dict]):
+    """Replaces the graded Evaluations and rebuilds each session's running score totals."""
+    for (index, question_id, _), raw_eval in zip(rows, raw_evals):
+        sessions[index].scores[question_id] = evaluation_from_raw(raw_eval)
+    for session in sessions:
+        rebuild_score_totals(session)
+
+
+def load_checkpoint(path: Optional[str]) -> dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"cursor": 0, "scanned": 0, "rescored": 0, "answers": 0, "skipped": 0}
+
+
+def save_checkpoint(path: str, state: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+async def rescore_sessions(store: MemoryStore, workers: Optional[int] = None, page_size: int = 500,
+                           checkpoint: Optional[str] = None,
+                           progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """Runs the walk described in the module docstring and returns the final totals."""
+    state = load_checkpoint(checkpoint)
+    if state["cursor"] == 0 and state["scanned"]:
+        # The previous walk wrote its last page but stopped before removing the checkpoint
+        os.remove(checkpoint)
+        return state
+
+    loop = asyncio.get_running_loop()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    max_pending = (workers or os.cpu_count() or 1) * 2
+    # (cursor after the page, sessions scanned, completed sessions, grading rows, grading future)
+    pending = deque()
+
+    async def rewrite_one(session: InterviewSession) -> bool:
+        """Writes one re-graded session, re-reading and re-grading it once if it conflicts."""
+        try:
+            await store.rewrite_sessions([session])
+            return True
+        except SessionConflictError:
+            pass
+        fresh = (await store.get_sessions([session.session_id]))[0]
+        if fresh is not None and fresh.is_completed:
+            rows = _answer_rows([fresh])
+            raw_evals = await loop.run_in_executor(executor, _grade_page, [row for _, _, row in rows]) if rows else []
+            apply_evaluations([fresh], rows, raw_evals)
+            try:
+                await store.rewrite_sessions([fresh])
+                return True
+            except SessionConflictError:
+                pass
+        logger.warning("Session %s kept changing while it was re-scored; skipping it", session.session_id)
+        return False
+
+    async def write_back():
+        next_cursor, scanned, sessions, rows, future = pending.popleft()
+        raw_evals = await future
+        apply_evaluations(sessions, rows, raw_evals)
+        written = len(sessions)
+        if sessions:
+            try:
+                await store.rewrite_sessions(sessions)
+            except SessionConflictError:
+                # A live write to any one session aborts the whole page
+                written = sum([await rewrite_one(session) for session in sessions])
+        # Only reached once every session of the page is written or skipped
+        state.update(
+            cursor=next_cursor,
+            scanned=state["scanned"] + scanned,
+            rescored=state["rescored"] + written,
+            answers=state["answers"] + len(rows),
+            skipped=state.get("skipped", 0) + len(sessions) - written,
+        )
+        if checkpoint:
+            save_checkpoint(checkpoint, state)
+        if progress:
+            progress(state)
+
+    try:
+        cursor = state["cursor"]
+        while True:
+            cursor, session_ids = await store.scan_session_ids(cursor, page_size)
+            sessions = [s for s in await store.get_sessions(session_ids) if s is not None and s.is_completed]
+            rows = _answer_rows(sessions)
+            if rows:
+                future = loop.run_in_executor(executor, _grade_page, [row for _, _, row in rows])
+            else:
+                future = loop.create_future()
+                future.set_result([])
+            pending.append((cursor, len(session_ids), sessions, rows, future))
+
+            # Pages are written back in scan order, so the saved cursor never skips an unwritten page
+            while len(pending) >= max_pending or (pending and cursor == 0):
+                await write_back()
+            if cursor == 0:
+                break
+    finally:
+        for *_, future in pending:
+            future.cancel()
+        executor.shutdown(cancel_futures=True)
+
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return state
+
+
+def _report_progress(started: float):
+    def report(state: dict):
+        elapsed = time.perf_counter() - started
+        print(
+            f"scanned {state['scanned']} sessions, rescored {state['rescored']} "
+            f"({state['answers']} answers) in {elapsed:.1f}s",
+            file=sys.stderr,
+        )
+    return report
+
+
+async def _run(args) -> dict:
+    store = MemoryStore()
+    if not store.redis_client:
+        print("REDIS_URL is not set; there are no stored sessions to re-score.", file=sys.stderr)
+        return load_checkpoint(None)
+    try:
+        return await rescore_sessions(store, args.workers, args.page_size, args.checkpoint,
+                                      _report_progress(time.perf_counter()))
+    finally:
+        await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=None, help="grading processes (default: CPU count)")
+    parser.add_argument("--page-size", type=int, default=500, help="SCAN COUNT hint per page")
+    parser.add_argument("--checkpoint", default=None, help="file to save progress to and resume from")
+    args = parser.parse_args()
+
+    state = asyncio.run(_run(args))
+    print(json.dumps(state))
+
+
+if __name__ == "__main__":
+    main()
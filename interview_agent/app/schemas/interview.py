@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Optional, Dict
 from enum import Enum
+import random
+import time
 
 class InterviewRound(str, Enum):
     BEHAVIOURAL = "behavioural"
@@ -13,6 +15,13 @@ class Question(BaseModel):
     text: str
     round: InterviewRound
     difficulty: Optional[int] = 1
+    # Answer key for exact-match rounds. Kept on the session so grading never
+    # depends on agent state, and excluded from API responses.
+    expected_answer: Optional[str] = Field(default=None, exclude=True)
+    # Position in the session's walk through the question bank, for bank
+    # questions. With the session's question_seed it regenerates the question,
+    # so the answer key is recomputed on load instead of being stored.
+    position: Optional[int] = Field(default=None, exclude=True)
 
 class Answer(BaseModel):
     question_id: str
@@ -32,3 +41,19 @@ class InterviewSession(BaseModel):
     answers: List[Answer] = []
     scores: Dict[str, Evaluation] = {}
     is_completed: bool = False
+    created_at: float = Field(default_factory=time.time)
+    completed_at: Optional[float] = None
+    # Bumped by the store on every write; identifies a snapshot of the session.
+    version: int = 0
+    # Running sum and count of evaluation scores per round, kept up to date as
+    # answers are graded so the scorecard never has to walk the transcript.
+    score_totals: Dict[InterviewRound, float] = {}
+    score_counts: Dict[InterviewRound, int] = {}
+    # Fixes this session's walk through the question bank; the cursor counts
+    # questions drawn per round.
+    question_seed: int = Field(default_factory=lambda: random.getrandbits(32))
+    question_cursor: Dict[InterviewRound, int] = {}
+
+    # Lengths of questions_asked / answers / scores already written to the
+    # store, so a flush only appends what the current turn added.
+    _persisted: Dict[str, int] = PrivateAttr(default_factory=dict)
@@ -0,0 +1,152 @@
+"""
+Vectorized grading for re-scoring many answers at once.
+
+Grades the same way as ``OfflineEngine.evaluate_exact_match`` and
+``OfflineEngine.evaluate_behavioural``, but a whole batch at a time: the STAR
+keywords are found with one precompiled search per component, and the
+length rules, clamping and score averaging run as NumPy array operations.
+Feedback texts are built once per distinct outcome rather than per row.
+
+Behavioural rows go to the grader the live interview uses (BEHAVIOURAL_GRADER):
+by default ``SemanticGrader.grade_many``, else the keyword rules above.
+"""
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.utils.offline_engine import (
+    MISSING_KEY_FEEDBACK,
+    NUMBER_PATTERN,
+    STAR_KEYWORDS,
+    STAR_MATCHER,
+    behavioural_feedback,
+    is_numeric_answer,
+    text_answer_matches,
+)
+from app.utils.semantic_grader import get_semantic_grader, grader_mode
+
+STAR_COMPONENTS = list(STAR_KEYWORDS)
+EXACT_COLUMNS = ["accuracy", "methodology"]
+BEHAVIOURAL_COLUMNS = ["situation", "task", "action", "result"]
+
+
+def grade_batch(rows: Union[pd.DataFrame, Iterable[Tuple[str, str, Optional[str]]]],
+                behavioural_grader: str = None) -> pd.DataFrame:
+    """
+    Grades (question, answer, expected) rows.
+
+    A row whose ``expected`` is None is graded as a behavioural answer, any
+    other row by exact match against ``expected``. ``rows`` may also be a
+    DataFrame with those three columns. ``behavioural_grader`` ("semantic" or
+    "keywords") overrides BEHAVIOURAL_GRADER.
+
+    Returns one row per input, in order, with:
+        kind              "exact" or "behavioural"
+        score             the evaluator's own 1-5 score
+        feedback          the evaluator's feedback text
+        accuracy .. result the criteria of the row's evaluator (NaN for the other kind)
+        evaluation_score  the mean of the criteria, as stored on an Evaluation
+    """
+    if isinstance(rows, pd.DataFrame):
+        frame = rows.reset_index(drop=True)
+    else:
+        frame = pd.DataFrame(list(rows), columns=["question", "answer", "expected"])
+
+    n = len(frame)
+    answers = frame["answer"].fillna("").astype(str).tolist()
+    expected = frame["expected"].tolist()
+    behavioural = frame["expected"].isna().to_numpy()
+    semantic = grader_mode(behavioural_grader) == "semantic"
+
+    scores = np.zeros(n, dtype=np.int64)
+    feedback = np.empty(n, dtype=object)
+    criteria = {column: np.full(n, np.nan) for column in EXACT_COLUMNS + BEHAVIOURAL_COLUMNS}
+
+    exact_rows = np.flatnonzero(~behavioural)
+    if exact_rows.size:
+        exact_scores, feedback[exact_rows] = grade_exact_match([answers[i] for i in exact_rows], [expected[i] for i in exact_rows])
+        scores[exact_rows] = exact_scores
+        for column in EXACT_COLUMNS:
+            criteria[column][exact_rows] = exact_scores
+
+    behavioural_rows = np.flatnonzero(behavioural)
+    if behavioural_rows.size:
+        behavioural_answers = [answers[i] for i in behavioural_rows]
+        if semantic:
+            questions = frame["question"].fillna("").astype(str).tolist()
+            graded = get_semantic_grader().grade_many([questions[i] for i in behavioural_rows], behavioural_answers)
+        else:
+            graded = grade_behavioural(behavioural_answers)
+        behavioural_scores, feedback[behavioural_rows], star = graded
+        scores[behavioural_rows] = behavioural_scores
+        for column, values in zip(BEHAVIOURAL_COLUMNS, star.T):
+            criteria[column][behavioural_rows] = values
+
+    result = pd.DataFrame({
+        "kind": np.where(behavioural, "behavioural", "exact"),
+        "score": scores,
+        "feedback": feedback,
+        **criteria,
+    })
+    # Mean over the score plus the evaluator's own criteria (NaN columns are skipped)
+    result["evaluation_score"] = result[["score"] + EXACT_COLUMNS + BEHAVIOURAL_COLUMNS].mean(axis=1)
+    return result
+
+
+def grade_exact_match(answers: list, expected: list) -> Tuple[np.ndarray, list]:
+    """Returns the 1/5 scores (0 for a missing key) and feedback for answers graded against expected values."""
+    correct, missing = [], []
+    for answer, correct_answer in zip(answers, expected):
+        user_clean = str(answer).lower().strip()
+        correct_clean = str(correct_answer or "").lower().strip()
+        missing.append(not correct_clean)
+        if not correct_clean:
+            correct.append(False)
+        elif is_numeric_answer(correct_clean):
+            correct.append(correct_clean in NUMBER_PATTERN.findall(user_clean))
+        else:
+            correct.append(text_answer_matches(correct_clean, user_clean))
+
+    feedback = [
+        MISSING_KEY_FEEDBACK if no_key else
+        "Correct! Your calculation/logic is spot on." if ok else f"Incorrect. The correct answer was {correct_answer}."
+        for ok, no_key, correct_answer in zip(correct, missing, expected)
+    ]
+    return np.select([missing, correct], [0, 5], 1), feedback
+
+
+def grade_behavioural(answers: list) -> Tuple[np.ndarray, list, np.ndarray]:
+    """Returns scores, feedback and the (n, 4) situation/task/action/result criteria."""
+    texts = [answer.lower() for answer in answers]
+    n = len(texts)
+
+    # One column per STAR component, in STAR_KEYWORDS order
+    patterns = [pattern for _, pattern in STAR_MATCHER.patterns]
+    star = np.array([[pattern.search(text) is not None for pattern in patterns] for text in texts], dtype=bool).reshape(n, len(STAR_COMPONENTS))
+    words = np.fromiter((len(text.split()) for text in texts), dtype=np.int64, count=n)
+
+    star_points = star.sum(axis=1)
+    length_band = np.select([words < 10, words < 30, words > 50], [0, 1, 3], default=2)
+    scores = np.choose(length_band, [np.ones_like(star_points), np.minimum(star_points, 2), star_points, star_points + 1])
+    scores = np.clip(scores, 1, 5)
+
+    # Feedback only depends on the score, the components found and the length band
+    outcome = scores * 256 + star @ (1 << np.arange(len(STAR_COMPONENTS))) * 4 + length_band
+    distinct, inverse = np.unique(outcome, return_inverse=True)
+    texts_by_outcome = np.array([_behavioural_feedback_for(int(code)) for code in distinct], dtype=object)
+    feedback = texts_by_outcome[inverse].tolist()
+
+    criteria = np.ones((n, len(BEHAVIOURAL_COLUMNS)), dtype=np.int64)
+    criteria[:, 0] = np.fromiter(("situation" in text for text in texts), dtype=bool, count=n)
+    return scores, feedback, criteria
+
+
+def _behavioural_feedback_for(outcome: int) -> str:
+    score, star_mask, length_band = outcome // 256, (outcome // 4) % 64, outcome % 4
+    if length_band == 0:
+        parts = ["Answer way too short"]
+    else:
+        parts = [label for bit, (_, label) in enumerate(STAR_KEYWORDS.values()) if star_mask >> bit & 1]
+        parts += {1: ["Could be more detailed"], 3: ["Good amount of detail"]}.get(length_band, [])
+    return behavioural_feedback(score, parts)
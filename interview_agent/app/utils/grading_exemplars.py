@@ -0,0 +1,144 @@
+"""
+Reference data for the semantic behavioural grader (app.utils.semantic_grader).
+
+BEHAVIOURAL_EXEMPLARS holds strong STAR answers per behavioural question
+type (the types of BEHAVIOURAL_QUESTIONS). STAR_EXEMPLAR_SENTENCES holds
+typical sentences of each STAR component, and STAR_CUES the phrases that
+mark a component on their own. Add to these lists to teach the grader;
+every text is vectorized once when the grader is built.
+"""
+
+BEHAVIOURAL_EXEMPLARS = {
+    "conflict": [
+        "In my last role a coworker and I disagreed about the design of a shared API and the discussion was getting heated. "
+        "I needed to keep the release on track and keep our working relationship. I asked for a one to one meeting, listened to "
+        "his concerns about backwards compatibility and proposed a versioned endpoint that covered both needs. We shipped on time "
+        "and he later told me he appreciated being heard. I learned to address disagreements early and privately.",
+        "When my supervisor and I disagreed about cutting the testing phase to meet a deadline, I was responsible for quality. "
+        "I gathered data on defects from past releases and presented the risk calmly, then suggested testing only the riskiest "
+        "modules. My manager agreed to the compromise, we met the date with no critical bugs, and we now plan test time together.",
+    ],
+    "time_management": [
+        "During a product launch I had three deliverables due in the same week and a tight deadline from the client. My goal was "
+        "to deliver all of them without dropping quality. I listed every task, estimated effort, and prioritized by impact, then "
+        "delegated the documentation and blocked focus time in my calendar. We delivered everything two days early and the client "
+        "renewed the contract.",
+        "At university I was juggling a part time job, exams and a group project with conflicting priorities. I had to meet every "
+        "deadline. I built a weekly schedule, broke work into small milestones and told my team early when I would be unavailable. "
+        "The result was that I passed all exams and our project got the highest grade in the class.",
+    ],
+    "failure": [
+        "Early in my career I missed a data migration deadline because I underestimated the cleanup work. I was responsible for "
+        "the migration plan. I told my manager immediately, took ownership, and created a recovery plan with daily checkpoints. "
+        "We finished a week late with no data loss, and I learned to estimate with buffers and raise risks sooner.",
+        "I once made a mistake at work by deploying a configuration change without review, and it caused an outage for an hour. "
+        "My task was to restore service and prevent it from happening again. I rolled back the change, wrote the incident report "
+        "and added an automated review step. Since then we have had no similar outages and I learned to respect process.",
+    ],
+    "leadership": [
+        "When our team lead left in the middle of a project, the team was losing direction and morale was low. I volunteered to "
+        "coordinate the work. I set up short daily standups, clarified who owned each task and mentored two junior developers. "
+        "We delivered the project on schedule and I was promoted to team lead six months later.",
+        "I led a group of five volunteers organising a charity event with no budget. My goal was to raise money and keep everyone "
+        "motivated. I delegated roles based on strengths, ran weekly check ins and celebrated small wins. The event raised twice "
+        "our target and most volunteers joined again the next year.",
+    ],
+    "learning": [
+        "My team adopted Kubernetes for a new service and I had never used it, with two weeks before we went live. I needed to "
+        "become productive quickly. I completed an online course in the evenings, built a small test cluster and paired with an "
+        "experienced engineer. I deployed our service on time and later ran a workshop to teach the rest of the team.",
+        "When I joined a data team I had to learn SQL and Python fast to build weekly reports. I set a learning goal, practised "
+        "on real datasets every day and asked colleagues to review my queries. Within a month I automated the reports, which "
+        "saved the team about five hours a week.",
+    ],
+    "influence": [
+        "I wanted my team to adopt automated testing but several developers thought it would slow them down. My task was to "
+        "persuade them without authority. I ran a small pilot on one module, measured the bugs it caught and shared the numbers "
+        "in a demo. The team agreed to adopt it and our production defects fell by forty percent.",
+        "Our marketing manager preferred a campaign that I believed targeted the wrong audience. I needed to convince her using "
+        "evidence. I analysed customer data, built a short comparison and proposed an A/B test instead of an argument. The test "
+        "showed my version converted better and she adopted it for the launch.",
+    ],
+    "achievement": [
+        "My goal last year was to cut the page load time of our checkout by half. I profiled the page, removed unused scripts, "
+        "compressed images and added caching, then tracked the metric every week. Load time dropped from four seconds to under "
+        "two and conversion increased by eight percent.",
+        "I set myself the goal of earning a cloud certification while working full time. I planned study sessions around my job, "
+        "used practice exams to find weak areas and joined a study group. I passed on the first attempt and used the skills to "
+        "lead our migration to the cloud.",
+    ],
+    "initiative": [
+        "I noticed our onboarding process took new hires two weeks because the documentation was scattered. Nobody owned it, so I "
+        "took the initiative to fix it. I interviewed recent hires, wrote a single guide and automated the environment setup with a "
+        "script. Onboarding time fell to three days and the guide is now part of our standard process.",
+        "On a client project I went above and beyond by building a dashboard that was not in scope, because the client struggled "
+        "to track progress. I built it in my spare time and reviewed it with my manager first. The client praised it and it became "
+        "a reusable template for other accounts.",
+    ],
+    "feedback": [
+        "In a performance review my manager told me my presentations were too detailed and lost the audience. It was difficult to "
+        "hear, but I asked for specific examples and a mentor to help. I practised structuring talks around three key messages and "
+        "asked for feedback after each one. Six months later my manager said my presentations were among the clearest on the team.",
+        "A peer told me I often interrupted people in meetings. I reacted by thanking her and reflecting on it rather than getting "
+        "defensive. I started taking notes and waiting before speaking, and asked her to tell me if it happened again. Team "
+        "meetings became more balanced and our working relationship improved.",
+    ],
+    "stakeholders": [
+        "I worked with a difficult client who kept changing requirements and was unhappy with progress. My responsibility was to "
+        "deliver the project and keep the relationship. I set up weekly calls, documented every change with its cost and agreed a "
+        "change process with them. The client became much more satisfied, signed off the project and hired us for a second phase.",
+        "A key stakeholder in finance was blocking our release because she did not trust the new reports. I needed her approval. "
+        "I met her to understand her concerns, walked through the calculations and added a reconciliation check she asked for. "
+        "She approved the release and became one of our strongest supporters.",
+    ],
+    "problem_solving": [
+        "Our nightly batch job started failing randomly and nobody could find the cause. I was asked to solve it. I broke the "
+        "problem down, added logging, reproduced the failure and traced it to a race condition between two jobs. I fixed the "
+        "scheduling and added monitoring, and the job has run reliably for a year since.",
+        "Customer complaints about slow support replies doubled in one quarter. My task was to find the root cause. I analysed the "
+        "ticket data, found that most delays came from tickets routed to the wrong team, and designed new routing rules with the "
+        "support leads. Response time dropped by sixty percent within a month.",
+    ],
+}
+
+STAR_EXEMPLAR_SENTENCES = {
+    "situation": [
+        "In my previous job our team was working on a critical project with a tight deadline.",
+        "At the time the company was facing a difficult situation with an unhappy client.",
+        "When I joined the team the process was slow and there was a lot of conflict.",
+        "Last year we had a problem where the system kept failing in production.",
+        "The context was a small startup with limited budget and resources.",
+    ],
+    "task": [
+        "My responsibility was to deliver the project on time and within budget.",
+        "I was asked to find the root cause and fix the issue.",
+        "My goal was to improve the process and reduce delays.",
+        "I needed to convince the team and get approval from my manager.",
+        "It was my task to coordinate the team and meet the deadline.",
+    ],
+    "action": [
+        "I decided to set up a meeting, listened to their concerns and proposed a solution.",
+        "I analysed the data, created a plan and delegated tasks to the team.",
+        "I took ownership, spoke with the stakeholders and built a prototype.",
+        "I implemented automated tests and reviewed every change myself.",
+        "I organised daily check ins and prioritized the most important work.",
+    ],
+    "result": [
+        "As a result we delivered on time and the client was very satisfied.",
+        "The outcome was a forty percent reduction in errors and faster releases.",
+        "In the end the project succeeded and I was promoted.",
+        "Finally costs dropped and the team adopted the new process.",
+        "I learned to communicate earlier and the relationship improved.",
+    ],
+}
+
+STAR_CUES = {
+    "situation": ["situation", "context", "background", "at the time", "when i", "when we", "in my previous", "in my last",
+                  "last year", "during", "project", "problem", "conflict", "challenge"],
+    "task": ["task", "responsibility", "responsible for", "my role", "goal", "objective", "needed to", "had to", "wanted to", "was asked to",
+             "my job was", "i was in charge"],
+    "action": ["action", "i did", "decided", "took", "spoke", "created", "i built", "implemented", "organised", "organized",
+               "analysed", "analyzed", "proposed", "delegated", "set up", "i led", "asked", "agreed", "i met"],
+    "result": ["result", "outcome", "finally", "in the end", "success", "succeeded", "learned", "improved", "increased",
+               "reduced", "dropped", "saved", "percent", "%", "delivered", "achieved", "better"],
+}
@@ -0,0 +1,27 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class KeywordMatcher:
+    """
+    Reports which keyword categories occur (as plain substrings) in a text.
+
+    Each category's keywords are compiled once into a single alternation, so a
+    category costs one ``search`` that stops at the first hit, instead of one
+    substring scan per keyword. The result equals
+    ``any(w in text for w in words)`` per category.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories = list(categories)
+        self.patterns = [
+            (category, re.compile("|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))))
+            for category, words in categories.items()
+            if words
+        ]
+
+    def match(self, text: str) -> FrozenSet[str]:
+        return frozenset(category for category, pattern in self.patterns if pattern.search(text))
+
+    def match_many(self, texts: Iterable[str]) -> List[FrozenSet[str]]:
+        return [self.match(text) for text in texts]
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.utils.metrics import CACHE_REQUESTS
+
+
+class LLMCache:
+    """
+    Two-tier cache for LLM completions: an in-process LRU in front of an
+    optional shared Redis tier (``redis.asyncio`` client).
+
+    Keys hash the model, temperature and whitespace-normalized prompts, so
+    requests that differ only in formatting share an entry. Both tiers honour
+    the same TTL. A Redis failure counts as a miss and never fails the request.
+
+    Tunables (environment):
+        LLM_CACHE_SIZE         in-process entries (default 1024, 0 disables the cache)
+        LLM_CACHE_TTL_SECONDS  entry lifetime (default 3600)
+        LLM_CACHE_REDIS_URL    enables the shared Redis tier
+    """
+
+    KEY_PREFIX = "llm-cache:"
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 3600, redis_client=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_client = redis_client
+        self._entries: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        redis_client = None
+        redis_url = os.getenv("LLM_CACHE_REDIS_URL")
+        if redis_url:
+            import redis.asyncio as redis
+            redis_client = redis.from_url(redis_url)
+        ttl = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+            ttl_seconds=ttl if ttl > 0 else None,
+            redis_client=redis_client,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, user_input: str) -> str:
+        payload = json.dumps(
+            [model, round(float(temperature), 3), _normalize(system_prompt), _normalize(user_input)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.inc(cache="llm", result="hit")
+                return value
+            del self._entries[key]
+
+        if self.redis_client is not None:
+            try:
+                raw = await self.redis_client.get(self.KEY_PREFIX + key)
+            except Exception as e:
+                print(f"LLM cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8")
+                self._store_local(key, value)
+                self.redis_hits += 1
+                CACHE_REQUESTS.inc(cache="llm", result="redis_hit")
+                return value
+
+        self.misses += 1
+        CACHE_REQUESTS.inc(cache="llm", result="miss")
+        return None
+
+    async def set(self, key: str, value: str):
+        self._store_local(key, value)
+        if self.redis_client is not None:
+            try:
+                ttl = int(self.ttl_seconds) if self.ttl_seconds else None
+                await self.redis_client.set(self.KEY_PREFIX + key, value, ex=ttl)
+            except Exception as e:
+                print(f"LLM cache Redis write failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+        }
+
+    def _store_local(self, key: str, value: str):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
@@ -1,42 +1,142 @@
+import asyncio
 import os
+import threading
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from app.utils.llm_cache import LLMCache
+from app.utils.llm_scheduler import LLMDispatcher
+from app.utils.metrics import LLM_CALLS, LLM_FALLBACKS
 
 load_dotenv()
 
+_UNSET = object()
+
 class LLMClient:
-    def __init__(self):
+    """
+    Gemini through LangChain when GOOGLE_API_KEY is set, canned mock responses
+    otherwise. LangChain and the Google SDK take seconds to import, so they are
+    only imported, and the model only built, when ``llm`` is first used;
+    ``preload`` does that ahead of time.
+    """
+
+    def __init__(self, cache: LLMCache = None):
+        self.model_name = "gemini-2.0-flash"
+        self.temperature = 0.7
+        self.cache = cache or LLMCache.from_env()
+        self._llm = _UNSET
+        self._llm_lock = threading.Lock()
+        self._dispatcher = None
+
+    @property
+    def llm(self):
+        if self._llm is _UNSET:
+            with self._llm_lock:
+                if self._llm is _UNSET:
+                    self._llm = self._build_llm()
+        return self._llm
+
+    @llm.setter
+    def llm(self, value):
+        self._llm = value
+
+    def preload(self):
+        """Imports and builds the model now; blocking, so run it off the event loop."""
+        return self.llm
+
+    def _build_llm(self):
         # Default to a mock if no key, or use Google Gemini if key exists
         api_key = os.getenv("GOOGLE_API_KEY")
-        if api_key:
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash",
-                google_api_key=api_key,
-                temperature=0.7,
-                max_retries=0
-            )
-        else:
-            self.llm = None
+        if not api_key:
+            return None
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            model=self.model_name,
+            google_api_key=api_key,
+            temperature=self.temperature,
+            max_retries=0
+        )
+
+    @property
+    def dispatcher(self) -> LLMDispatcher:
+        # Built on first use so tests and callers can swap self.llm beforehand
+        if self._dispatcher is None or self._dispatcher.llm is not self.llm:
+            self._dispatcher = LLMDispatcher(self.llm)
+        return self._dispatcher
+
+    async def close(self):
+        if self._dispatcher is not None:
+            await self._dispatcher.close()
 
     async def generate_response(self, system_prompt: str, user_input: str) -> str:
         # Fallback if no LLM configured
         if not self.llm:
             return self._generate_mock_response(system_prompt, user_input)
         
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_input),
-        ]
+        cache_key = LLMCache.make_key(self.model_name, self.temperature, system_prompt, user_input)
+        if self.cache.enabled:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        messages = _messages(system_prompt, user_input)
         try:
-            # Set a timeout for the API call to prevent hanging
-            response = await self.llm.ainvoke(messages, config={"timeout": 5})
-            return response.content
+            # Coalesced, rate limited, batched and retried by the dispatcher
+            content = await self.dispatcher.submit(cache_key, messages)
+            # Only real model output is cached; mock fallbacks below are not
+            if self.cache.enabled:
+                await self.cache.set(cache_key, content)
+            return content
         except Exception as e:
-            # Log error and fallback to mock
+            # Retries exhausted: log error and fallback to mock
             print(f"LLM Error (Timeout/Quota): {e}. Falling back to mock.")
+            LLM_FALLBACKS.inc()
             return self._generate_mock_response(system_prompt, user_input, error_msg=str(e))
 
+    async def stream_response(self, system_prompt: str, user_input: str):
+        """Like generate_response, but yields the text in chunks as the model produces them."""
+        if not self.llm:
+            yield self._generate_mock_response(system_prompt, user_input)
+            return
+
+        cache_key = LLMCache.make_key(self.model_name, self.temperature, system_prompt, user_input)
+        if self.cache.enabled:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        messages = _messages(system_prompt, user_input)
+        parts = []
+        try:
+            # Streams can't be batched or coalesced, but still count against the rate limit
+            await self.dispatcher.bucket.acquire()
+            LLM_CALLS.inc(mode="stream")
+            stream = self.llm.astream(messages)
+            # One deadline for the whole stream, applied only while waiting on the
+            # provider: a timeout spanning the yields would cancel the consumer
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.dispatcher.timeout
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(anext(stream), deadline - loop.time())
+                    except StopAsyncIteration:
+                        break
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        yield chunk.content
+            finally:
+                await stream.aclose()
+            if self.cache.enabled:
+                await self.cache.set(cache_key, "".join(parts))
+        except Exception as e:
+            print(f"LLM Error (Timeout/Quota): {e}. Falling back to mock.")
+            # Once text has reached the caller the stream can't be replaced, and
+            # ending it quietly would pass the truncated text off as complete
+            if parts:
+                raise
+            LLM_FALLBACKS.inc()
+            yield self._generate_mock_response(system_prompt, user_input, error_msg=str(e))
+
     def _generate_mock_response(self, system_prompt: str, user_input: str, error_msg: str = None) -> str:
         import random
         
@@ -119,3 +219,8 @@ class LLMClient:
              return json.dumps(scores)
              
         return base_mock
+
+
+def _messages(system_prompt: str, user_input: str) -> list:
+    from langchain_core.messages import HumanMessage, SystemMessage
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_input)]
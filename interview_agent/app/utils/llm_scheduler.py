@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Coroutine, Dict, List, Optional, Set
+from app.utils.metrics import LLM_CALLS
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, tokens: float = 1):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class _Request:
+    __slots__ = ("key", "messages", "future", "attempt")
+
+    def __init__(self, key: str, messages: list, future: asyncio.Future):
+        self.key = key
+        self.messages = messages
+        self.future = future
+        self.attempt = 0
+
+
+class LLMDispatcher:
+    """
+    Funnels every model call through one queue per event loop.
+
+    - Identical in-flight requests (same key) share a single call.
+    - A token bucket caps the request rate sent to the provider.
+    - Requests that arrive within `batch_window` are sent together via `abatch`.
+    - Failed requests are retried with full-jitter exponential backoff. Only
+      after `max_retries` does the caller see the error and fall back to a mock.
+
+    Batches and retries run as background tasks held by the dispatcher until
+    they finish; ``close`` cancels them along with the worker.
+
+    Tunables (environment):
+        LLM_RATE_LIMIT_RPS   sustained requests per second (default 5)
+        LLM_RATE_LIMIT_BURST bucket capacity (default 10)
+        LLM_BATCH_SIZE       max requests per abatch call (default 8)
+        LLM_BATCH_WINDOW_MS  how long to wait for a batch to fill (default 20)
+        LLM_MAX_RETRIES      retries per request (default 3)
+        LLM_TIMEOUT_SECONDS  timeout for one provider call (default 5)
+    """
+
+    def __init__(self, llm, rate: float = None, burst: float = None, batch_size: int = None,
+                 batch_window: float = None, max_retries: int = None, timeout: float = None,
+                 base_backoff: float = 0.25, max_backoff: float = 8.0):
+        self.llm = llm
+        self.bucket = TokenBucket(
+            rate if rate is not None else float(os.getenv("LLM_RATE_LIMIT_RPS", "5")),
+            burst if burst is not None else float(os.getenv("LLM_RATE_LIMIT_BURST", "10")),
+        )
+        # A batch is paid for up front, so it can never exceed the bucket's capacity
+        self.batch_size = max(1, min(batch_size or int(os.getenv("LLM_BATCH_SIZE", "8")), int(self.bucket.capacity)))
+        self.batch_window = batch_window if batch_window is not None else int(os.getenv("LLM_BATCH_WINDOW_MS", "20")) / 1000
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.timeout = timeout or float(os.getenv("LLM_TIMEOUT_SECONDS", "5"))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.coalesced = 0
+        self.retries = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, key: str, messages: list) -> str:
+        """Returns the model's text for `messages`, sharing the call with identical in-flight requests."""
+        self._ensure_worker()
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = self._loop.create_future()
+            inflight = self._inflight
+            inflight[key] = future
+            future.add_done_callback(lambda _: inflight.pop(key, None))
+            self._queue.put_nowait(_Request(key, messages, future))
+        # Shielded so one caller's cancellation doesn't cancel the shared call
+        return await asyncio.shield(future)
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._inflight = {}
+            self._tasks = set()
+            self._worker = loop.create_task(self._run())
+
+    def _spawn(self, coro: Coroutine):
+        # The loop keeps only weak references to tasks, so hold them until done
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(_log_task_failure)
+
+    async def close(self):
+        """Cancels the worker and in-flight batches and retries; their callers see CancelledError."""
+        tasks = [*self._tasks, *([self._worker] if self._worker else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for future in list(self._inflight.values()):
+            future.cancel()
+        self._worker = None
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            batch = [request for request in batch if not request.future.done()]
+            if not batch:
+                continue
+            await self.bucket.acquire(len(batch))
+            # Dispatch without blocking the queue, so the next batch can form meanwhile
+            self._spawn(self._dispatch(batch))
+
+    async def _dispatch(self, batch: List[_Request]):
+        LLM_CALLS.inc(len(batch), mode="batch")
+        try:
+            results = await asyncio.wait_for(
+                self.llm.abatch([request.messages for request in batch], return_exceptions=True),
+                self.timeout,
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for request, result in zip(batch, results):
+            if request.future.done():
+                continue
+            if not isinstance(result, Exception):
+                request.future.set_result(result.content)
+            elif request.attempt < self.max_retries:
+                request.attempt += 1
+                self.retries += 1
+                self._spawn(self._requeue(request))
+            else:
+                request.future.set_exception(result)
+
+    async def _requeue(self, request: _Request):
+        ceiling = min(self.max_backoff, self.base_backoff * 2 ** request.attempt)
+        await asyncio.sleep(random.uniform(0, ceiling))
+        self._queue.put_nowait(request)
+
+
+def _log_task_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error("LLM dispatch task failed: %s", task.exception())
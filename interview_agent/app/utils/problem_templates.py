@@ -0,0 +1,140 @@
+"""
+Procedural problem templates for the exact-match rounds.
+
+A template is a parameterized problem: named parameter choices (lists or
+``range`` objects, so large grids cost no memory) and a render function that
+turns one choice of each into the problem text and its answer. A compiled
+``TemplateSet`` numbers every parameter combination of every template and
+decodes a number back into its parameters in mixed radix, so any of millions
+of problems is rendered in microseconds without materializing the set.
+
+Templates are built to be valid by construction (parameters are chosen so the
+answer is always a whole number, a distance is always positive, ...). Two
+rules keep every problem distinct: every parameter must show in the text, and
+templates of different types must be worded differently. Compiling checks
+both on a sample of each template, and raises ValueError for a template that
+breaks them.
+"""
+import math
+import re
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+# Samples rendered per template when compiling
+VALIDATION_SAMPLES = 64
+_INTEGER = re.compile(r"-?\d+")
+_NUMBER = re.compile(r"-?[\d.]+")
+
+
+class ProblemTemplate(NamedTuple):
+    type: str
+    difficulty: int
+    params: Dict[str, Sequence]
+    # render(**params) -> (text, answer)
+    render: Callable[..., Tuple[str, str]]
+
+
+class Problem(NamedTuple):
+    text: str
+    answer: str
+    type: str
+    difficulty: int
+
+
+class _Compiled:
+    __slots__ = ("template", "names", "choices", "size")
+
+    def __init__(self, template: ProblemTemplate):
+        self.template = template
+        # The last parameter varies fastest
+        self.names = list(template.params)
+        self.choices = [template.params[name] for name in self.names]
+        self.size = math.prod(len(c) for c in self.choices)
+
+    def values(self, index: int) -> Dict[str, object]:
+        values = {}
+        for name, choices in zip(reversed(self.names), reversed(self.choices)):
+            index, digit = divmod(index, len(choices))
+            values[name] = choices[digit]
+        return values
+
+    def render(self, index: int) -> Problem:
+        text, answer = self.template.render(**self.values(index))
+        return Problem(text, answer, self.template.type, self.template.difficulty)
+
+
+class TemplateSet:
+    """
+    The problems of a list of templates, addressable by (seed, position).
+
+    ``draw`` walks the templates in a seed-dependent order, one problem per
+    template in turn, so every type comes up equally often regardless of how
+    many problems it has. Within a template, the k-th visit takes index
+    ``(a * k + b) % n`` with ``a`` coprime to ``n``: a permutation, so a
+    session sees no repeat until the template is exhausted.
+    """
+
+    def __init__(self, templates: List[ProblemTemplate]):
+        self._templates = [_Compiled(t) for t in templates]
+        if not self._templates:
+            raise ValueError("A template set needs at least one template")
+        self._type_multipliers = _coprimes(len(self._templates))
+        self._validate()
+
+    def __len__(self) -> int:
+        return sum(t.size for t in self._templates)
+
+    def sizes(self) -> Dict[Tuple[str, int], int]:
+        return {(t.template.type, t.template.difficulty): t.size for t in self._templates}
+
+    def draw(self, seed: int, position: int) -> Problem:
+        count = len(self._templates)
+        a = self._type_multipliers[seed % len(self._type_multipliers)]
+        compiled = self._templates[(a * position + seed) % count]
+        visit = position // count
+        n = compiled.size
+        return compiled.render((_multiplier(n, seed) * visit + seed // count) % n)
+
+    def problems(self, question_type: str = None, difficulty: int = None):
+        """Every problem, template by template; lazily, as there may be millions."""
+        for compiled in self._templates:
+            if question_type in (None, compiled.template.type) and difficulty in (None, compiled.template.difficulty):
+                for index in range(compiled.size):
+                    yield compiled.render(index)
+
+    def _validate(self):
+        seen: Dict[str, str] = {}
+        for compiled in self._templates:
+            name = f"{compiled.template.type} (difficulty {compiled.template.difficulty})"
+            if compiled.size == 0:
+                raise ValueError(f"Template {name} has no parameter combinations")
+            # Each parameter must change the text on its own
+            base = compiled.values(0)
+            base_text = compiled.template.render(**base)[0]
+            for param, choices in zip(compiled.names, compiled.choices):
+                if len(choices) > 1 and compiled.template.render(**{**base, param: choices[1]})[0] == base_text:
+                    raise ValueError(f"Template {name} does not show parameter {param!r} in its text")
+            step = max(1, compiled.size // VALIDATION_SAMPLES)
+            samples = sorted({*range(0, compiled.size, step), compiled.size - 1})
+            for index in samples:
+                problem = compiled.render(index)
+                if not problem.text or not problem.answer:
+                    raise ValueError(f"Template {name} renders an empty problem at {compiled.values(index)}")
+                if _NUMBER.fullmatch(problem.answer) and not _INTEGER.fullmatch(problem.answer):
+                    raise ValueError(f"Template {name} has a non-integer answer {problem.answer!r} at {compiled.values(index)}")
+                if problem.text in seen:
+                    raise ValueError(f"Templates {seen[problem.text]} and {name} both render {problem.text!r}")
+                seen[problem.text] = name
+
+
+def _coprimes(n: int) -> List[int]:
+    return [a for a in range(1, n) if math.gcd(a, n) == 1] or [1]
+
+
+def _multiplier(n: int, seed: int) -> int:
+    """A multiplier coprime to `n` from the middle of its range, so consecutive visits land far apart."""
+    if n <= 2:
+        return 1
+    a = n // 5 + (seed * 2654435761) % max(1, (3 * n) // 5)
+    while math.gcd(a, n) != 1:
+        a += 1
+    return a
@@ -0,0 +1,135 @@
+import itertools
+import logging
+import math
+import random
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app.schemas.interview import InterviewRound, InterviewSession
+from app.utils.offline_engine import BEHAVIOURAL_QUESTIONS, template_set
+from app.utils.problem_templates import Problem, TemplateSet
+
+logger = logging.getLogger(__name__)
+
+
+class BankQuestion(NamedTuple):
+    text: str
+    answer: Optional[str]
+    round: InterviewRound
+    type: str
+    difficulty: int
+
+
+class QuestionBank:
+    """
+    Every offline question: a fixed list per round, indexed by type and
+    difficulty, or a compiled TemplateSet of procedural problems (millions of
+    them, rendered on demand).
+
+    Sessions never search the bank. Each one walks a per-round pool in an order
+    fixed by its seed: in a list, position ``p`` maps to index ``(a * p + b) % n``
+    with ``a`` coprime to ``n``, which is a permutation of the pool; a template
+    set interleaves such walks of its templates (see ``TemplateSet.draw``).
+    Draws are O(1), need no shuffled copy per session and cannot repeat until
+    the pool (in a template set, its smallest template) is exhausted.
+
+    A draw depends only on (round, seed, position), so any worker can
+    regenerate a session's questions and their answers from those integers;
+    see ``restore_expected_answers``. The source tables and ``shuffle_seed``
+    therefore define the walk: changing them changes which question a stored
+    position refers to.
+    """
+
+    def __init__(self, questions: List[BankQuestion], shuffle_seed: int = 0,
+                 templates: Optional[Dict[InterviewRound, TemplateSet]] = None):
+        self._templates = dict(templates or {})
+        self._pools: Dict[InterviewRound, List[BankQuestion]] = {}
+        seen = set()
+        for question in questions:
+            key = question.text.strip().lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            self._pools.setdefault(question.round, []).append(question)
+
+        # A fixed pre-shuffle breaks up the type-ordered source tables so that
+        # consecutive positions of an affine walk don't land on the same type.
+        rng = random.Random(shuffle_seed)
+        for pool in self._pools.values():
+            rng.shuffle(pool)
+
+        self._multipliers = {
+            round_: [a for a in range(1, len(pool)) if math.gcd(a, len(pool)) == 1] or [1]
+            for round_, pool in self._pools.items()
+        }
+        self._index: Dict[Tuple[InterviewRound, str, int], List[int]] = {}
+        for round_, pool in self._pools.items():
+            for i, question in enumerate(pool):
+                self._index.setdefault((round_, question.type, question.difficulty), []).append(i)
+
+    @classmethod
+    def from_offline_tables(cls) -> "QuestionBank":
+        questions = [
+            BankQuestion(text, None, InterviewRound.BEHAVIOURAL, question_type, difficulty)
+            for question_type, difficulty, text in BEHAVIOURAL_QUESTIONS
+        ]
+        templates = {InterviewRound.APTITUDE: template_set("aptitude"), InterviewRound.LOGICAL: template_set("logical")}
+        return cls(questions, templates=templates)
+
+    def size(self, round_: InterviewRound) -> int:
+        if round_ in self._templates:
+            return len(self._templates[round_])
+        return len(self._pools.get(round_, []))
+
+    def draw(self, round_: InterviewRound, seed: int, position: int) -> BankQuestion:
+        """Returns the question at `position` of the seed's walk through the round's pool."""
+        if round_ in self._templates:
+            return _bank_question(self._templates[round_].draw(seed, position), round_)
+        pool = self._pools[round_]
+        n = len(pool)
+        multipliers = self._multipliers[round_]
+        a = multipliers[seed % len(multipliers)]
+        b = (seed // len(multipliers)) % n
+        # Past the end of the pool the walk wraps around and starts repeating.
+        return pool[(a * position + b) % n]
+
+    def find(self, round_: InterviewRound, question_type: Optional[str] = None, difficulty: Optional[int] = None,
+             limit: Optional[int] = None) -> List[BankQuestion]:
+        """Questions of a type and/or difficulty; pass `limit` for procedural rounds, which hold millions."""
+        if round_ in self._templates:
+            problems = self._templates[round_].problems(question_type, difficulty)
+            return [_bank_question(problem, round_) for problem in itertools.islice(problems, limit)]
+        pool = self._pools.get(round_, [])
+        return [
+            pool[i]
+            for (r, t, d), indices in self._index.items()
+            if r == round_ and question_type in (None, t) and difficulty in (None, d)
+            for i in indices
+        ][:limit]
+
+
+def _bank_question(problem: Problem, round_: InterviewRound) -> BankQuestion:
+    return BankQuestion(problem.text, problem.answer, round_, problem.type, problem.difficulty)
+
+
+@lru_cache(maxsize=None)
+def get_question_bank() -> QuestionBank:
+    return QuestionBank.from_offline_tables()
+
+
+def restore_expected_answers(session: InterviewSession, bank: Optional[QuestionBank] = None):
+    """
+    Fills in the answer keys of the session's bank questions, which are stored
+    as a position only. A question whose regenerated text differs (the bank
+    changed since it was asked) is left without an answer key: the
+    exact-match agents score an answer to it 0, and re-scoring keeps the
+    evaluation it got while the key was known.
+    """
+    for question in session.questions_asked:
+        if question.expected_answer is not None or question.position is None:
+            continue
+        bank = bank or get_question_bank()
+        entry = bank.draw(question.round, session.question_seed, question.position)
+        if entry.text == question.text:
+            question.expected_answer = entry.answer
+        else:
+            logger.warning("Question %s of session %s no longer matches the question bank", question.id, session.session_id)
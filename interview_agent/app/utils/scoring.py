@@ -1,50 +1,83 @@
-from app.schemas.interview import InterviewSession, InterviewRound, Evaluation
-from typing import Dict
+import os
+from functools import lru_cache
+from app.schemas.interview import InterviewSession, InterviewRound, Evaluation, Question
+from typing import Dict, Mapping
 
-def calculate_final_score(session: InterviewSession) -> Dict[str, float]:
-    scores_by_round = {
-        InterviewRound.BEHAVIOURAL: [],
-        InterviewRound.LOGICAL: [],
-        InterviewRound.APTITUDE: []
-    }
-    
-    # Collect scores
+SCORED_ROUNDS = (InterviewRound.BEHAVIOURAL, InterviewRound.LOGICAL, InterviewRound.APTITUDE)
+# Behavioural 40%, Logical 30%, Aptitude 20%, Communication 10%
+DEFAULT_WEIGHTS = {"behavioural": 0.4, "logical": 0.3, "aptitude": 0.2, "communication": 0.1}
+
+
+@lru_cache(maxsize=None)
+def get_score_weights() -> Dict[str, float]:
+    """
+    Weights of the per-round averages in the overall score, from SCORE_WEIGHTS
+    (e.g. ``behavioural=0.5,logical=0.25,aptitude=0.25,communication=0``).
+    Categories left out keep their default weight.
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (part.strip() for part in os.getenv("SCORE_WEIGHTS", "").split(","))):
+        name, _, value = item.partition("=")
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"Unknown SCORE_WEIGHTS category: {name!r}")
+        weights[name] = float(value)
+    return weights
+
+
+def evaluation_from_raw(raw_eval: dict) -> Evaluation:
+    """Maps an evaluator's raw dict to an Evaluation: the score is the mean of its numeric fields."""
+    feedback = raw_eval.get("feedback", "No feedback provided.")
+    breakdown = {k: v for k, v in raw_eval.items() if k != "feedback" and isinstance(v, (int, float))}
+    score = sum(breakdown.values()) / len(breakdown) if breakdown else 0.0
+    return Evaluation(score=score, feedback=feedback, criteria_breakdown=breakdown)
+
+
+def record_evaluation(session: InterviewSession, question: Question, evaluation: Evaluation):
+    """Stores the evaluation and updates the session's running per-round totals."""
+    previous = session.scores.get(question.id)
+    session.scores[question.id] = evaluation
+    if question.round not in SCORED_ROUNDS:
+        return
+    if previous is None:
+        session.score_counts[question.round] = session.score_counts.get(question.round, 0) + 1
+    else:
+        # A re-evaluation replaces the earlier score
+        session.score_totals[question.round] = session.score_totals.get(question.round, 0.0) - previous.score
+    session.score_totals[question.round] = session.score_totals.get(question.round, 0.0) + evaluation.score
+
+
+def rebuild_score_totals(session: InterviewSession):
+    """Recomputes the running totals from the transcript, for sessions whose scores were changed wholesale."""
+    totals: Dict[InterviewRound, float] = {}
+    counts: Dict[InterviewRound, int] = {}
     for question in session.questions_asked:
-        if question.id in session.scores:
-            eval_obj = session.scores[question.id]
-            if question.round in scores_by_round:
-                scores_by_round[question.round].append(eval_obj.score)
+        evaluation = session.scores.get(question.id)
+        if evaluation is not None and question.round in SCORED_ROUNDS:
+            totals[question.round] = totals.get(question.round, 0.0) + evaluation.score
+            counts[question.round] = counts.get(question.round, 0) + 1
+    session.score_totals = totals
+    session.score_counts = counts
 
-    # Averages
+
+def scorecard_from_totals(totals: Mapping[InterviewRound, float], counts: Mapping[InterviewRound, int],
+                          weights: Mapping[str, float] = None) -> Dict[str, float]:
+    """Per-round averages and the weighted overall score, from running sums and counts."""
+    weights = weights or get_score_weights()
     averages = {}
-    for r, values in scores_by_round.items():
-        if values:
-            averages[r.value] = sum(values) / len(values)
-        else:
-            averages[r.value] = 0.0
-            
-    # Weights
-    # Behavioural 40%, Logical 30%, Aptitude 20%
-    # Communication 10% (We will simulate this as average of all scores for now, or random heuristic)
-    # Since we don't have a dedicated comms score, let's assume it matches Behavioural.
-    
-    # Normalizing weights to sum to 1.0 (assuming comms is part of others or separate)
-    # User said: B=40, L=30, A=20, C=10.
-    
-    w_b = 0.4
-    w_l = 0.3
-    w_a = 0.2
-    w_c = 0.1
-    
-    avg_b = averages.get("behavioural", 0)
-    avg_l = averages.get("logical", 0)
-    avg_a = averages.get("aptitude", 0)
-    
+    for r in SCORED_ROUNDS:
+        count = counts.get(r, 0)
+        averages[r.value] = totals.get(r, 0.0) / count if count else 0.0
+
+    avg_b = averages["behavioural"]
+    avg_l = averages["logical"]
+    avg_a = averages["aptitude"]
+
     # Heuristic for communication: mostly based on behavioural clarity
-    avg_c = avg_b 
-    
-    final_score = (avg_b * w_b) + (avg_l * w_l) + (avg_a * w_a) + (avg_c * w_c)
-    
+    avg_c = avg_b
+
+    final_score = (avg_b * weights["behavioural"]) + (avg_l * weights["logical"]) + (avg_a * weights["aptitude"]) + (avg_c * weights["communication"])
+
     return {
         "behavioural": avg_b,
         "logical": avg_l,
@@ -52,3 +85,11 @@ def calculate_final_score(session: InterviewSession) -> Dict[str, float]:
         "communication": avg_c,
         "overall": final_score
     }
+
+
+def calculate_final_score(session: InterviewSession) -> Dict[str, float]:
+    if session.scores and not session.score_counts:
+        # Stored before running totals existed
+        rebuild_score_totals(session)
+    return scorecard_from_totals(session.score_totals, session.score_counts)
+
@@ -0,0 +1,274 @@
+"""
+Local semantic grading for behavioural answers.
+
+The keyword evaluator (``OfflineEngine.evaluate_behavioural``) only checks
+that STAR words occur somewhere. It gives full marks to an answer that
+mentions a "project" and a "result" but does not address the question, and
+no marks to a good answer worded differently. This grader compares what the
+answer says with reference answers instead. It runs on the CPU with NumPy
+only, so there is no external call and no model download.
+
+Every reference text (exemplar answers, question prompts and typical STAR
+sentences from ``app.utils.grading_exemplars``) is turned into a TF-IDF
+vector once, when the grader is built. Each answer is then scored on:
+
+- relevance: the best cosine similarity between the answer and the
+  exemplars for its question's type;
+- STAR coverage: for each component, the answer sentence closest to that
+  component's typical sentences, plus a bonus when one of its cue phrases
+  appears;
+- detail: the length of the answer.
+
+A batch of answers is vectorized into one matrix and scored with matrix
+products, so grading costs well under a millisecond per answer.
+"""
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.grading_exemplars import BEHAVIOURAL_EXEMPLARS, STAR_CUES, STAR_EXEMPLAR_SENTENCES
+from app.utils.keyword_matcher import KeywordMatcher
+from app.utils.offline_engine import BEHAVIOURAL_QUESTIONS, STAR_KEYWORDS
+
+GRADER_MODES = ("semantic", "keywords")
+
+# Answers shorter than this get the lowest score, as with the keyword evaluator
+MIN_WORDS = 10
+# Answers this long get full marks for detail
+FULL_DETAIL_WORDS = 60
+# Similarities at or above these count in full; calibrated on the exemplars
+RELEVANCE_FULL = 0.25
+COMPONENT_FULL = 0.3
+# Answers below this share of full relevance are told to stay on the question
+ON_TOPIC = 0.35
+# Below this a question matches no known prompt, so its answer is compared with every exemplar
+QUESTION_MATCH_MIN = 0.2
+# Weights of coverage, relevance and detail in the 1-5 score
+WEIGHTS = (0.4, 0.45, 0.15)
+SHORT_FEEDBACK = "Answer way too short. Use the STAR method (Situation, Task, Action, Result) to describe a real example."
+
+STOP_WORDS = frozenset(
+    "a an the and or but of to in on at for with by from as is was were be been being are it its that this these those "
+    "so then than there their they them he him his she her hers you your me us about into over very just also which who".split()
+)
+_TOKEN = re.compile(r"[a-z0-9%]+")
+_SENTENCE = re.compile(r"(?<=[.!?;])\s+|\n+")
+_SUFFIXES = ("ing", "ed", "es", "s", "ly")
+
+
+def grader_mode(mode: str = None) -> str:
+    """The behavioural grader to use: `mode`, else BEHAVIOURAL_GRADER, else "semantic"."""
+    mode = (mode or os.getenv("BEHAVIOURAL_GRADER", "semantic")).strip().lower()
+    if mode not in GRADER_MODES:
+        raise ValueError(f"Unknown behavioural grader {mode!r}; expected one of {', '.join(GRADER_MODES)}")
+    return mode
+
+
+@lru_cache(maxsize=65536)
+def _stem(token: str) -> str:
+    for suffix in _SUFFIXES:
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def _terms(text: str) -> List[str]:
+    """Stemmed words without stop words, plus adjacent word pairs."""
+    words = [_stem(token) for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class TfidfVectorizer:
+    """
+    TF-IDF over words and word pairs: sublinear term frequency, smoothed IDF
+    and L2-normalized rows, so a dot product of two rows is their cosine
+    similarity. Terms not seen when fitting are ignored.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+
+    def fit(self, documents: Sequence[str]) -> "TfidfVectorizer":
+        document_frequency = Counter()
+        for document in documents:
+            document_frequency.update(set(_terms(document)))
+        terms = sorted(document_frequency)
+        self.vocabulary = {term: column for column, term in enumerate(terms)}
+        counts = np.array([document_frequency[term] for term in terms], dtype=np.float32)
+        self.idf = (np.log((1 + len(documents)) / (1 + counts)) + 1).astype(np.float32)
+        return self
+
+    def transform(self, documents: Sequence[str]) -> np.ndarray:
+        rows, columns, values = self._weights([_terms(document) for document in documents])
+        matrix = np.zeros((len(documents), len(self.vocabulary)), dtype=np.float32)
+        matrix[rows, columns] = values
+        return matrix
+
+    def project(self, documents: Sequence[str], basis: np.ndarray) -> np.ndarray:
+        """``transform(documents) @ basis.T`` without building the (documents x vocabulary) matrix."""
+        return self.project_terms([_terms(document) for document in documents], basis)
+
+    def project_terms(self, term_lists: Sequence[List[str]], basis: np.ndarray) -> np.ndarray:
+        """`project` for documents already split into terms."""
+        rows, columns, values = self._weights(term_lists)
+        result = np.zeros((len(term_lists), len(basis)), dtype=np.float32)
+        if len(rows):
+            # Rows come out grouped by document, so each document's terms are one contiguous run
+            present, starts = np.unique(rows, return_index=True)
+            result[present] = np.add.reduceat(basis[:, columns].T * values[:, None], starts, axis=0)
+        return result
+
+    def _weights(self, term_lists: Sequence[List[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The nonzero entries of the normalized TF-IDF rows, as (row, column, value) arrays."""
+        rows, columns, counts = [], [], []
+        vocabulary = self.vocabulary
+        for row, terms in enumerate(term_lists):
+            frequency = Counter(column for column in map(vocabulary.get, terms) if column is not None)
+            rows.extend([row] * len(frequency))
+            columns.extend(frequency)
+            counts.extend(frequency.values())
+
+        rows = np.array(rows, dtype=np.int64)
+        columns = np.array(columns, dtype=np.int64)
+        values = (1 + np.log(np.array(counts, dtype=np.float32))) * self.idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(term_lists)))
+        return rows, columns, (values / norms[rows]).astype(np.float32)
+
+
+class SemanticGrader:
+    """
+    Grades behavioural answers against reference exemplars (see the module docstring).
+
+    ``grade`` returns the same dict as ``OfflineEngine.evaluate_behavioural``:
+    a 1-5 score, feedback, and a 1-5 situation/task/action/result breakdown.
+    ``grade_many`` grades a batch with one set of matrix products.
+
+    Tunables (environment):
+        BEHAVIOURAL_GRADER   "semantic" (this grader, default) or "keywords" (the STAR keyword scan)
+    """
+
+    def __init__(self, exemplars: Dict[str, List[str]] = None, questions: Iterable[Tuple[str, int, str]] = None,
+                 star_sentences: Dict[str, List[str]] = None, star_cues: Dict[str, List[str]] = None):
+        exemplars = exemplars or BEHAVIOURAL_EXEMPLARS
+        questions = [q for q in (questions or BEHAVIOURAL_QUESTIONS) if q[0] in exemplars]
+        star_sentences = star_sentences or STAR_EXEMPLAR_SENTENCES
+        self.components = list(STAR_KEYWORDS)
+        if set(star_sentences) != set(self.components):
+            raise ValueError(f"STAR sentences must cover exactly {', '.join(self.components)}")
+
+        self.types = list(exemplars)
+        exemplar_texts = [text for texts in exemplars.values() for text in texts]
+        prompts = [text for _, _, text in questions]
+        component_texts = [star_sentences[component] for component in self.components]
+        self.vectorizer = TfidfVectorizer().fit(exemplar_texts + prompts + sum(component_texts, []))
+
+        self.exemplars = self.vectorizer.transform(exemplar_texts)
+        self.exemplar_types = np.repeat(np.arange(len(self.types)), [len(texts) for texts in exemplars.values()])
+        self.prompts = self.vectorizer.transform(prompts)
+        self.prompt_types = np.array([self.types.index(question_type) for question_type, _, _ in questions], dtype=np.int64)
+
+        centroids = np.stack([self.vectorizer.transform(texts).mean(axis=0) for texts in component_texts])
+        self.centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+        cues = KeywordMatcher(star_cues or STAR_CUES)
+        self.cue_patterns = [dict(cues.patterns)[component] for component in self.components]
+        # Answers are projected on the exemplars and their sentences on the centroids, in one pass
+        self.basis = np.vstack([self.exemplars, self.centroids])
+        self.question_type = lru_cache(maxsize=4096)(self._match_question_type)
+
+    def _match_question_type(self, question: str) -> int:
+        """Index into `types` of the closest known prompt, or -1 when nothing is close."""
+        if not len(self.prompts):
+            return -1
+        similarity = self.vectorizer.project([question], self.prompts)[0]
+        best = int(similarity.argmax())
+        return int(self.prompt_types[best]) if similarity[best] >= QUESTION_MATCH_MIN else -1
+
+    def grade(self, question: str, answer: str) -> dict:
+        if len(str(answer).split()) < MIN_WORDS:
+            # What grade_many gives a too-short answer, without its array set-up
+            return {"score": 1, "feedback": SHORT_FEEDBACK, **{component: 1 for component in self.components}}
+        scores, feedback, criteria = self.grade_many([question], [answer])
+        return {"score": int(scores[0]), "feedback": feedback[0],
+                **{component: int(value) for component, value in zip(self.components, criteria[0])}}
+
+    def grade_many(self, questions: Sequence[str], answers: Sequence[str]) -> Tuple[np.ndarray, list, np.ndarray]:
+        """Returns scores, feedback and the (n, 4) situation/task/action/result criteria."""
+        n = len(answers)
+        answers = [str(answer) for answer in answers]
+        words = np.fromiter((len(answer.split()) for answer in answers), dtype=np.int64, count=n)
+
+        # Too-short answers score the minimum whatever they say, so only the rest are vectorized
+        short = words < MIN_WORDS
+        relevance = np.zeros(n)
+        strength = np.zeros((n, len(self.components)))
+        graded = np.flatnonzero(~short)
+        if graded.size:
+            relevance[graded], strength[graded] = self._similarities([questions[i] for i in graded], [answers[i] for i in graded])
+
+        detail = np.clip((words - MIN_WORDS) / (FULL_DETAIL_WORDS - MIN_WORDS), 0, 1)
+        coverage_weight, relevance_weight, detail_weight = WEIGHTS
+        raw = 1 + 4 * (coverage_weight * strength.mean(axis=1) + relevance_weight * relevance + detail_weight * detail)
+        scores = np.where(short, 1, np.clip(np.rint(raw), 1, 5)).astype(np.int64)
+        criteria = np.where(short[:, None], 1, 1 + np.rint(4 * strength)).astype(np.int64)
+
+        # Feedback only depends on the score, the components covered, relevance and length
+        covered = strength >= 0.5
+        outcome = ((scores * 64 + covered @ (1 << np.arange(len(self.components)))) * 2 + (relevance >= ON_TOPIC)) * 2 + short
+        distinct, inverse = np.unique(outcome, return_inverse=True)
+        texts_by_outcome = np.array([self._feedback_for(int(code)) for code in distinct], dtype=object)
+        return scores, texts_by_outcome[inverse.reshape(-1)].tolist(), criteria
+
+    def _similarities(self, questions: Sequence[str], answers: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Each answer's 0-1 relevance and (n, 4) STAR component strengths."""
+        n = len(answers)
+        # Each answer's terms are those of its sentences, so every answer is tokenized once
+        sentence_terms, starts = [], np.zeros(n, dtype=np.int64)
+        for row, answer in enumerate(answers):
+            starts[row] = len(sentence_terms)
+            sentence_terms.extend([_terms(part) for part in _SENTENCE.split(answer) if part.strip()] or [[]])
+        ends = np.append(starts[1:], len(sentence_terms))
+        answer_terms = [sum(sentence_terms[start:end], []) for start, end in zip(starts, ends)]
+        projected = self.vectorizer.project_terms(answer_terms + sentence_terms, self.basis)
+        count = len(self.exemplars)
+
+        # Relevance: best match among the exemplars of each answer's question type
+        types = np.fromiter((self.question_type(question) for question in questions), dtype=np.int64, count=n)
+        on_type = (self.exemplar_types[None, :] == types[:, None]) | (types[:, None] < 0)
+        similarity = np.where(on_type, projected[:n, :count], 0.0)
+        relevance = np.clip(similarity.max(axis=1, initial=0.0) / RELEVANCE_FULL, 0, 1)
+
+        # STAR: each component's closest sentence, plus a bonus for its cue phrases
+        closest = np.maximum.reduceat(projected[n:, count:], starts, axis=0)
+        texts = [answer.lower() for answer in answers]
+        cued = np.array([[pattern.search(text) is not None for pattern in self.cue_patterns] for text in texts],
+                        dtype=bool).reshape(n, len(self.components))
+        return relevance, np.clip(0.5 * cued + closest / COMPONENT_FULL, 0, 1)
+
+    def _feedback_for(self, outcome: int) -> str:
+        short, on_topic, covered_mask, score = outcome % 2, (outcome // 2) % 2, (outcome // 4) % 64, outcome // 256
+        if short:
+            return SHORT_FEEDBACK
+        covered = [STAR_KEYWORDS[c][1] for bit, c in enumerate(self.components) if covered_mask >> bit & 1]
+        missing = [c.capitalize() for bit, c in enumerate(self.components) if not covered_mask >> bit & 1]
+
+        parts = ["Strong answer!" if score >= 4 else "Decent answer." if score >= 3 else "Answer needs improvement."]
+        if covered:
+            parts.append(f"You covered: {', '.join(covered)}.")
+        if missing:
+            parts.append(f"Expand on the {', '.join(missing)}.")
+        if not on_topic:
+            parts.append("Stay closer to the question that was asked.")
+        if score >= 4 and not missing and on_topic:
+            parts.append("Well done.")
+        return " ".join(parts)
+
+
+@lru_cache(maxsize=1)
+def get_semantic_grader() -> SemanticGrader:
+    """The process-wide grader, built (and its exemplars vectorized) on first use."""
+    return SemanticGrader()
@@ -0,0 +1,170 @@
+"""
+Load/latency benchmark for the interview API.
+
+Drives N simulated candidates concurrently through /start-interview, every
+/answer of a full interview and /export-report, against the app in-process
+(httpx ASGI transport, so no network or server is involved). Agent calls can
+be slowed down to simulate LLM-backed agents.
+
+    python -m benchmarks.api_benchmark --candidates 200 --backend fakeredis --llm-latency 0.05
+
+Backends: `memory` (in-process dict), `fakeredis` (needs the fakeredis
+package) and `redis` (uses REDIS_URL, flushes nothing but writes real keys).
+With `--seed`, every candidate gets a question seed derived from it, so runs
+ask the same questions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import zlib
+from typing import Dict, List
+
+import httpx
+
+ENDPOINTS = ("/start-interview", "/answer", "/export-report")
+
+
+class SimulatedLLMAgent:
+    """Wraps an agent and sleeps before each call, standing in for model latency."""
+
+    def __init__(self, agent, latency: float):
+        self._agent = agent
+        self._latency = latency
+
+    def __getattr__(self, name):
+        return getattr(self._agent, name)
+
+    async def generate_question(self, session):
+        await asyncio.sleep(self._latency)
+        return await self._agent.generate_question(session)
+
+    async def stream_question(self, session):
+        question = await self.generate_question(session)
+        yield question.text
+        yield question
+
+    async def evaluate_answer(self, question, answer):
+        await asyncio.sleep(self._latency)
+        return await self._agent.evaluate_answer(question, answer)
+
+
+def make_store(backend: str):
+    from app.memory import MemoryStore
+
+    if backend == "memory":
+        return MemoryStore()
+    if backend == "fakeredis":
+        from fakeredis import FakeAsyncRedis
+        from redis.asyncio import BlockingConnectionPool
+        return MemoryStore(redis_client=FakeAsyncRedis(connection_pool_class=BlockingConnectionPool, max_connections=50))
+    if backend == "redis":
+        if not os.getenv("REDIS_URL"):
+            raise SystemExit("--backend redis needs REDIS_URL")
+        return MemoryStore()
+    raise SystemExit(f"Unknown backend {backend!r}")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies: Dict[str, List[float]], elapsed: float) -> dict:
+    report = {"elapsed_s": elapsed, "total_rps": sum(len(v) for v in latencies.values()) / elapsed, "endpoints": {}}
+    for endpoint, samples in latencies.items():
+        if not samples:
+            continue
+        report["endpoints"][endpoint] = {
+            "requests": len(samples),
+            "rps": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+    return report
+
+
+async def run_benchmark(candidates: int = 100, backend: str = "memory", llm_latency: float = 0.0,
+                        concurrency: int = None, export: bool = True, seed: int = None) -> dict:
+    from app import main
+
+    orchestrator = main.orchestrator
+    original_memory, original_agents = orchestrator.memory, dict(orchestrator.agents)
+    orchestrator.memory = make_store(backend)
+    if llm_latency > 0:
+        orchestrator.agents = {r: SimulatedLLMAgent(a, llm_latency) for r, a in original_agents.items()}
+    if seed is not None:
+        start_new_session = orchestrator.start_new_session
+        orchestrator.start_new_session = lambda name: start_new_session(name, zlib.crc32(f"{seed}:{name}".encode()))
+
+    latencies: Dict[str, List[float]] = {endpoint: [] for endpoint in ENDPOINTS}
+    gate = asyncio.Semaphore(concurrency or candidates)
+
+    async def timed(endpoint: str, request):
+        started = time.perf_counter()
+        response = await request
+        latencies[endpoint].append(time.perf_counter() - started)
+        response.raise_for_status()
+        return response
+
+    async def candidate(client: httpx.AsyncClient, i: int):
+        async with gate:
+            start = await timed("/start-interview", client.post("/start-interview", json={"candidate_name": f"Bench {i}"}))
+            session_id = start.json()["session_id"]
+            status = "in_progress"
+            while status == "in_progress":
+                answer = await timed("/answer", client.post("/answer", json={"session_id": session_id, "answer": "I took ownership of the task and the result was a success."}))
+                status = answer.json()["status"]
+            if export:
+                await timed("/export-report", client.get(f"/export-report/{session_id}"))
+
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(candidate(client, i) for i in range(candidates)))
+            elapsed = time.perf_counter() - started
+    finally:
+        await orchestrator.memory.close()
+        orchestrator.memory, orchestrator.agents = original_memory, original_agents
+        orchestrator.__dict__.pop("start_new_session", None)
+
+    report = summarize(latencies, elapsed)
+    report.update({"candidates": candidates, "backend": backend, "llm_latency_s": llm_latency, "seed": seed})
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['candidates']} candidates, backend={report['backend']}, llm_latency={report['llm_latency_s'] * 1000:.0f}ms: "
+        f"{report['elapsed_s']:.2f}s, {report['total_rps']:.1f} req/s",
+        f"{'endpoint':<18}{'requests':>10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for endpoint, stats in report["endpoints"].items():
+        lines.append(
+            f"{endpoint:<18}{stats['requests']:>10}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=None, help="max candidates in flight (default: all)")
+    parser.add_argument("--backend", choices=["memory", "fakeredis", "redis"], default="memory")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="simulated seconds per agent call")
+    parser.add_argument("--no-export", action="store_true", help="skip /export-report")
+    parser.add_argument("--seed", type=int, default=None, help="fix every candidate's questions (default: random)")
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.candidates, args.backend, args.llm_latency, args.concurrency, not args.no_export, args.seed))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
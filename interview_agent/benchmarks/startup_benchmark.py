@@ -0,0 +1,109 @@
+"""
+Cold-start benchmark for the interview API.
+
+Each run starts a fresh interpreter (as a new container or autoscaled worker
+would), imports `app.main`, runs the app's startup and serves a first
+/start-interview in-process. It reports, per stage, the median and worst run:
+
+- import:        `import app.main`
+- startup:       the lifespan startup hook
+- first_request: the first POST /start-interview
+- ready:         import + startup + first request
+- process:       wall time of the whole interpreter, including its own start and exit
+
+    python -m benchmarks.startup_benchmark --runs 5 --budget 1.0
+
+With `--budget`, exits non-zero when the median `ready` time exceeds it.
+The environment is passed through, so unset REDIS_URL to measure the
+in-memory backend.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+STAGES = ("import", "startup", "first_request", "ready", "process")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; the ASGI client is imported before timing
+# starts, so only the app's own imports are measured.
+_CHILD = r"""
+import asyncio, json, sys, time
+import httpx
+
+async def main():
+    started = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ready_to_serve = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            response = await client.post("/start-interview", json={"candidate_name": "Startup Benchmark"})
+            response.raise_for_status()
+        served = time.perf_counter()
+        llm_stack_loaded = "langchain_google_genai" in sys.modules
+    print(json.dumps({
+        "import": imported - started,
+        "startup": ready_to_serve - imported,
+        "first_request": served - ready_to_serve,
+        "ready": served - started,
+        "llm_stack_loaded": llm_stack_loaded,
+    }))
+
+asyncio.run(main())
+"""
+
+
+def measure_once() -> dict:
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", _CHILD], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{result.stderr}")
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample["process"] = elapsed
+    return sample
+
+
+def run_benchmark(runs: int = 5) -> dict:
+    samples: List[dict] = [measure_once() for _ in range(runs)]
+    stages: Dict[str, dict] = {}
+    for stage in STAGES:
+        values = [sample[stage] for sample in samples]
+        stages[stage] = {"median_ms": statistics.median(values) * 1000, "max_ms": max(values) * 1000}
+    return {
+        "runs": runs,
+        "stages": stages,
+        # The first request of a keyless deployment must not need LangChain
+        "llm_stack_loaded": any(sample["llm_stack_loaded"] for sample in samples),
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{report['runs']} cold starts (LLM stack loaded: {'yes' if report['llm_stack_loaded'] else 'no'})",
+             f"{'stage':<16}{'median ms':>12}{'max ms':>12}"]
+    for stage, stats in report["stages"].items():
+        lines.append(f"{stage:<16}{stats['median_ms']:>12.1f}{stats['max_ms']:>12.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=None, help="max median seconds to first response")
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.runs)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    if args.budget is not None and report["stages"]["ready"]["median_ms"] > args.budget * 1000:
+        raise SystemExit(f"Median time to first response exceeds {args.budget:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import pytest
+from app.memory import MemoryStore
+from app.orchestrator import Orchestrator
+
+
+@pytest.fixture
+def redis_orchestrator():
+    """An orchestrator on a fresh fakeredis store, with prefetching off so turns don't overlap."""
+    fakeredis = pytest.importorskip("fakeredis")
+    orchestrator = Orchestrator()
+    orchestrator.prefetch_enabled = False
+    orchestrator.memory = MemoryStore(redis_client=fakeredis.FakeAsyncRedis())
+    return orchestrator
+
+
+@pytest.fixture(params=["memory", "fakeredis"])
+def store(request):
+    """A fresh store on each backend; the fakeredis run is skipped when fakeredis isn't installed."""
+    if request.param == "memory":
+        return MemoryStore(redis_client=None)
+    fakeredis = pytest.importorskip("fakeredis")
+    return MemoryStore(redis_client=fakeredis.FakeAsyncRedis())
@@ -0,0 +1,71 @@
+import random
+
+import pandas as pd
+import pytest
+from app.utils.batch_grader import grade_batch
+from app.utils.keyword_matcher import KeywordMatcher
+from app.utils.offline_engine import STAR_KEYWORDS, OfflineEngine
+
+WORDS = ["when", "the", "project", "had", "to", "i", "decided", "we", "finally", "learned", "team",
+         "a", "task", "outcome", "situation", "spoke", "took", "needed", "goal", "and"]
+
+
+def _evaluation_score(raw):
+    breakdown = [v for k, v in raw.items() if k != "feedback" and isinstance(v, (int, float))]
+    return sum(breakdown) / len(breakdown)
+
+
+def test_keyword_matcher_matches_substrings_including_overlaps_and_prefixes():
+    matcher = KeywordMatcher({"a": ["he", "hers"], "b": ["she"], "c": ["her"]})
+    assert matcher.match("ushers") == {"a", "b", "c"}
+    assert matcher.match("hex") == {"a"}
+    assert matcher.match("nothing") == frozenset()
+
+    star = KeywordMatcher({component: words for component, (words, _) in STAR_KEYWORDS.items()})
+    rng = random.Random(3)
+    for _ in range(200):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12)))
+        expected = {c for c, (words, _) in STAR_KEYWORDS.items() if any(w in text for w in words)}
+        assert star.match(text) == expected
+
+
+@pytest.mark.parametrize("length", [5, 20, 40, 60])
+def test_behavioural_rows_match_the_scalar_evaluator(length):
+    rng = random.Random(length)
+    answers = [" ".join(rng.choice(WORDS) for _ in range(length)) for _ in range(50)]
+    graded = grade_batch([("q", answer, None) for answer in answers], behavioural_grader="keywords")
+
+    for answer, row in zip(answers, graded.itertuples()):
+        raw = OfflineEngine.evaluate_behavioural(answer)
+        assert row.kind == "behavioural"
+        assert (row.score, row.feedback, row.situation, row.result) == (raw["score"], raw["feedback"], raw["situation"], raw["result"])
+        assert row.evaluation_score == pytest.approx(_evaluation_score(raw))
+
+
+def test_mixed_batch_matches_the_scalar_evaluators_in_order():
+    rows = pd.DataFrame({
+        "question": ["q1", "q2", "q3", "q4"],
+        "answer": ["It is 42 apples", "I think 4.5", "I'd say the answer is Blue", "too short"],
+        "expected": ["42", "45", "blue", None],
+    })
+    graded = grade_batch(rows, behavioural_grader="keywords")
+
+    assert list(graded["kind"]) == ["exact", "exact", "exact", "behavioural"]
+    for (_, row), answer, expected in zip(graded.iterrows(), rows["answer"], rows["expected"]):
+        raw = OfflineEngine.evaluate_exact_match(answer, expected) if isinstance(expected, str) else OfflineEngine.evaluate_behavioural(answer)
+        assert row["score"] == raw["score"] and row["feedback"] == raw["feedback"]
+        assert row["evaluation_score"] == pytest.approx(_evaluation_score(raw))
+    assert graded["accuracy"].isna().tolist() == [False, False, False, True]
+
+
+@pytest.mark.parametrize("answer, expected, correct", [
+    ("Grandfather", "Father", False),
+    ("He is her grandmother.", "Mother", False),
+    ("He is the father.", "Father", True),
+    ("father", "Father", True),
+    ("It is FDW", "fdw", True),
+    ("Friday or Saturday", "Saturday", True),
+])
+def test_word_answers_match_whole_words(answer, expected, correct):
+    assert (OfflineEngine.evaluate_exact_match(answer, expected)["score"] == 5) is correct
+    assert bool(grade_batch([("q", answer, expected)])["score"][0] == 5) is correct
@@ -0,0 +1,29 @@
+import pytest
+from benchmarks.api_benchmark import format_report, run_benchmark
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "fakeredis"])
+async def test_benchmark_reports_percentiles_per_endpoint(backend):
+    if backend == "fakeredis":
+        pytest.importorskip("fakeredis")
+    report = await run_benchmark(candidates=5, backend=backend, llm_latency=0.001)
+
+    assert set(report["endpoints"]) == {"/start-interview", "/answer", "/export-report"}
+    assert report["endpoints"]["/answer"]["requests"] == 5 * 9
+    for stats in report["endpoints"].values():
+        assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+    assert "req/s" in format_report(report)
+
+
+def test_startup_benchmark_cold_start_skips_the_llm_stack(monkeypatch):
+    from benchmarks.startup_benchmark import STAGES, format_report as format_startup, run_benchmark as run_startup
+
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    report = run_startup(runs=1)
+
+    assert set(report["stages"]) == set(STAGES)
+    assert not report["llm_stack_loaded"]
+    assert report["stages"]["import"]["median_ms"] < report["stages"]["ready"]["median_ms"]
+    assert "first_request" in format_startup(report)
@@ -0,0 +1,108 @@
+import json
+import uuid
+import zlib
+
+import pytest
+from app import codec as codec_module
+from app.archive import SessionArchive
+from app.codec import COMPRESSED, FORMAT_JSON, LAYOUT_VERSION, SessionCodec
+from app.memory import MemoryStore
+from app.migrate_codec import migrate
+from app.schemas.interview import Answer, Evaluation, InterviewRound, InterviewSession, Question
+
+
+def _session() -> InterviewSession:
+    question = Question(id=str(uuid.uuid4()), text="What is 6 * 7?", round=InterviewRound.APTITUDE, difficulty=2, expected_answer="42")
+    other = Question(id="custom-id", text="Tell me about a conflict.", round=InterviewRound.BEHAVIOURAL)
+    return InterviewSession(
+        session_id="s1", candidate_name="Codec Candidate", current_round=InterviewRound.APTITUDE,
+        questions_asked=[other, question],
+        answers=[Answer(question_id="custom-id", text="Once, when... " * 100, timestamp=1.5)],
+        scores={"custom-id": Evaluation(score=3.0, feedback="Decent", criteria_breakdown={"score": 3, "task": 1})},
+    )
+
+
+@pytest.mark.parametrize("body_format", ["msgpack", "json"])
+def test_entries_and_sessions_round_trip(body_format):
+    codec = SessionCodec(body_format)
+    session = _session()
+
+    for question in session.questions_asked:
+        assert codec.load_question(codec.dump_question(question)).model_dump() == question.model_dump()
+        assert codec.load_question(codec.dump_question(question)).expected_answer == question.expected_answer
+    answer = session.answers[0]
+    assert codec.load_answer(codec.dump_answer(answer)) == answer
+    assert codec.load_score(codec.dump_score("custom-id", session.scores["custom-id"])) == ("custom-id", session.scores["custom-id"])
+
+    restored = codec.load_session(codec.dump_session(session))
+    assert restored.model_dump() == session.model_dump()
+    assert restored.questions_asked[1].expected_answer == "42"
+
+
+def test_entries_are_versioned_compact_and_compressed_when_long():
+    codec = SessionCodec("msgpack", compress_min=512)
+    session = _session()
+    question = session.questions_asked[1]
+
+    encoded = codec.dump_question(question)
+    legacy = json.dumps({**question.model_dump(mode="json"), "expected_answer": "42"}).encode()
+    assert encoded[0] == LAYOUT_VERSION and not encoded[1] & COMPRESSED
+    assert len(encoded) < len(legacy) / 2
+
+    long_answer = codec.dump_answer(session.answers[0])
+    assert long_answer[1] & COMPRESSED and len(long_answer) < len(session.answers[0].text) / 4
+
+    with pytest.raises(ValueError):
+        codec.load_question(b"\x09\x01" + encoded[2:])
+
+
+def test_missing_msgpack_library_is_not_a_silent_downgrade(monkeypatch, caplog):
+    monkeypatch.setattr(codec_module, "_packb", None)
+    with caplog.at_level("WARNING", logger="app.codec"):
+        codec = SessionCodec("msgpack")
+    assert "neither msgpack nor ormsgpack" in caplog.text
+    assert codec.dump_answer(_session().answers[0])[1] & FORMAT_JSON
+
+    caplog.clear()
+    SessionCodec("json")
+    assert not caplog.text
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_entries_are_read_and_migrated(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    store = MemoryStore(redis_client=fakeredis.FakeAsyncRedis(), archive=SessionArchive(str(tmp_path / "archive.db")))
+    session = _session()
+    session.is_completed, session.completed_at = True, 100.0
+    client = store.redis_client
+    key = f"session:{session.session_id}"
+
+    # Lay the session out the way the store wrote it before the codec
+    meta = session.model_dump(mode="json", exclude={"questions_asked", "answers", "scores"})
+    await client.hset(key, mapping={k: json.dumps(v) for k, v in meta.items()})
+    await client.rpush(f"{key}:questions_asked", *[
+        json.dumps({**q.model_dump(mode="json"), "expected_answer": q.expected_answer}) for q in session.questions_asked])
+    await client.rpush(f"{key}:answers", *[a.model_dump_json() for a in session.answers])
+    await client.rpush(f"{key}:scores", json.dumps({"question_id": "custom-id", **session.scores["custom-id"].model_dump()}))
+    legacy_blob = zlib.compress(InterviewSession.model_validate(session.model_dump()).model_dump_json().encode())
+    store.archive._conn.execute("INSERT INTO sessions VALUES (?, ?, ?)", ("s1", 100.0, legacy_blob))
+
+    restored = await store.get_session("s1")
+    assert restored.model_dump() == session.model_dump()
+    assert restored.questions_asked[1].expected_answer == "42"
+
+    # New entries append in the compact encoding next to the legacy ones
+    restored.answers.append(Answer(question_id=restored.questions_asked[1].id, text="42", timestamp=2.0))
+    await store.update_session(restored)
+    entries = await client.lrange(f"{key}:answers", 0, -1)
+    assert entries[0][:1] == b"{" and entries[1][0] == LAYOUT_VERSION
+    assert len((await store.get_session("s1")).answers) == 2
+
+    totals = await migrate(store)
+    assert totals == {"scanned": 1, "rewritten": 1, "archived": 1}
+    for field in ("questions_asked", "answers", "scores"):
+        assert all(entry[0] == LAYOUT_VERSION for entry in await client.lrange(f"{key}:{field}", 0, -1))
+    assert (await store.get_session("s1")).model_dump(exclude={"version"}) == restored.model_dump(exclude={"version"})
+    payload = store.archive._conn.execute("SELECT payload FROM sessions").fetchone()[0]
+    assert payload[0] == LAYOUT_VERSION
+    await store.close()
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.memory import MemoryStore, SessionConflictError
+from app.orchestrator import Orchestrator
+
+
+@pytest.mark.asyncio
+async def test_concurrent_answers_on_one_session_are_serialized(store):
+    orchestrator = Orchestrator()
+    orchestrator.memory = store
+    session = await orchestrator.start_new_session("Concurrent Candidate")
+    await orchestrator.get_next_action(session.session_id)
+
+    await asyncio.gather(*(orchestrator.get_next_action(session.session_id, last_answer=f"Answer {i}") for i in range(2)))
+
+    stored = await store.get_session(session.session_id)
+    assert len(stored.answers) == 2 and len(stored.questions_asked) == 3
+    assert len({q.id for q in stored.questions_asked}) == 3
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_is_rejected(store):
+    session = await store.create_session("Stale Candidate")
+    stale = session.model_copy(deep=True)
+
+    fresh = await store.get_session(session.session_id)
+    fresh.candidate_name = "Renamed"
+    await store.update_session(fresh)
+
+    stale.candidate_name = "Lost Update"
+    read_at = stale.version
+    with pytest.raises(SessionConflictError):
+        await store.update_session(stale)
+    assert stale.version == read_at
+    assert (await store.get_session(session.session_id)).candidate_name == "Renamed"
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_workers_sharing_redis_cannot_overwrite_each_other():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    first = MemoryStore(redis_client=fakeredis.FakeAsyncRedis(server=server))
+    second = MemoryStore(redis_client=fakeredis.FakeAsyncRedis(server=server))
+    session = await first.create_session("Shared Candidate")
+
+    a = await first.get_session(session.session_id)
+    b = await second.get_session(session.session_id)
+    a.candidate_name = "Worker A"
+    await first.update_session(a)
+    b.candidate_name = "Worker B"
+    with pytest.raises(SessionConflictError):
+        await second.update_session(b)
+
+    retried = await second.get_session(session.session_id)
+    assert retried.candidate_name == "Worker A"
+    retried.candidate_name = "Worker B"
+    await second.update_session(retried)
+    assert (await first.get_session(session.session_id)).candidate_name == "Worker B"
+
+
+def test_answer_conflict_is_a_409(monkeypatch):
+    async def conflicting(session_id, last_answer=None):
+        raise SessionConflictError(session_id)
+
+    with TestClient(main.app) as client:
+        session_id = client.post("/start-interview", json={"candidate_name": "Conflict Candidate"}).json()["session_id"]
+        monkeypatch.setattr(main.orchestrator, "get_next_action", conflicting)
+        response = client.post("/answer", json={"session_id": session_id, "answer": "An answer"})
+        assert response.status_code == 409
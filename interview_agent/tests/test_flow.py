@@ -64,7 +64,7 @@ async def test_full_interview_simulation():
     pass
 
 @pytest.mark.asyncio
-async def test_exact_user_flow():
+async def test_exact_user_flow(tmp_path):
     orchestrator = Orchestrator()
     
     # Client: Start Interview
@@ -130,8 +130,55 @@ async def test_exact_user_flow():
     import os
     
     generator = ReportGenerator()
-    pdf_path = generator.generate_pdf(final_session)
+    pdf_path = generator.generate_pdf(final_session, output_dir=str(tmp_path))
     
     assert os.path.exists(pdf_path)
     print(f"Report generated at: {pdf_path}")
 
+
+def test_answer_stream_emits_feedback_before_question():
+    import json
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        session_id = client.post("/start-interview", json={"candidate_name": "Stream Candidate"}).json()["session_id"]
+        with client.stream("POST", "/answer/stream", json={"session_id": session_id, "answer": "My answer"}) as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+
+    names = [name for name, _ in events]
+    assert names[0] == "feedback" and names[-1] == "action"
+    assert "token" in names
+    action = events[-1][1]
+    assert action["status"] == "in_progress"
+    assert "".join(data for name, data in events if name == "token") == action["question"]["text"]
+    assert "expected_answer" not in action["question"]
+
+
+def test_answer_stream_ends_with_an_error_event_when_the_turn_fails(monkeypatch):
+    import json
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    async def no_prefetch(self, session):
+        return None
+
+    async def fail(self, session):
+        raise RuntimeError("model unavailable")
+        yield
+
+    with TestClient(app) as client:
+        session_id = client.post("/start-interview", json={"candidate_name": "Stream Candidate"}).json()["session_id"]
+        monkeypatch.setattr(Orchestrator, "_take_prefetched", no_prefetch)
+        monkeypatch.setattr(Orchestrator, "stream_question", fail)
+        with client.stream("POST", "/answer/stream", json={"session_id": session_id, "answer": "My answer"}) as response:
+            body = "".join(response.iter_text())
+
+    name, data = body.strip().split("\n\n")[-1].splitlines()
+    assert name == "event: error" and "retry" in json.loads(data.split(": ", 1)[1])["error"]
@@ -0,0 +1,135 @@
+import time
+
+import pytest
+from app import memory as memory_module
+from app.archive import SessionArchive
+from app.memory import MemoryStore
+from app.report.exporter import ReportGenerator
+from app.schemas.interview import Evaluation, InterviewRound, InterviewSession, Question
+
+
+def _completed_session(session_id: str) -> InterviewSession:
+    question = Question(id="q1", text="What is 6 * 7?", round=InterviewRound.APTITUDE, expected_answer="42")
+    return InterviewSession(
+        session_id=session_id, candidate_name="Archived Candidate", current_round=InterviewRound.FINISHED,
+        questions_asked=[question], is_completed=True, completed_at=time.time(),
+        scores={"q1": Evaluation(score=5.0, feedback="Correct!", criteria_breakdown={"score": 5})},
+        score_totals={InterviewRound.APTITUDE: 5.0}, score_counts={InterviewRound.APTITUDE: 1},
+    )
+
+
+@pytest.mark.asyncio
+async def test_hot_tier_is_an_lru_capped_at_max_entries():
+    store = MemoryStore(redis_client=None)
+    store.max_hot_sessions = 3
+    sessions = [await store.create_session(f"Candidate {i}") for i in range(3)]
+    await store.get_session(sessions[0].session_id)  # now most recently used
+    await store.create_session("Candidate 3")
+
+    assert await store.get_session(sessions[1].session_id) is None
+    assert await store.get_session(sessions[0].session_id) is sessions[0]
+    assert len(store._sessions) == 3
+    page, _ = await store.list_sessions()
+    assert sessions[1].session_id not in [s["session_id"] for s in page]
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(memory_module.time, "monotonic", lambda: clock[0])
+    store = MemoryStore(redis_client=None)
+    store.session_ttl = 60
+    idle = await store.create_session("Idle")
+    active = await store.create_session("Active")
+
+    clock[0] += 45
+    await store.get_session(active.session_id)
+    clock[0] += 30
+    assert await store.get_session(idle.session_id) is None
+    assert await store.get_session(active.session_id) is active
+
+
+@pytest.mark.asyncio
+async def test_completed_sessions_stay_readable_from_the_archive(tmp_path):
+    store = MemoryStore(redis_client=None, archive=SessionArchive(str(tmp_path / "archive.db")))
+    store.max_hot_sessions = 1
+    archived = _completed_session("done")
+    await store.update_session(archived)
+    await store.create_session("Pushes the completed session out")
+
+    restored = await store.get_session("done")
+    assert restored is not archived and restored.model_dump() == archived.model_dump()
+    assert restored.questions_asked[0].expected_answer == "42"
+    assert await store.get_score_totals("done") == ({InterviewRound.APTITUDE: 5.0}, {InterviewRound.APTITUDE: 1})
+    assert await store.list_completed_since(0) == ["done"]
+    assert ReportGenerator().render(restored).startswith(b"%PDF")
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_without_an_archive_completed_sessions_are_kept(monkeypatch):
+    for name in ("SESSION_ARCHIVE_PATH", "SESSION_TTL_SECONDS", "COMPLETED_SESSION_TTL_SECONDS"):
+        monkeypatch.delenv(name, raising=False)
+    clock = [1000.0]
+    monkeypatch.setattr(memory_module.time, "monotonic", lambda: clock[0])
+    store = MemoryStore(redis_client=None)
+    assert store.archive is None and store.completed_session_ttl is None
+    store.max_hot_sessions = 2
+    completed = _completed_session("done")
+    await store.update_session(completed)
+    for i in range(3):
+        await store.create_session(f"Pushes out {i}")
+
+    clock[0] += store.session_ttl + 1
+    assert await store.get_session("done") is completed
+    assert await store.list_completed_since(0) == ["done"]
+    assert "done" in (await store.scan_session_ids(0, count=10))[1]
+
+
+@pytest.mark.asyncio
+async def test_without_an_archive_kept_sessions_are_capped(monkeypatch, caplog):
+    for name in ("SESSION_ARCHIVE_PATH", "COMPLETED_SESSION_TTL_SECONDS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("COMPLETED_SESSION_MAX_ENTRIES", "2")
+    with caplog.at_level("WARNING", logger="app.memory"):
+        store = MemoryStore(redis_client=None)
+    assert "COMPLETED_SESSION_MAX_ENTRIES" in caplog.text
+
+    for i in range(3):
+        await store.update_session(_completed_session(f"done {i}"))
+    await store.update_session(await store.get_session("done 1"))
+    assert list(store._completed) == ["done 1", "done 2"]
+    assert await store.get_session("done 0") is None
+    assert sorted(await store.list_completed_since(0)) == ["done 1", "done 2"]
+
+
+@pytest.mark.asyncio
+async def test_without_an_archive_completed_redis_keys_do_not_expire(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    for name in ("SESSION_ARCHIVE_PATH", "COMPLETED_SESSION_TTL_SECONDS"):
+        monkeypatch.delenv(name, raising=False)
+    store = MemoryStore(redis_client=fakeredis.FakeAsyncRedis())
+    session = await store.create_session("Finishing")
+    assert await store.redis_client.ttl(f"session:{session.session_id}") > 0
+
+    session.is_completed, session.completed_at = True, time.time()
+    await store.update_session(session)
+    assert await store.redis_client.ttl(f"session:{session.session_id}") == -1
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_keys_expire_and_fall_back_to_the_archive(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    store = MemoryStore(redis_client=fakeredis.FakeAsyncRedis(), archive=SessionArchive(str(tmp_path / "archive.db")))
+    live = await store.create_session("Live")
+    assert 0 < await store.redis_client.ttl(f"session:{live.session_id}") <= store.session_ttl
+
+    await store.update_session(_completed_session("done"))
+    for key in await store.redis_client.keys("session:done*"):
+        await store.redis_client.delete(key)
+
+    assert (await store.get_session("done")).candidate_name == "Archived Candidate"
+    page, _ = await store.list_sessions(order_by="completed")
+    assert [s["session_id"] for s in page] == ["done"]
+    await store.close()
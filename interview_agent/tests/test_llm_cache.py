@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from app.utils.llm_cache import LLMCache
+from app.utils.llm_client import LLMClient
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class CountingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        results = []
+        for _ in inputs:
+            self.calls += 1
+            results.append(FakeMessage(f"response {self.calls}"))
+        return results
+
+
+@pytest.mark.asyncio
+async def test_repeat_prompts_are_served_from_cache():
+    client = LLMClient(cache=LLMCache(max_entries=8))
+    client.llm = CountingLLM()
+
+    first = await client.generate_response("Evaluate this answer.", "I  led the   project.")
+    second = await client.generate_response("Evaluate this answer.", "I led the project.")
+    third = await client.generate_response("Evaluate this answer.", "Something else.")
+
+    assert first == second == "response 1"
+    assert third == "response 2"
+    assert client.llm.calls == 2
+    assert client.cache.stats()["hits"] == 1
+    assert client.cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_and_ttl_expires():
+    cache = LLMCache(max_entries=2, ttl_seconds=None)
+    for key in ("a", "b", "c"):
+        await cache.set(key, key.upper())
+    assert await cache.get("a") is None
+    assert await cache.get("c") == "C"
+
+    expiring = LLMCache(max_entries=2, ttl_seconds=-1)
+    expiring._store_local("k", "v")
+    assert await expiring.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_clients():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    writer = LLMCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+    reader = LLMCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+
+    key = LLMCache.make_key("model", 0.7, "system", "user")
+    await writer.set(key, "shared")
+    assert await reader.get(key) == "shared"
+    assert reader.stats()["redis_hits"] == 1
+
+
+class StreamingLLM:
+    """astream stub that sends `chunks`, then fails or stalls instead of finishing."""
+
+    def __init__(self, chunks, then=None):
+        self.chunks = chunks
+        self.then = then
+
+    async def astream(self, messages):
+        for chunk in self.chunks:
+            yield FakeMessage(chunk)
+        if self.then == "fail":
+            raise RuntimeError("connection reset")
+        if self.then == "stall":
+            await asyncio.sleep(60)
+
+
+async def _stream(client):
+    return [chunk async for chunk in client.stream_response("Ask a question.", "Go")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("then", ["fail", "stall"])
+async def test_stream_failing_after_partial_text_raises(then):
+    client = LLMClient(cache=LLMCache(max_entries=8))
+    client.llm = StreamingLLM(["Describe ", "a time"], then=then)
+    client.dispatcher.timeout = 0.05
+    with pytest.raises((RuntimeError, asyncio.TimeoutError)):
+        await _stream(client)
+    assert client.cache.stats()["entries"] == 0
+
+    # Before any text is sent a mock question can still stand in
+    client.llm = StreamingLLM([], then=then)
+    client.dispatcher.timeout = 0.05
+    assert "".join(await _stream(client)).startswith("Tell me")
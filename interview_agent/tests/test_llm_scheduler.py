@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from app.utils.llm_scheduler import LLMDispatcher, TokenBucket
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class ScriptedLLM:
+    """abatch stub that fails the first `failures` calls per input."""
+
+    def __init__(self, failures=0, latency=0.01):
+        self.failures = failures
+        self.latency = latency
+        self.batches = []
+        self.attempts = {}
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        self.batches.append(list(inputs))
+        await asyncio.sleep(self.latency)
+        results = []
+        for prompt in inputs:
+            self.attempts[prompt] = self.attempts.get(prompt, 0) + 1
+            if self.attempts[prompt] <= self.failures:
+                results.append(RuntimeError("429 quota exceeded"))
+            else:
+                results.append(FakeMessage(f"answer to {prompt}"))
+        return results
+
+
+def make_dispatcher(llm, **overrides):
+    options = dict(rate=1000, burst=1000, batch_size=8, batch_window=0.01, max_retries=3, timeout=1, base_backoff=0.001)
+    options.update(overrides)
+    return LLMDispatcher(llm, **options)
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_call():
+    llm = ScriptedLLM()
+    dispatcher = make_dispatcher(llm)
+    results = await asyncio.gather(*(dispatcher.submit("same", "prompt") for _ in range(10)))
+    assert results == ["answer to prompt"] * 10
+    assert sum(len(batch) for batch in llm.batches) == 1
+    assert dispatcher.coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_micro_batched():
+    llm = ScriptedLLM()
+    dispatcher = make_dispatcher(llm, batch_size=4)
+    results = await asyncio.gather(*(dispatcher.submit(f"k{i}", f"p{i}") for i in range(8)))
+    assert results == [f"answer to p{i}" for i in range(8)]
+    assert [len(batch) for batch in llm.batches] == [4, 4]
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried():
+    llm = ScriptedLLM(failures=2)
+    dispatcher = make_dispatcher(llm)
+    assert await dispatcher.submit("k", "p") == "answer to p"
+    assert dispatcher.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_error_surfaces_after_max_retries():
+    dispatcher = make_dispatcher(ScriptedLLM(failures=10), max_retries=1)
+    with pytest.raises(RuntimeError):
+        await dispatcher.submit("k", "p")
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=100, capacity=1)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(6):
+        await bucket.acquire()
+    assert loop.time() - started >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_background_tasks_are_held_and_cancelled_on_close():
+    dispatcher = make_dispatcher(ScriptedLLM(latency=10))
+    pending = asyncio.ensure_future(dispatcher.submit("k", "p"))
+    await asyncio.sleep(0.05)
+    assert len(dispatcher._tasks) == 1
+    await dispatcher.close()
+    assert not dispatcher._tasks
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+
+    # Usable again afterwards
+    dispatcher.llm = ScriptedLLM()
+    assert await dispatcher.submit("k", "p") == "answer to p"
@@ -0,0 +1,72 @@
+import pytest
+from app.memory import MemoryStore
+from app.schemas.interview import InterviewRound
+
+
+@pytest.mark.asyncio
+async def test_session_round_trips_through_hash_and_lists(redis_orchestrator):
+    session = await redis_orchestrator.start_new_session("Redis Candidate")
+    await redis_orchestrator.get_next_action(session.session_id)
+    for i in range(4):
+        await redis_orchestrator.get_next_action(session.session_id, last_answer=f"Answer {i}")
+
+    restored = await redis_orchestrator.memory.get_session(session.session_id)
+    assert restored.candidate_name == "Redis Candidate"
+    assert restored.current_round == InterviewRound.LOGICAL
+    assert len(restored.questions_asked) == 5
+    assert len(restored.answers) == 4
+    assert list(restored.scores) == [q.id for q in restored.questions_asked[:4]]
+    assert restored.questions_asked[-1].expected_answer is not None
+
+
+@pytest.mark.asyncio
+async def test_each_turn_appends_only_new_entries(redis_orchestrator):
+    client = redis_orchestrator.memory.redis_client
+    session = await redis_orchestrator.start_new_session("Delta Candidate")
+    await redis_orchestrator.get_next_action(session.session_id)
+    await redis_orchestrator.get_next_action(session.session_id, last_answer="First answer")
+
+    key = f"session:{session.session_id}"
+    assert await client.llen(f"{key}:questions_asked") == 2
+    assert await client.llen(f"{key}:answers") == 1
+    assert await client.llen(f"{key}:scores") == 1
+
+    # Re-flushing an unchanged session must not duplicate list entries.
+    restored = await redis_orchestrator.memory.get_session(session.session_id)
+    await redis_orchestrator.memory.update_session(restored)
+    assert await client.llen(f"{key}:questions_asked") == 2
+    assert await client.llen(f"{key}:answers") == 1
+
+
+@pytest.mark.asyncio
+async def test_completed_sessions_are_indexed(redis_orchestrator):
+    session = await redis_orchestrator.start_new_session("Finished Candidate")
+    await redis_orchestrator.get_next_action(session.session_id)
+    response = {"status": "in_progress"}
+    while response["status"] == "in_progress":
+        response = await redis_orchestrator.get_next_action(session.session_id, last_answer="Answer")
+
+    completed_at = response["session"].completed_at
+    assert await redis_orchestrator.memory.list_completed_since(completed_at) == [session.session_id]
+    assert await redis_orchestrator.memory.list_completed_since(completed_at + 1) == []
+
+
+@pytest.mark.asyncio
+async def test_in_memory_scan_is_stable_under_reads_and_writes():
+    store = MemoryStore(redis_client=None)
+    sessions = [await store.create_session(f"Candidate {i}") for i in range(10)]
+    seen, cursor = [], 0
+    while True:
+        cursor, page = await store.scan_session_ids(cursor, count=3)
+        seen += page
+        # Reads and writes between pages reorder the LRU
+        await store.get_sessions([s.session_id for s in reversed(sessions)])
+        await store.update_session(sessions[len(seen) % 10])
+        if cursor == 0:
+            break
+    assert sorted(seen) == sorted(s.session_id for s in sessions)
+
+    # The sorted id list follows evictions instead of being rebuilt per page
+    store.max_hot_sessions = 4
+    await store.create_session("Evicting")
+    assert store._session_ids == sorted(store._sessions) and len(store._session_ids) == 4
@@ -0,0 +1,61 @@
+import pytest
+import asyncio
+import time
+from app.memory import MemoryStore
+from app.orchestrator import Orchestrator
+from benchmarks.api_benchmark import percentile
+
+CONCURRENT_SESSIONS = 500
+# fakeredis executes every command in-process on the same event loop, so its
+# budget covers emulator CPU as well as pool queueing.
+P99_BUDGET_SECONDS = {"in-memory": 0.5, "fakeredis": 2.0}
+
+
+def _backends():
+    backends = [pytest.param(lambda: MemoryStore(), P99_BUDGET_SECONDS["in-memory"], id="in-memory")]
+    try:
+        from fakeredis import FakeAsyncRedis
+        from redis.asyncio import BlockingConnectionPool
+        # Same bounded, blocking pool shape the store builds from REDIS_URL.
+        backends.append(pytest.param(
+            lambda: MemoryStore(redis_client=FakeAsyncRedis(connection_pool_class=BlockingConnectionPool, max_connections=50)),
+            P99_BUDGET_SECONDS["fakeredis"],
+            id="fakeredis",
+        ))
+    except ImportError:
+        pass
+    return backends
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_store,p99_budget", _backends())
+async def test_concurrent_sessions_p99(make_store, p99_budget):
+    orchestrator = Orchestrator()
+    orchestrator.memory = make_store()
+    latencies = []
+
+    async def candidate(i):
+        session = await orchestrator.start_new_session(f"Candidate {i}")
+        await orchestrator.get_next_action(session.session_id)
+        for turn in range(3):
+            started = time.perf_counter()
+            response = await orchestrator.get_next_action(session.session_id, last_answer=f"Answer {turn}")
+            latencies.append(time.perf_counter() - started)
+            assert response["status"] == "in_progress"
+
+    await asyncio.gather(*(candidate(i) for i in range(CONCURRENT_SESSIONS)))
+    await orchestrator.memory.close()
+
+    assert len(latencies) == CONCURRENT_SESSIONS * 3
+    assert percentile(latencies, 99) < p99_budget
+
+
+@pytest.mark.asyncio
+async def test_get_sessions_pipelined_read():
+    store = MemoryStore()
+    created = [await store.create_session(f"Candidate {i}") for i in range(5)]
+    ids = [s.session_id for s in created] + ["missing"]
+
+    fetched = await store.get_sessions(ids)
+    assert [s.session_id for s in fetched[:-1]] == ids[:-1]
+    assert fetched[-1] is None
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from app import memory as memory_module
+from app.main import app
+from app.memory import ACTIVE_KEY, MemoryStore
+from app.utils.metrics import Counter, Histogram, Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(Histogram("demo_seconds", "Demo.", ["stage"], buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("demo_events_total", "Demo events.", ["kind"]))
+    histogram.observe(0.05, stage="read")
+    histogram.observe(0.5, stage="read")
+    histogram.observe(5, stage="read")
+    counter.inc(kind='quote"d')
+
+    text = registry.render()
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="read",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="read",le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{stage="read",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="read"} 3' in text
+    assert 'demo_events_total{kind="quote\\"d"} 1' in text
+
+
+def test_metrics_endpoint_exposes_turn_stages():
+    with TestClient(app) as client:
+        session_id = client.post("/start-interview", json={"candidate_name": "Metrics Candidate"}).json()["session_id"]
+        client.post("/answer", json={"session_id": session_id, "answer": "Answer"})
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for stage in ("store_read", "store_write", "process_answer", "generate_question"):
+        assert f'interview_stage_seconds_count{{stage="{stage}"}}' in response.text
+    assert 'interview_agent_seconds_count{round="behavioural",operation="evaluate_answer"}' in response.text
+    assert "interview_active_sessions" in response.text
+
+
+@pytest.mark.asyncio
+async def test_active_sessions_leave_the_count_when_they_expire_or_are_evicted(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(memory_module.time, "monotonic", lambda: clock[0])
+    store = MemoryStore(redis_client=None)
+    store.session_ttl, store.max_hot_sessions = 60, 2
+    idle = await store.create_session("Idle")
+    finished = await store.create_session("Finished")
+    assert await store.count_active_sessions() == 2
+
+    finished.is_completed, finished.completed_at = True, time.time()
+    await store.update_session(finished)
+    assert await store.count_active_sessions() == 1
+    clock[0] += 61
+    assert await store.count_active_sessions() == 0
+    for i in range(3):
+        await store.create_session(f"Evicting {i}")
+    assert await store.count_active_sessions() == 2
+    assert await store.get_session(idle.session_id) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_active_sessions_are_counted_across_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    worker, other = (MemoryStore(redis_client=fakeredis.FakeAsyncRedis(server=server)) for _ in range(2))
+    started = await worker.create_session("Started")
+    abandoned = await other.create_session("Abandoned")
+    assert await worker.count_active_sessions() == await other.count_active_sessions() == 2
+
+    started.is_completed, started.completed_at = True, time.time()
+    await worker.update_session(started)
+    # Last written longer ago than the TTL, so its keys are gone
+    await worker.redis_client.zadd(ACTIVE_KEY, {abandoned.session_id: time.time() - worker.session_ttl - 1})
+    assert await other.count_active_sessions() == 0
@@ -34,5 +34,116 @@ async def test_round_transition():
     response = await orchestrator.get_next_action(session.session_id, last_answer="Final Behavioural Answer")
     
     # Check session state directly
-    updated_session = orchestrator.memory.get_session(session.session_id)
+    updated_session = await orchestrator.memory.get_session(session.session_id)
     assert updated_session.current_round == InterviewRound.LOGICAL
+
+@pytest.mark.asyncio
+async def test_interleaved_sessions_graded_against_own_question():
+    orchestrator = Orchestrator()
+    first = await orchestrator.start_new_session("First Candidate")
+    second = await orchestrator.start_new_session("Second Candidate")
+    for session in (first, second):
+        session.current_round = InterviewRound.APTITUDE
+
+    q_first = (await orchestrator.get_next_action(first.session_id))["question"]
+    await orchestrator.get_next_action(second.session_id)
+
+    response = await orchestrator.get_next_action(first.session_id, last_answer=q_first.expected_answer)
+    assert response["feedback"].score == 5
+    assert "expected_answer" not in q_first.model_dump()
+
+@pytest.mark.asyncio
+async def test_next_question_is_prefetched_across_rounds():
+    orchestrator = Orchestrator()
+    session = await orchestrator.start_new_session("Prefetch Candidate")
+    await orchestrator.get_next_action(session.session_id)
+
+    for _ in range(4):  # includes the behavioural -> logical transition
+        _, task = orchestrator._prefetched[session.session_id]
+        prefetched = await task
+        response = await orchestrator.get_next_action(session.session_id, last_answer="Answer")
+        assert response["question"].id == prefetched.id
+        assert response["question"].round == response["round"]
+
+
+@pytest.mark.asyncio
+async def test_stale_prefetch_is_discarded():
+    orchestrator = Orchestrator()
+    session = await orchestrator.start_new_session("Stale Candidate")
+    await orchestrator.get_next_action(session.session_id)
+    _, task = orchestrator._prefetched[session.session_id]
+    stale = await task
+
+    session.current_round = InterviewRound.APTITUDE
+    response = await orchestrator.get_next_action(session.session_id, last_answer="Answer")
+    assert response["question"].id != stale.id
+    assert response["question"].round == InterviewRound.APTITUDE
+
+@pytest.mark.asyncio
+async def test_grading_and_generation_overlap_within_a_round():
+    import asyncio
+
+    orchestrator = Orchestrator()
+    orchestrator.prefetch_enabled = False
+    agent = orchestrator.agents[InterviewRound.BEHAVIOURAL]
+    overlap = {"generating": False, "seen": False}
+    original_generate, original_evaluate = agent.generate_question, agent.evaluate_answer
+
+    async def slow_generate(session):
+        overlap["generating"] = True
+        await asyncio.sleep(0.05)
+        overlap["generating"] = False
+        return await original_generate(session)
+
+    async def slow_evaluate(question, answer):
+        await asyncio.sleep(0.01)
+        overlap["seen"] = overlap["seen"] or overlap["generating"]
+        return await original_evaluate(question, answer)
+
+    agent.generate_question, agent.evaluate_answer = slow_generate, slow_evaluate
+    session = await orchestrator.start_new_session("Overlap Candidate")
+    await orchestrator.get_next_action(session.session_id)
+    response = await orchestrator.get_next_action(session.session_id, last_answer="Answer")
+
+    assert overlap["seen"]
+    assert response["feedback"] is not None
+    assert len(session.questions_asked) == 2
+
+
+@pytest.mark.asyncio
+async def test_generation_failure_propagates_without_storing_a_question():
+    orchestrator = Orchestrator()
+    orchestrator.prefetch_enabled = False
+    session = await orchestrator.start_new_session("Failing Candidate")
+    await orchestrator.get_next_action(session.session_id)
+
+    async def broken_generate(session):
+        raise RuntimeError("generation failed")
+
+    orchestrator.agents[InterviewRound.BEHAVIOURAL].generate_question = broken_generate
+    for _ in range(2):
+        # A retry of the failed turn must not find the first attempt's answer recorded
+        with pytest.raises(RuntimeError):
+            await orchestrator.get_next_action(session.session_id, last_answer="Answer")
+        assert len(session.questions_asked) == 1
+        assert session.answers == [] and session.scores == {}
+        assert session.score_counts == {} and session.score_totals == {}
+
+
+@pytest.mark.asyncio
+async def test_generation_failure_on_a_round_change_keeps_the_round():
+    orchestrator = Orchestrator()
+    orchestrator.prefetch_enabled = False
+    session = await orchestrator.start_new_session("Failing Candidate")
+    await orchestrator.get_next_action(session.session_id)
+    for i in range(2):
+        await orchestrator.get_next_action(session.session_id, last_answer=f"Answer {i}")
+
+    async def broken_generate(session):
+        raise RuntimeError("generation failed")
+
+    orchestrator.agents[InterviewRound.LOGICAL].generate_question = broken_generate
+    with pytest.raises(RuntimeError):
+        await orchestrator.get_next_action(session.session_id, last_answer="Answer 2")
+    assert session.current_round == InterviewRound.BEHAVIOURAL
+    assert len(session.answers) == 2 and session.score_counts == {InterviewRound.BEHAVIOURAL: 2}
@@ -0,0 +1,92 @@
+import math
+import re
+import time
+
+import pytest
+from app.utils.offline_engine import WEEKDAYS, template_set
+from app.utils.problem_templates import ProblemTemplate, TemplateSet
+
+
+def _numbers(text):
+    return [int(n) for n in re.findall(r"\d+", text)]
+
+
+def test_every_combination_is_decoded_once():
+    templates = TemplateSet([
+        ProblemTemplate("sum", 1, {"a": range(3), "b": [10, 20]}, lambda a, b: (f"{a} + {b}?", str(a + b))),
+        ProblemTemplate("product", 2, {"a": range(2), "b": range(3)}, lambda a, b: (f"{a} * {b}?", str(a * b))),
+    ])
+    assert len(templates) == 12 and templates.sizes() == {("sum", 1): 6, ("product", 2): 6}
+    assert {p.text for p in templates.problems()} == {f"{a} + {b}?" for a in range(3) for b in (10, 20)} | {
+        f"{a} * {b}?" for a in range(2) for b in range(3)}
+    # Equal-sized templates: a full walk is a permutation, alternating between types
+    drawn = [templates.draw(99, position) for position in range(12)]
+    assert len({p.text for p in drawn}) == 12
+    assert all(drawn[i].type != drawn[i + 1].type for i in range(11))
+
+
+@pytest.mark.parametrize("template, message", [
+    (ProblemTemplate("hidden", 1, {"a": range(5), "b": range(5)}, lambda a, b: (f"What is {a}?", str(a))), "does not show parameter 'b'"),
+    (ProblemTemplate("half", 1, {"a": range(5)}, lambda a: (f"Half of {a}?", str(a / 2))), "non-integer answer"),
+    (ProblemTemplate("empty", 1, {"a": []}, lambda a: ("", "")), "no parameter combinations"),
+])
+def test_invalid_templates_fail_to_compile(template, message):
+    with pytest.raises(ValueError, match=message):
+        TemplateSet([template])
+
+
+def test_templates_must_not_overlap():
+    square = lambda n: (f"What is {n} squared?", str(n * n))
+    with pytest.raises(ValueError, match="both render"):
+        TemplateSet([ProblemTemplate("square", 1, {"n": range(10)}, square),
+                     ProblemTemplate("square", 2, {"n": range(5, 20)}, square)])
+
+
+@pytest.mark.parametrize("kind", ["aptitude", "logical"])
+def test_sampled_answers_match_an_independent_solution(kind):
+    templates = template_set(kind)
+    checked = set()
+    for position in range(0, 20000, 7):
+        problem = templates.draw(31337, position)
+        n = _numbers(problem.text)
+        answer = problem.answer
+        if problem.type == "train":
+            length, speed, platform = n
+            assert int(answer) * speed == length + platform
+        elif problem.type == "work":
+            slow, fast = n
+            assert int(answer) * (slow + fast) == slow * fast
+        elif problem.type == "ages":
+            father, son, times = n
+            assert father + int(answer) == times * (son + int(answer))
+        elif problem.type == "direction":
+            assert int(answer) == math.hypot(n[0], n[1])
+        elif problem.type == "clock":
+            hour, minute = n
+            angle = abs((hour % 12) * 30 + minute * 0.5 - minute * 6)
+            assert int(answer) == min(angle, 360 - angle)
+        elif problem.type == "calendar":
+            today = next(day for day in WEEKDAYS if problem.text.startswith(f"If today is {day}"))
+            assert answer == WEEKDAYS[(WEEKDAYS.index(today) + n[0]) % 7]
+        elif problem.type == "average":
+            assert int(answer) * len(n) == sum(n)
+        elif problem.type == "pattern_sequence":
+            terms = n
+            second = [terms[i + 2] - 2 * terms[i + 1] + terms[i] for i in range(3)]
+            assert len(set(second)) == 1 and int(answer) == 3 * terms[4] - 3 * terms[3] + terms[2]
+        elif problem.type == "coding":
+            word, code, target = re.findall(r"[A-Z]{3,}", problem.text)
+            shift = (ord(code[0]) - ord(word[0])) % 26
+            assert answer == "".join(chr((ord(c) - 65 + shift) % 26 + 65) for c in target)
+        else:
+            continue
+        checked.add(problem.type)
+    assert checked
+
+
+def test_draws_take_microseconds():
+    templates = template_set("aptitude")
+    started = time.perf_counter()
+    for position in range(20000):
+        templates.draw(7, position)
+    assert (time.perf_counter() - started) / 20000 < 100e-6
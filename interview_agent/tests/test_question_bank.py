@@ -0,0 +1,98 @@
+import pytest
+from app.agents.logical_agent import LogicalAgent
+from app.memory import MemoryStore
+from app.orchestrator import Orchestrator
+from app.rescore import _answer_rows
+from app.schemas.interview import Answer, Evaluation, InterviewRound, InterviewSession, Question
+from app.utils.batch_grader import grade_batch
+from app.utils.offline_engine import OfflineEngine
+from app.utils.question_bank import QuestionBank, get_question_bank, restore_expected_answers
+
+
+@pytest.mark.parametrize("round_", [InterviewRound.BEHAVIOURAL, InterviewRound.LOGICAL, InterviewRound.APTITUDE])
+@pytest.mark.parametrize("seed", [0, 1, 7, 123456789])
+def test_draw_walks_without_repeats(round_, seed):
+    bank = get_question_bank()
+    # Procedural rounds hold millions of problems; their walk is checked over a prefix
+    n = min(bank.size(round_), 2000)
+    texts = [bank.draw(round_, seed, position).text for position in range(n)]
+    assert len(set(texts)) == n
+
+
+def test_procedural_rounds_hold_millions_of_problems():
+    bank = get_question_bank()
+    assert bank.size(InterviewRound.APTITUDE) + bank.size(InterviewRound.LOGICAL) > 2_000_000
+
+
+def test_find_filters_by_type_and_difficulty():
+    bank = get_question_bank()
+    sequences = bank.find(InterviewRound.LOGICAL, question_type="sequence", limit=50)
+    assert len(sequences) == 50 and all(q.type == "sequence" and q.answer for q in sequences)
+    assert all(q.difficulty == 3 for q in bank.find(InterviewRound.BEHAVIOURAL, difficulty=3))
+    assert all(q.difficulty == 3 for q in bank.find(InterviewRound.APTITUDE, difficulty=3, limit=100))
+
+
+def test_bank_drops_duplicate_texts():
+    bank = QuestionBank.from_offline_tables()
+    pool = bank.find(InterviewRound.BEHAVIOURAL)
+    assert len({q.text for q in pool}) == len(pool) == bank.size(InterviewRound.BEHAVIOURAL)
+
+
+def test_seeded_generators_are_reproducible():
+    for generate in (OfflineEngine.generate_aptitude_question, OfflineEngine.generate_logical_question,
+                     OfflineEngine.generate_behavioural_question):
+        assert [generate(42, i) for i in range(5)] == [generate(42, i) for i in range(5)]
+    assert len({OfflineEngine.generate_aptitude_question(42, i) for i in range(20)}) > 1
+
+
+@pytest.mark.asyncio
+async def test_stored_bank_questions_recompute_their_answers():
+    fakeredis = pytest.importorskip("fakeredis")
+    orchestrator = Orchestrator()
+    orchestrator.memory = MemoryStore(redis_client=fakeredis.FakeAsyncRedis())
+    session = await orchestrator.start_new_session("Seeded Candidate", question_seed=2024)
+    await orchestrator.get_next_action(session.session_id)
+    for i in range(4):
+        await orchestrator.get_next_action(session.session_id, last_answer=f"Answer {i}")
+
+    # The answer key is not stored, only the bank position
+    raw = await orchestrator.memory.redis_client.lrange(f"session:{session.session_id}:questions_asked", 0, -1)
+    assert all(orchestrator.memory.codec._decode(entry)[4] is None for entry in raw)
+
+    restored = await orchestrator.memory.get_session(session.session_id)
+    logical = restored.questions_asked[3]
+    assert logical.round == InterviewRound.LOGICAL and logical.position == 0
+    expected = get_question_bank().draw(InterviewRound.LOGICAL, 2024, 0)
+    assert (logical.text, logical.expected_answer) == (expected.text, expected.answer)
+
+    # Same seed, same interview
+    again = await orchestrator.start_new_session("Seeded Candidate", question_seed=2024)
+    first = await orchestrator.get_next_action(again.session_id)
+    assert first["question"].text == restored.questions_asked[0].text
+
+
+def test_answers_are_not_restored_when_the_bank_changed():
+    bank = get_question_bank()
+    entry = bank.draw(InterviewRound.APTITUDE, 5, 1)
+    session = InterviewSession(session_id="s", question_seed=5, questions_asked=[
+        Question(id="a", text=entry.text, round=InterviewRound.APTITUDE, position=1),
+        Question(id="b", text="A question the bank no longer has", round=InterviewRound.APTITUDE, position=1),
+    ])
+    restore_expected_answers(session)
+    assert [q.expected_answer for q in session.questions_asked] == [entry.answer, None]
+
+
+@pytest.mark.asyncio
+async def test_questions_without_a_key_are_never_graded_against_a_guess():
+    question = Question(id="b", text="A question the bank no longer has", round=InterviewRound.LOGICAL, position=1)
+    raw = await LogicalAgent(llm_client=None).evaluate_answer(question, "Anything at all")
+    assert raw["score"] == 0 and "could not be graded" in raw["feedback"]
+    for key in ("", None):
+        assert OfflineEngine.evaluate_exact_match("0", key)["score"] == 0
+    assert grade_batch([("q", "Anything at all", "")])["score"].tolist() == [0]
+
+    # Re-scoring keeps the evaluation made while the key was known
+    session = InterviewSession(session_id="s", questions_asked=[question],
+                               answers=[Answer(question_id="b", text="Anything at all", timestamp=0.0)],
+                               scores={"b": Evaluation(score=5.0, feedback="Correct!", criteria_breakdown={})})
+    assert _answer_rows([session]) == []
@@ -0,0 +1,104 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, report_service
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def _complete_interview(client):
+    start = client.post("/start-interview", json={"candidate_name": "Report Candidate"}).json()
+    session_id = start["session_id"]
+    status = "in_progress"
+    while status == "in_progress":
+        status = client.post("/answer", json={"session_id": session_id, "answer": "My answer"}).json()["status"]
+    return session_id
+
+
+def test_export_report_is_cached_and_revalidated(client):
+    session_id = _complete_interview(client)
+
+    first = client.get(f"/export-report/{session_id}")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    assert first.content.startswith(b"%PDF")
+    etag = first.headers["etag"]
+
+    second = client.get(f"/export-report/{session_id}")
+    assert second.headers["etag"] == etag
+    assert second.content == first.content
+
+    not_modified = client.get(f"/export-report/{session_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+
+@pytest.mark.parametrize("if_none_match,revalidated", [
+    ("{etag}", True),
+    ('"other", W/{etag}', True),
+    ("*", True),
+    ("{inner}", False),
+    ('"x{etag}x"', False),
+    ('"other"', False),
+])
+def test_if_none_match_compares_whole_tags(client, if_none_match, revalidated):
+    session_id = _complete_interview(client)
+    etag = client.get(f"/export-report/{session_id}").headers["etag"]
+    header = if_none_match.format(etag=etag, inner=etag.strip('"'))
+    response = client.get(f"/export-report/{session_id}", headers={"If-None-Match": header})
+    assert response.status_code == (304 if revalidated else 200)
+
+
+def test_export_report_unknown_session(client):
+    assert client.get("/export-report/does-not-exist").status_code == 404
+
+
+def test_completed_report_served_from_cache(client):
+    session_id = _complete_interview(client)
+    etag = client.get(f"/export-report/{session_id}").headers["etag"].strip('"')
+    assert etag in report_service._cache
+
+    cached = report_service._cache[etag]
+    assert client.get(f"/export-report/{session_id}").content is not None
+    assert report_service._cache[etag] is cached
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    from app.report.cache import DiskReportCache
+
+    cache = DiskReportCache(str(tmp_path), max_bytes=250)
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    assert cache.get("a") == b"a" * 100  # "b" is now least recently used
+    cache.put("c", b"c" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.pdf", "c.pdf"]
+
+    # A restarted worker picks the surviving entries back up
+    assert DiskReportCache(str(tmp_path), max_bytes=250).get("c") == b"c" * 100
+
+
+def test_bulk_export_streams_zip_of_reports(client):
+    import io
+    import time
+    import zipfile
+
+    since = time.time()
+    session_ids = [_complete_interview(client) for _ in range(3)]
+
+    response = client.post("/export-reports", json={"session_ids": session_ids[:2] + ["missing"]})
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert sorted(archive.namelist()) == sorted(f"report_{sid}.pdf" for sid in session_ids[:2])
+    assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+    response = client.post("/export-reports", json={"completed_since": since})
+    names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+    assert sorted(names) == sorted(f"report_{sid}.pdf" for sid in session_ids)
+
+    assert client.post("/export-reports", json={}).status_code == 400
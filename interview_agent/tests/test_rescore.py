@@ -0,0 +1,96 @@
+import os
+
+import pytest
+from app.rescore import rescore_sessions
+from app.utils.scoring import calculate_final_score, rebuild_score_totals
+
+
+async def _complete_interview(orchestrator, name):
+    session = await orchestrator.start_new_session(name)
+    response = await orchestrator.get_next_action(session.session_id)
+    while response["status"] != "completed":
+        response = await orchestrator.get_next_action(
+            session.session_id, last_answer="When the project slipped I had to act, decided to replan, and finally we shipped 42")
+    return session.session_id
+
+
+async def _tamper_scores(store, session_ids):
+    """Overwrites stored evaluations, as if they had been graded by an older rubric."""
+    sessions = await store.get_sessions(session_ids)
+    for session in sessions:
+        for evaluation in session.scores.values():
+            evaluation.score = 0.0
+        rebuild_score_totals(session)
+    await store.rewrite_sessions(sessions)
+    return {s.session_id: {q: e.score for q, e in s.scores.items()} for s in await store.get_sessions(session_ids)}
+
+
+@pytest.mark.asyncio
+async def test_rescore_restores_evaluations_and_scorecards(redis_orchestrator, tmp_path):
+    store = redis_orchestrator.memory
+    completed = [await _complete_interview(redis_orchestrator, f"Candidate {i}") for i in range(5)]
+    graded = {s.session_id: s.scores for s in await store.get_sessions(completed)}
+    active = await redis_orchestrator.start_new_session("Still answering")
+    await redis_orchestrator.get_next_action(active.session_id)
+
+    tampered = await _tamper_scores(store, completed)
+    assert all(score == 0.0 for scores in tampered.values() for score in scores.values())
+
+    checkpoint = str(tmp_path / "rescore.json")
+    state = await rescore_sessions(store, workers=2, page_size=2, checkpoint=checkpoint)
+
+    assert state["scanned"] == 6 and state["rescored"] == 5 and state["answers"] == 45
+    assert not os.path.exists(checkpoint)
+    for session in await store.get_sessions(completed):
+        assert session.scores == graded[session.session_id]
+        expected = calculate_final_score(session)
+        rebuild_score_totals(session)
+        assert expected == calculate_final_score(session) and expected["overall"] > 0
+        # Rewritten rather than appended to
+        assert await store.redis_client.llen(f"session:{session.session_id}:scores") == 9
+    assert (await store.get_session(active.session_id)).score_counts == {}
+
+
+@pytest.mark.asyncio
+async def test_interrupted_rescore_resumes_from_its_checkpoint(redis_orchestrator, tmp_path):
+    store = redis_orchestrator.memory
+    completed = [await _complete_interview(redis_orchestrator, f"Candidate {i}") for i in range(6)]
+    await _tamper_scores(store, completed)
+    checkpoint = str(tmp_path / "rescore.json")
+
+    def interrupt(state):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        await rescore_sessions(store, workers=1, page_size=2, checkpoint=checkpoint, progress=interrupt)
+    assert os.path.exists(checkpoint)
+
+    state = await rescore_sessions(store, workers=1, page_size=2, checkpoint=checkpoint)
+    assert state["rescored"] == 6
+    assert all(calculate_final_score(s)["overall"] > 0 for s in await store.get_sessions(completed))
+
+
+@pytest.mark.asyncio
+async def test_sessions_written_during_a_rescore_are_regraded_not_lost(redis_orchestrator):
+    store = redis_orchestrator.memory
+    completed = [await _complete_interview(redis_orchestrator, f"Candidate {i}") for i in range(3)]
+    graded = {s.session_id: s.scores for s in await store.get_sessions(completed)}
+    await _tamper_scores(store, completed)
+
+    rewrite_sessions = store.rewrite_sessions
+
+    async def rewrite_after_a_live_write(sessions, *args):
+        if len(sessions) > 1:
+            # Another worker saves one of the page's sessions after the job read it
+            live = await store.get_session(sessions[0].session_id)
+            live.candidate_name = "Renamed meanwhile"
+            await store.update_session(live)
+        await rewrite_sessions(sessions, *args)
+
+    store.rewrite_sessions = rewrite_after_a_live_write
+    state = await rescore_sessions(store, workers=1, page_size=10)
+
+    assert state["rescored"] == 3 and state["skipped"] == 0
+    sessions = await store.get_sessions(completed)
+    assert [s.candidate_name for s in sessions].count("Renamed meanwhile") == 1
+    assert all(session.scores == graded[session.session_id] for session in sessions)
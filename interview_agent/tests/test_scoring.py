@@ -0,0 +1,86 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.memory import MemoryStore
+from app.orchestrator import Orchestrator
+from app.schemas.interview import Evaluation, InterviewSession, Question, InterviewRound
+from app.utils import scoring
+from app.utils.scoring import calculate_final_score, rebuild_score_totals, record_evaluation
+
+
+def _walked_scorecard(session):
+    copy = session.model_copy(deep=True)
+    rebuild_score_totals(copy)
+    return calculate_final_score(copy)
+
+
+@pytest.mark.asyncio
+async def test_running_totals_match_a_full_walk():
+    orchestrator = Orchestrator()
+    session = await orchestrator.start_new_session("Totals Candidate")
+    response = await orchestrator.get_next_action(session.session_id)
+    while response["status"] != "completed":
+        response = await orchestrator.get_next_action(session.session_id, last_answer="When I had to decide, the result was 7")
+
+    assert sum(session.score_counts.values()) == 9
+    assert calculate_final_score(session) == pytest.approx(_walked_scorecard(session))
+
+
+def test_re_evaluation_replaces_the_earlier_score():
+    session = InterviewSession(session_id="s")
+    question = Question(id="q", text="?", round=InterviewRound.LOGICAL)
+    session.questions_asked.append(question)
+    record_evaluation(session, question, Evaluation(score=1.0, feedback="", criteria_breakdown={}))
+    record_evaluation(session, question, Evaluation(score=4.0, feedback="", criteria_breakdown={}))
+
+    assert session.score_counts == {InterviewRound.LOGICAL: 1}
+    assert calculate_final_score(session)["logical"] == 4.0
+
+
+def test_legacy_session_without_totals_is_rebuilt():
+    question = Question(id="q", text="?", round=InterviewRound.APTITUDE)
+    session = InterviewSession(session_id="s", questions_asked=[question],
+                               scores={"q": Evaluation(score=5.0, feedback="", criteria_breakdown={})})
+    assert calculate_final_score(session)["aptitude"] == 5.0
+
+
+def test_weights_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("SCORE_WEIGHTS", "behavioural=1, logical=0,communication=0")
+    scoring.get_score_weights.cache_clear()
+    try:
+        assert scoring.get_score_weights() == {"behavioural": 1.0, "logical": 0.0, "aptitude": 0.2, "communication": 0.0}
+        totals = {InterviewRound.BEHAVIOURAL: 6.0, InterviewRound.APTITUDE: 10.0}
+        counts = {InterviewRound.BEHAVIOURAL: 2, InterviewRound.APTITUDE: 2}
+        assert scoring.scorecard_from_totals(totals, counts)["overall"] == pytest.approx(3.0 + 1.0)
+
+        monkeypatch.setenv("SCORE_WEIGHTS", "charisma=1")
+        scoring.get_score_weights.cache_clear()
+        with pytest.raises(ValueError):
+            scoring.get_score_weights()
+    finally:
+        monkeypatch.delenv("SCORE_WEIGHTS")
+        scoring.get_score_weights.cache_clear()
+
+
+def test_scorecard_endpoint_reads_running_totals():
+    with TestClient(app) as client:
+        session_id = client.post("/start-interview", json={"candidate_name": "Scorecard Candidate"}).json()["session_id"]
+        client.post("/answer", json={"session_id": session_id, "answer": "When I had to decide, the result was good"})
+
+        body = client.get(f"/sessions/{session_id}/scorecard").json()
+        assert body["answers_scored"] == 1 and body["scorecard"]["behavioural"] > 0
+        assert client.get("/sessions/missing/scorecard").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_score_totals_are_read_without_the_transcript():
+    fakeredis = pytest.importorskip("fakeredis")
+    store = MemoryStore(redis_client=fakeredis.FakeAsyncRedis())
+    session = await store.create_session("Redis Scorecard")
+    question = Question(id="q", text="?", round=InterviewRound.BEHAVIOURAL)
+    session.questions_asked.append(question)
+    record_evaluation(session, question, Evaluation(score=3.0, feedback="", criteria_breakdown={}))
+    await store.update_session(session)
+
+    assert await store.get_score_totals(session.session_id) == ({InterviewRound.BEHAVIOURAL: 3.0}, {InterviewRound.BEHAVIOURAL: 1})
+    assert await store.get_score_totals("missing") is None
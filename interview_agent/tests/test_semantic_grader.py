@@ -0,0 +1,79 @@
+import time
+
+import pytest
+from app.agents.behavioural_agent import BehaviouralAgent
+from app.schemas.interview import InterviewRound, Question
+from app.utils.batch_grader import grade_batch
+from app.utils.offline_engine import OfflineEngine
+from app.utils.semantic_grader import get_semantic_grader, grader_mode
+
+QUESTION = "Tell me about a time you handled a difficult situation with a coworker."
+ON_TOPIC = ("Last year a colleague and I disagreed strongly about how to structure our code reviews, and it was causing "
+            "tension in the team. My responsibility was to keep the project moving and keep a good relationship. I invited "
+            "him for a coffee, listened to his concerns and we agreed on a shared checklist. As a result the reviews became "
+            "faster and we still work well together.")
+OFF_TOPIC = ("When I was at university the situation was that I had a goal to run a marathon. My task was training. I decided "
+             "to run every morning and took a nutrition course. Finally I finished the race in four hours and learned a lot "
+             "about discipline and persistence over many months.")
+RAMBLING = ("I think coworkers are important and I always try to be nice to people because being nice is good and everyone "
+            "likes nice people in general at any workplace really.")
+PARAPHRASE = ("A teammate kept rewriting my code without telling me, which frustrated me. I wanted to fix it without "
+              "escalating. I asked him privately what bothered him, we discussed our styles and agreed on pairing sessions. "
+              "Our collaboration got much better and we ship faster now.")
+
+
+def test_answers_are_ranked_by_what_they_say():
+    grader = get_semantic_grader()
+    scores = {name: grader.grade(QUESTION, answer)["score"] for name, answer in
+              [("on", ON_TOPIC), ("off", OFF_TOPIC), ("rambling", RAMBLING), ("paraphrase", PARAPHRASE)]}
+    assert scores["on"] == 5
+    assert scores["on"] > scores["off"] and scores["on"] > scores["rambling"]
+    # The keyword scan gives the off-topic answer full marks and the reworded one the minimum
+    assert OfflineEngine.evaluate_behavioural(OFF_TOPIC)["score"] == 5 and OfflineEngine.evaluate_behavioural(PARAPHRASE)["score"] == 1
+    assert scores["paraphrase"] > scores["rambling"]
+    assert "Stay closer to the question" in grader.grade(QUESTION, OFF_TOPIC)["feedback"]
+    assert grader.grade(QUESTION, "I talked to him.") == {
+        "score": 1, "feedback": grader.grade(QUESTION, "Too short.")["feedback"],
+        "situation": 1, "task": 1, "action": 1, "result": 1,
+    }
+
+
+def test_star_components_are_scored_per_sentence():
+    grader = get_semantic_grader()
+    actions_only = "I set up a meeting, listened to both sides, wrote down the options and proposed a compromise to my coworker."
+    graded = grader.grade(QUESTION, actions_only)
+    assert graded["action"] >= 4 and graded["result"] <= 2
+    graded = grader.grade(QUESTION, actions_only + " As a result we agreed on a plan and delivered the project on time.")
+    assert graded["action"] >= 4 and graded["result"] >= 4
+
+
+def test_batch_rows_match_the_scalar_grader():
+    questions = [QUESTION, "Describe a complex problem you solved and your thought process.", "An unknown question?"]
+    answers = [ON_TOPIC, OFF_TOPIC, RAMBLING, PARAPHRASE, "", "Short one."]
+    rows = [(question, answer, None) for question in questions for answer in answers]
+    graded = grade_batch(rows, behavioural_grader="semantic")
+
+    for (question, answer, _), row in zip(rows, graded.itertuples()):
+        raw = get_semantic_grader().grade(question, answer)
+        assert (row.score, row.feedback, row.situation, row.task, row.action, row.result) == tuple(raw.values())
+
+
+@pytest.mark.asyncio
+async def test_grader_is_chosen_by_environment(monkeypatch):
+    agent = BehaviouralAgent(llm_client=None)
+    question = Question(id="q", text=QUESTION, round=InterviewRound.BEHAVIOURAL)
+    assert await agent.evaluate_answer(question, PARAPHRASE) == get_semantic_grader().grade(QUESTION, PARAPHRASE)
+
+    monkeypatch.setenv("BEHAVIOURAL_GRADER", "keywords")
+    assert await agent.evaluate_answer(question, PARAPHRASE) == OfflineEngine.evaluate_behavioural(PARAPHRASE)
+    monkeypatch.setenv("BEHAVIOURAL_GRADER", "embeddings")
+    with pytest.raises(ValueError, match="Unknown behavioural grader"):
+        grader_mode()
+
+
+def test_grading_takes_under_a_millisecond():
+    grader = get_semantic_grader()
+    answers = [ON_TOPIC, OFF_TOPIC, RAMBLING, PARAPHRASE] * 250
+    started = time.perf_counter()
+    grader.grade_many([QUESTION] * len(answers), answers)
+    assert (time.perf_counter() - started) / len(answers) < 1e-3
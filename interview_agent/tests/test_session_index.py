@@ -0,0 +1,96 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.memory import MemoryStore
+from app.schemas.interview import InterviewRound, InterviewSession
+
+
+async def _add(store, session_id, candidate, created_at, completed_at=None, behavioural=None):
+    session = InterviewSession(session_id=session_id, candidate_name=candidate, created_at=created_at)
+    if completed_at is not None:
+        session.is_completed = True
+        session.completed_at = completed_at
+        session.score_totals = {InterviewRound.BEHAVIOURAL: behavioural}
+        session.score_counts = {InterviewRound.BEHAVIOURAL: 1}
+    await store.update_session(session)
+    return session
+
+
+async def _walk(store, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page, cursor = await store.list_sessions(cursor=cursor, **kwargs)
+        ids += [summary["session_id"] for summary in page]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_session_once_including_ties(store):
+    created = {"a": 1.0, "b": 2.0, "c": 2.0, "d": 2.0, "e": 3.0, "f": 4.0, "g": 4.0}
+    for session_id, created_at in created.items():
+        await _add(store, session_id, "Someone", created_at)
+
+    expected = sorted(created, key=lambda s: (created[s], s), reverse=True)
+    assert await _walk(store, limit=2) == expected
+    assert await _walk(store, limit=3, descending=False) == expected[::-1]
+
+
+@pytest.mark.asyncio
+async def test_sessions_added_while_paging_do_not_shift_later_pages(store):
+    for i in range(6):
+        await _add(store, f"s{i}", "Someone", float(i))
+
+    first, cursor = await store.list_sessions(limit=3)
+    await _add(store, "newest", "Someone", 100.0)
+    second, _ = await store.list_sessions(limit=3, cursor=cursor)
+    assert [s["session_id"] for s in first + second] == ["s5", "s4", "s3", "s2", "s1", "s0"]
+
+
+@pytest.mark.asyncio
+async def test_candidate_and_score_indexes(store):
+    await _add(store, "x1", "Ada Lovelace", 1.0, completed_at=10.0, behavioural=2.0)
+    await _add(store, "x2", "ada  lovelace", 2.0)
+    await _add(store, "x3", "Ada Lovelace", 3.0, completed_at=12.0, behavioural=5.0)
+    await _add(store, "y1", "Grace Hopper", 4.0, completed_at=11.0, behavioural=4.0)
+
+    assert await _walk(store, candidate="ADA LOVELACE") == ["x3", "x2", "x1"]
+    assert await _walk(store, candidate="Ada Lovelace", order_by="completed") == ["x3", "x1"]
+    assert await _walk(store, order_by="score") == ["x3", "y1", "x1"]
+
+    page, _ = await store.list_sessions(order_by="score", limit=1)
+    assert page[0]["overall_score"] == pytest.approx(5.0 * 0.5)
+    assert page[0]["is_completed"] and page[0]["current_round"] == "behavioural"
+
+
+@pytest.mark.asyncio
+async def test_invalid_listing_arguments(store):
+    with pytest.raises(ValueError):
+        await store.list_sessions(order_by="name")
+    with pytest.raises(ValueError):
+        await store.list_sessions(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_expired_sessions_are_dropped_from_redis_indexes():
+    fakeredis = pytest.importorskip("fakeredis")
+    store = MemoryStore(redis_client=fakeredis.FakeAsyncRedis())
+    await _add(store, "kept", "Someone", 1.0)
+    await _add(store, "gone", "Someone", 2.0)
+    await store.redis_client.delete("session:gone")
+
+    page, _ = await store.list_sessions()
+    assert [s["session_id"] for s in page] == ["kept"]
+    assert await store.redis_client.zscore("sessions:created", "gone") is None
+
+
+def test_sessions_endpoint_paginates():
+    with TestClient(app) as client:
+        for _ in range(3):
+            client.post("/start-interview", json={"candidate_name": "Listing Candidate"})
+
+        first = client.get("/sessions", params={"candidate": "listing candidate", "limit": 2}).json()
+        second = client.get("/sessions", params={"candidate": "listing candidate", "limit": 2, "cursor": first["next_cursor"]}).json()
+        assert len(first["sessions"]) == 2 and len(second["sessions"]) >= 1
+        assert all(s["candidate_name"] == "Listing Candidate" for s in first["sessions"] + second["sessions"])
+        assert client.get("/sessions", params={"order_by": "name"}).status_code == 400